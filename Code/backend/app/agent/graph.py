@@ -1,35 +1,79 @@
+import asyncio
 import json
 import os
+import time
 
 from langchain.chat_models import init_chat_model
+from langchain_core.callbacks.manager import adispatch_custom_event
 from langchain_core.messages import AIMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.state import CompiledStateGraph
 from rich.console import Console
 
+from app.agent.prefetch import prefetch_sql_context, speculative_prefetcher
 from app.agent.state import AgentState
 from app.core.app_state import app_state
 from app.core.config import settings
 from app.core.logging import logger
 from app.core.memory import init_in_memory_tools
+from app.core.result_format import QueryResult
 from app.services.memory import MemoryTools
-from app.utils.util import Util
+from app.services.result_cursors import result_cursors
+from app.services.schema_catalog import SchemaCatalog, validate_sql_locally
+from app.services.sql_cache import create_sql_cache
+from app.services.sql_repair import parse_identifier_error, repair_sql
+from app.services.triage import PreTriageClassifier
+from app.utils.profiling import profile_results
+from app.utils.util import (
+    LLM_STREAM_TAG,
+    QUERY_BATCH_EVENT,
+    PromptRegistry,
+    ToolRegistry,
+    Util,
+)
 
 console = Console()
 
 client = Util.get_mcp_client()
+prompt_registry = PromptRegistry(client, settings.MCP_SERVER_NAME)
+sql_cache = create_sql_cache(
+    lambda: Util.get_resource_data(client, settings.MCP_SERVER_NAME, "schema://database")
+)
+pre_triage = PreTriageClassifier() if settings.PRE_TRIAGE_ENABLED else None
+schema_catalog = SchemaCatalog(
+    lambda: Util.get_resource_data(client, settings.MCP_SERVER_NAME, "schema://catalog"),
+    settings.SCHEMA_CATALOG_TTL_SECONDS,
+)
 os.environ["OPENAI_API_KEY"] = settings.LLM_API_KEY
 llm = init_chat_model(settings.LLM_MODEL_NAME)
+# Calls made through this model are forwarded token by token by Util.stream_generator.
+streaming_llm = llm.with_config(tags=[LLM_STREAM_TAG])
+triage_llm = streaming_llm if settings.STREAM_TRIAGE_TOKENS else llm
 
-async def triage_node(state: AgentState) -> dict:
-    system_prompt = await Util.get_formatted_prompt(
-        client=client, server_name=settings.MCP_SERVER_NAME, prompt_name="Triage System Prompt"
-    )
+
+async def triage_node(state: AgentState, config: RunnableConfig) -> dict:
+    last_user_message = state["messages"][-1].content if state["messages"] else ""
+    thread_id = config["configurable"].get("thread_id", "default")
+    if settings.SPECULATIVE_PREFETCH and last_user_message:
+        # Most messages end up in generate_sql, start its lookups while triage runs.
+        speculative_prefetcher.start(thread_id, last_user_message, config)
+
+    pre_triage_result = None
+    if pre_triage and last_user_message:
+        pre_triage_result = await pre_triage.classify(last_user_message)
+        if pre_triage_result["decision"]:
+            logger.info(f"Pre-triage decision: {pre_triage_result}")
+            speculative_prefetcher.discard(thread_id)
+            return {"decision": pre_triage_result["decision"], "pre_triage": pre_triage_result}
+
+    system_prompt = await prompt_registry.get_formatted_prompt("Triage System Prompt")
     messages_for_llm = [SystemMessage(content=system_prompt)] + state["messages"]
-    response = await llm.ainvoke(messages_for_llm)
+    response = await triage_llm.ainvoke(messages_for_llm)
     logger.warning(response)
-    return {"decision": response.content}
+    if response.content.strip() != "handle_main_logic":
+        speculative_prefetcher.discard(thread_id)
+    return {"decision": response.content, "pre_triage": pre_triage_result}
 
 
 async def clarification_node(state: AgentState, config: RunnableConfig) -> dict:
@@ -126,6 +170,65 @@ def handle_modification_node(state: AgentState) -> dict:
     }
 
 
+async def generate_sql_candidates(prompt_messages: list) -> tuple[str, dict, dict]:
+    """Generate ``SQL_CANDIDATES`` queries concurrently and keep the first one that validates.
+
+    Candidates are sampled at increasing temperatures so they differ, each capped at
+    ``SQL_CANDIDATE_TOKEN_BUDGET`` output tokens. They are not token-streamed, interleaved
+    tokens of competing queries would be unreadable. Remaining candidates are cancelled as soon as
+    one passes validation. If none does, the first finished candidate is returned with its
+    validation error so the usual repair/retry path takes over.
+    """
+    semaphore = asyncio.Semaphore(settings.SQL_CANDIDATE_CONCURRENCY)
+
+    async def candidate(index: int) -> tuple[int, str, dict]:
+        async with semaphore:
+            temperature = min(settings.LLM_TEMPERATURE + 0.3 * index, 1.0)
+            response = await llm.bind(
+                max_tokens=settings.SQL_CANDIDATE_TOKEN_BUDGET, temperature=temperature
+            ).ainvoke(prompt_messages)
+        generated_sql = response.content.strip()
+        return index, generated_sql, await validate_generated_sql(generated_sql)
+
+    tasks = [asyncio.create_task(candidate(i)) for i in range(settings.SQL_CANDIDATES)]
+    first = None
+    completed = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                index, generated_sql, validation_result = await next_done
+            except Exception as e:
+                logger.warning(f"SQL candidate failed: {e}")
+                continue
+            completed += 1
+            if first is None:
+                first = (index, generated_sql, validation_result)
+            if validation_result.get("valid"):
+                first = (index, generated_sql, validation_result)
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Wait for the cancelled candidates, so none outlives this node.
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    if first is None:
+        raise RuntimeError("All SQL candidates failed")
+    index, generated_sql, validation_result = first
+    stats = {
+        "requested": settings.SQL_CANDIDATES,
+        "completed": completed,
+        "selected": index,
+        "valid": bool(validation_result.get("valid")),
+    }
+    logger.info(f"SQL candidates: {stats}")
+    return generated_sql, validation_result, stats
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
 def route_after_triage(state: AgentState):
     decision = state.get("decision", "").strip()
     logger.warning(f"Triage decision: '{decision}'")
@@ -134,19 +237,41 @@ def route_after_triage(state: AgentState):
 
 async def generate_sql_node(state: AgentState, config: RunnableConfig) -> dict:
     last_user_message = state["messages"][-1].content if state["messages"] else ""
+    thread_id = config["configurable"].get("thread_id", "default")
+
+    sql_cache_result = await sql_cache.lookup(last_user_message) if sql_cache else None
+    if sql_cache_result and sql_cache_result["status"] == "hit":
+        speculative_prefetcher.discard(thread_id)
+        app_state.memory_tools.save_semantic_memory(
+            content={"messages": state["messages"]}, config=config
+        )
+        app_state.memory_tools.save_episodic_memory(
+            content={"messages": state["messages"]}, config=config
+        )
+        return {
+            **state,
+            "question": last_user_message,
+            "sql_context": None,
+            "generated_sql": sql_cache_result["sql"],
+            "valid_sql": None,
+            "execution_result": None,
+            "sql_cache": sql_cache_result,
+            "messages": [AIMessage(content=sql_cache_result["sql"])],
+        }
 
-    schema_collection = await Util.get_root_collection_by_name("database_schema", "root")
-    response = await schema_collection.search_min(last_user_message, limit=2)
-
-    if isinstance(response, list):
-        results = "\n\n".join(response)
-    relevant_schema = Util.clean_page_content_string(results)
-    mcp_tools = await client.get_tools()
-    list_tables_tool = next((tool for tool in mcp_tools if tool.name == "List Tables"), None)
-    if list_tables_tool:
-        all_tables_summary = await list_tables_tool.arun({})
+    generation_started = time.perf_counter()
+    sql_context = await speculative_prefetcher.claim(thread_id, last_user_message)
+    if sql_context is not None:
+        timings = {**sql_context["timings"], "speculative_wait": _elapsed_ms(generation_started)}
     else:
-        all_tables_summary = "Unable to retrieve table list"
+        sql_context = await prefetch_sql_context(last_user_message, config)
+        timings = sql_context["timings"]
+    relevant_schema = sql_context["relevant_schema"]
+    all_tables_summary = sql_context["all_tables"]
+    user_context = sql_context["user_context"]
+    formatted_patterns = Util.format_to_yaml(
+        user_context.get("sql_patterns"), "No common patterns available."
+    )
 
     sql_generation_prompt = f"""
 
@@ -182,6 +307,10 @@ async def generate_sql_node(state: AgentState, config: RunnableConfig) -> dict:
     {all_tables_summary}
     </all_tables>
 
+    <common_sql_patterns>
+    {formatted_patterns}
+    </common_sql_patterns>
+
     <user_question>
     {last_user_message}
     </user_question>
@@ -190,14 +319,40 @@ async def generate_sql_node(state: AgentState, config: RunnableConfig) -> dict:
     """
 
     prompt_messages = [SystemMessage(content=sql_generation_prompt)]
-    sql_response = await llm.ainvoke(prompt_messages)
-    generated_sql = sql_response.content.strip()
-    app_state.memory_tools.save_semantic_memory(content={"messages": state['messages']}, config=config)
-    app_state.memory_tools.save_episodic_memory(content={"messages": state['messages']}, config=config)
+    llm_started = time.perf_counter()
+    validation_result = candidate_stats = None
+    if settings.SQL_GENERATION_MODE == "parallel":
+        generated_sql, validation_result, candidate_stats = await generate_sql_candidates(
+            prompt_messages
+        )
+    else:
+        sql_response = await streaming_llm.ainvoke(prompt_messages)
+        generated_sql = sql_response.content.strip()
+    timings["llm"] = _elapsed_ms(llm_started)
+    if sql_cache:
+        sql_cache.record_generation((time.perf_counter() - generation_started) * 1000)
+    app_state.memory_tools.save_semantic_memory(
+        content={"messages": state["messages"]}, config=config
+    )
+    app_state.memory_tools.save_episodic_memory(
+        content={"messages": state["messages"]}, config=config
+    )
 
     state["generated_sql"] = generated_sql
     print(generated_sql)
-    return {**state, "messages": [AIMessage(content=generated_sql)]}
+    logger.info(f"SQL generation timings (ms): {timings}")
+    return {
+        **state,
+        "question": last_user_message,
+        "sql_context": {"relevant_schema": relevant_schema, "all_tables": all_tables_summary},
+        "repair_count": 0,
+        "sql_repairs": [],
+        "valid_sql": validation_result,
+        "sql_candidates": candidate_stats,
+        "sql_cache": sql_cache_result,
+        "timings": timings,
+        "messages": [AIMessage(content=generated_sql)],
+    }
 
 
 async def retry_generate_sql_node(state: AgentState, config: RunnableConfig) -> dict:
@@ -217,24 +372,26 @@ async def retry_generate_sql_node(state: AgentState, config: RunnableConfig) ->
 
     # Get the validation error to help with retry
     validation_error = state.get("valid_sql", {}).get("error", "Unknown validation error")
-    last_user_message = state["messages"][-1].content if state["messages"] else ""
-
-    schema_collection = await Util.get_root_collection_by_name("database_schema", "root")
-    response = await schema_collection.search_min(last_user_message, limit=2)
-
-    if isinstance(response, list):
-        results = "\n\n".join(response)
-    relevant_schema = Util.clean_page_content_string(results)
-    mcp_tools = await client.get_tools()
-    list_tables_tool = next((tool for tool in mcp_tools if tool.name == "List Tables"), None)
-    if list_tables_tool:
-        all_tables_summary = await list_tables_tool.arun({})
-    else:
-        all_tables_summary = "Unable to retrieve table list"
+    previous_sql = state.get("generated_sql", "")
+    # The last message is the generated SQL at this point, the question is kept in state.
+    last_user_message = state.get("question") or ""
+
+    sql_context = state.get("sql_context")
+    if sql_context is None:
+        # Only happens when the failing SQL came from the semantic cache.
+        prefetched = await prefetch_sql_context(last_user_message)
+        sql_context = {
+            "relevant_schema": prefetched["relevant_schema"],
+            "all_tables": prefetched["all_tables"],
+        }
+    relevant_schema = sql_context["relevant_schema"]
+    all_tables_summary = sql_context["all_tables"]
 
     retry_sql_prompt = f"""
     You are an expert PostgreSQL analyst. Your previous SQL query had validation errors. Please fix the issues and generate a corrected query.
 
+    PREVIOUS QUERY: {previous_sql}
+
     PREVIOUS ERROR: {validation_error}
 
     STRICT RULES:
@@ -271,17 +428,53 @@ async def retry_generate_sql_node(state: AgentState, config: RunnableConfig) ->
     """
 
     prompt_messages = [SystemMessage(content=retry_sql_prompt)]
-    sql_response = await llm.ainvoke(prompt_messages)
+    sql_response = await streaming_llm.ainvoke(prompt_messages)
     generated_sql = sql_response.content.strip()
 
+    sql_cache_result = state.get("sql_cache")
+    if sql_cache_result:
+        # The corrected query replaces whatever was cached, store it once it executes.
+        sql_cache_result = {**sql_cache_result, "status": "miss"}
+
     return {
         **state,
         "generated_sql": generated_sql,
+        "valid_sql": None,
+        "execution_result": None,
         "retry_count": retry_count,
+        "repair_count": 0,
+        "sql_context": sql_context,
+        "sql_cache": sql_cache_result,
         "decision": None,
     }
 
 
+async def validate_locally(generated_sql: str) -> dict | None:
+    if not settings.LOCAL_SQL_VALIDATION:
+        return None
+    try:
+        local_result = validate_sql_locally(generated_sql, await schema_catalog.get())
+    except Exception as e:
+        logger.warning(f"Local SQL validation skipped: {e}")
+        return None
+    if local_result is not None:
+        logger.warning(f"SQL rejected by local validation: '{local_result['error']}'")
+    return local_result
+
+
+async def validate_generated_sql(generated_sql: str) -> dict:
+    local_result = await validate_locally(generated_sql)
+    if local_result is not None:
+        return local_result
+
+    validate_sql_tool = await app_state.tool_registry.get("Validate SQL")
+    if validate_sql_tool:
+        validation_result = json.loads(await validate_sql_tool.arun({"query": generated_sql}))
+        logger.warning(f"SQL validation result: '{validation_result}'")
+        return validation_result
+    return {"valid": False, "error": "SQL validation tool not available in the MCP Server"}
+
+
 async def sql_validation_node(state: AgentState, config: RunnableConfig) -> dict:
     generated_sql = state.get("generated_sql", "")
     if not generated_sql:
@@ -290,23 +483,151 @@ async def sql_validation_node(state: AgentState, config: RunnableConfig) -> dict
             "valid_sql": {"valid": False, "error": "No SQL query to validate"},
         }
 
-    mcp_tools = await client.get_tools()
-    validate_sql_tool = next((tool for tool in mcp_tools if tool.name == "Validate SQL"), None)
-    if validate_sql_tool:
-        validation_result = await validate_sql_tool.arun({"query": generated_sql})
-        logger.warning(f"SQL validation result: '{json.loads(validation_result)}'")
+    valid_sql = state.get("valid_sql") or {}
+    if valid_sql.get("valid") and valid_sql.get("query") == generated_sql:
+        # Already validated while generating candidates in parallel.
+        return {**state, "execution_result": None}
+
+    # Streamed and paginated queries are run by execute_sql_node without the LIMIT used here.
+    validate_and_execute_tool = (
+        await app_state.tool_registry.get("Validate and Execute")
+        if settings.COMBINED_VALIDATE_EXECUTE
+        and not (settings.QUERY_STREAMING or settings.QUERY_PAGINATION)
+        else None
+    )
+    if not validate_and_execute_tool:
         return {
             **state,
-            "valid_sql": json.loads(validation_result),
+            "valid_sql": await validate_generated_sql(generated_sql),
+            "execution_result": None,
         }
-    else:
-        return {
-            **state,
-            "valid_sql": {
-                "valid": False,
-                "error": "SQL validation tool not available in the MCP Server",
-            },
+
+    # Validation and execution in one round trip, execute_sql_node reuses the rows.
+    local_result = await validate_locally(generated_sql)
+    if local_result is not None:
+        return {**state, "valid_sql": local_result, "execution_result": None}
+
+    result = json.loads(
+        await validate_and_execute_tool.arun(
+            {"query": generated_sql, "result_format": settings.QUERY_RESULT_FORMAT}
+        )
+    )
+    if not result.get("valid"):
+        logger.warning(f"SQL validation result: '{result}'")
+        valid_sql = {
+            "valid": False,
+            "error": result.get("error"),
+            "query": generated_sql,
+            "error_type": result.get("error_type"),
         }
+        return {**state, "valid_sql": valid_sql, "execution_result": None}
+
+    return {
+        **state,
+        "valid_sql": {"valid": True, "query": generated_sql, "message": "SQL query is valid"},
+        "execution_result": {**result, "validated_sql": generated_sql},
+    }
+
+
+async def repair_sql_node(state: AgentState, config: RunnableConfig) -> dict:
+    repair_count = state.get("repair_count", 0) + 1
+    generated_sql = state.get("generated_sql", "")
+    validation_error = state.get("valid_sql", {}).get("error", "")
+
+    try:
+        repair = repair_sql(generated_sql, validation_error, await schema_catalog.get())
+    except Exception as e:
+        logger.warning(f"SQL repair failed: {e}")
+        repair = None
+
+    if repair is None:
+        return {**state, "repair_count": repair_count, "decision": "retry_generate_sql_node"}
+
+    logger.info(
+        f"Repaired SQL {repair['kind']} '{repair['original']}' -> '{repair['replacement']}'"
+    )
+    sql_repairs = [
+        *(state.get("sql_repairs") or []),
+        {key: repair[key] for key in ("kind", "original", "replacement")},
+    ]
+    return {
+        **state,
+        "generated_sql": repair["sql"],
+        "valid_sql": None,
+        "execution_result": None,
+        "repair_count": repair_count,
+        "sql_repairs": sql_repairs,
+        "decision": None,
+    }
+
+
+async def stream_query(open_stream_tool, generated_sql: str, config: RunnableConfig) -> dict:
+    """Read the rows of a query batch by batch from a server-side cursor.
+
+    Each batch is dispatched as a ``query_batch`` event as soon as it arrives, so the client gets
+    the first rows while the rest are still being fetched. Returns the result in the shape of
+    ``Execute Query``, but ``data`` only keeps the first ``QUERY_STATE_SAMPLE_ROWS`` rows, since
+    it ends up in the checkpoint and the conversation history. ``row_count`` is the full count.
+    """
+    batch = json.loads(await open_stream_tool.arun({"query": generated_sql}))
+    if not batch.get("success"):
+        return batch
+
+    fetch_batch_tool = await app_state.tool_registry.get("Fetch Query Batch")
+    columns = batch["columns"]
+    rows = []
+    row_count = 0
+    while True:
+        rows.extend(batch["data"][: settings.QUERY_STATE_SAMPLE_ROWS - len(rows)])
+        row_count += len(batch["data"])
+        await adispatch_custom_event(
+            QUERY_BATCH_EVENT,
+            {
+                "query": generated_sql,
+                "columns": columns,
+                "rows": batch["data"],
+                "done": batch["done"],
+            },
+            config=config,
+        )
+        if batch["done"] or not fetch_batch_tool:
+            break
+        batch = json.loads(await fetch_batch_tool.arun({"stream_id": batch["stream_id"]}))
+        if not batch.get("success"):
+            logger.warning(f"Query stream ended early: {batch.get('error')}")
+            break
+
+    return {
+        "success": True,
+        "data": rows,
+        "columns": columns,
+        "row_count": row_count,
+        "sampled": row_count > len(rows),
+        "query": generated_sql,
+        "streamed": True,
+        "truncated": not batch.get("done", False) or batch.get("truncated", False),
+    }
+
+
+async def open_result_pages(open_stream_tool, generated_sql: str, config: RunnableConfig) -> dict:
+    """Fetch the first page of a query and keep its server-side cursor open for the rest.
+
+    When there are more rows, the result carries a ``cursor`` token for
+    ``GET /chat/results/{cursor}``, which serves the next pages without running the graph.
+    """
+    page = json.loads(
+        await open_stream_tool.arun(
+            {"query": generated_sql, "batch_size": settings.QUERY_PAGE_SIZE}
+        )
+    )
+    if page.get("success") and page.get("stream_id"):
+        page["cursor"] = result_cursors.create(
+            config["configurable"].get("user_id", "default"),
+            page["stream_id"],
+            generated_sql,
+            page["columns"],
+        )
+    return page
 
 
 async def execute_sql_node(state: AgentState, config: RunnableConfig) -> dict:
@@ -315,47 +636,118 @@ async def execute_sql_node(state: AgentState, config: RunnableConfig) -> dict:
     if not generated_sql:
         return {
             **state,
+            "results": None,
             "messages": [AIMessage(content="No SQL query available to execute.")],
         }
 
-    mcp_tools = await client.get_tools()
-    execute_sql_tool = next((tool for tool in mcp_tools if tool.name == "Execute Query"), None)
-
-    if not execute_sql_tool:
-        return {
-            **state,
-            "messages": [AIMessage(content="SQL execution tool not available in the MCP Server")],
-        }
-
-    execution_result = await execute_sql_tool.arun({"query": generated_sql})
-    result_data = (
-        json.loads(execution_result) if isinstance(execution_result, str) else execution_result
+    result_data = state.get("execution_result") or {}
+    open_stream_tool = (
+        await app_state.tool_registry.get("Open Query Stream")
+        if settings.QUERY_STREAMING or settings.QUERY_PAGINATION
+        else None
     )
+    if result_data.get("validated_sql") == generated_sql:
+        pass  # Executed together with the validation.
+    elif open_stream_tool and settings.QUERY_PAGINATION:
+        result_data = await open_result_pages(open_stream_tool, generated_sql, config)
+    elif open_stream_tool:
+        result_data = await stream_query(open_stream_tool, generated_sql, config)
+    else:
+        execute_sql_tool = await app_state.tool_registry.get("Execute Query")
+
+        if not execute_sql_tool:
+            return {
+                **state,
+                "results": None,
+                "messages": [
+                    AIMessage(content="SQL execution tool not available in the MCP Server")
+                ],
+            }
+
+        execution_result = await execute_sql_tool.arun(
+            {"query": generated_sql, "result_format": settings.QUERY_RESULT_FORMAT}
+        )
+        result_data = (
+            json.loads(execution_result) if isinstance(execution_result, str) else execution_result
+        )
 
     if not result_data.get("success", False):
         error_msg = result_data.get("error", "Unknown execution error")
         return {
             **state,
+            "results": None,
             "messages": [AIMessage(content=f"Error executing query: {error_msg}")],
         }
 
-    data = result_data.get("data", [])
+    sql_cache_result = state.get("sql_cache") or {}
+    if sql_cache and sql_cache_result.get("status") == "miss":
+        sql_cache.store_in_background(sql_cache_result["question"], generated_sql)
+
+    result = QueryResult(result_data)
 
-    if not data or len(data) == 0:
+    if not result:
         return {
             **state,
+            "results": None,
             "messages": [
                 AIMessage(content="The query executed successfully but returned no results.")
             ],
         }
 
-    sample_data = data[:5]  # Show more sample rows
-    list(data[0].keys()) if data else []
-    len(data)
+    # The rows are streamed to the client when this node ends, the summary follows.
+    return {
+        **state,
+        "execution_result": result_data,
+        "generated_sql": generated_sql,
+        "results": result.encoded,
+    }
+
+
+async def describe_results(result: QueryResult, sample_rows: int, complete: bool = True) -> str:
+    """The rows of a result as the summary prompt sees them.
+
+    Up to ``sample_rows`` rows are shown as they are. Larger results get a column profile over
+    all rows, followed by the first ``sample_rows`` rows so that values stay paired per row
+    (the name next to its revenue in a ranking). When ``complete`` is false the result holds
+    only the first rows of the query (a streamed sample or the first page), and the profile is
+    labelled as covering just those.
+    """
+    rows = json.dumps(result.rows[:sample_rows], indent=2, default=str)
+    if len(result) <= sample_rows:
+        return f"{'All' if complete else f'First {len(result)}'} rows:\n{rows}"
+    try:
+        profile = await asyncio.to_thread(profile_results, result.as_columns())
+    except Exception as e:
+        logger.warning(f"Profiling query results failed, summarizing sample rows instead: {e}")
+        return f"First {sample_rows} rows:\n{rows}"
+    covered = "all rows" if complete else f"the first {len(result)} rows only"
+    return (
+        f"Column profile computed over {covered}:\n"
+        + Util.format_to_yaml(profile, "No profile available.")
+        + f"\n\nFirst {sample_rows} rows, in query order:\n{rows}"
+    )
+
+
+async def summarize_node(state: AgentState, config: RunnableConfig) -> dict:
+    generated_sql = state.get("generated_sql", "")
+    result = QueryResult(state.get("results"))
+    execution_result = state.get("execution_result") or {}
+    next_cursor = execution_result.get("cursor")
+    complete = not (next_cursor or execution_result.get("sampled"))
+    dataset_description = await describe_results(result, settings.SUMMARY_SAMPLE_ROWS, complete)
+
+    row_count = execution_result.get("row_count") or len(result)
+    if next_cursor:
+        more_rows = " (first page, the query returned more rows)"
+    elif execution_result.get("sampled"):
+        more_rows = f" (the first {len(result)} were kept and are described below)"
+    else:
+        more_rows = ""
+
     summary_prompt = f"""
-        Dataset: {len(sample_data)} records
+        Dataset: {row_count} records{more_rows}
 
-        {json.dumps(sample_data[:3], indent=2, default=str)}
+        {dataset_description}
 
         Analyze as a senior data analyst would:
         • **Executive Summary**: What's the story this data tells?
@@ -368,16 +760,17 @@ async def execute_sql_node(state: AgentState, config: RunnableConfig) -> dict:
         """
 
     summary_messages = [SystemMessage(content=summary_prompt)]
-    summary_response = await llm.ainvoke(summary_messages)
+    summary_response = await streaming_llm.ainvoke(summary_messages)
     summary = summary_response.content.strip()
 
-    response_json = {"sql": generated_sql, "data": data, "summary": summary}
+    response_json = {"sql": generated_sql, "data": result.rows, "summary": summary}
+    if execution_result.get("sampled"):
+        response_json["row_count"] = row_count
+    if next_cursor:
+        response_json["next_cursor"] = next_cursor
 
     return {
         **state,
-        "execution_result": result_data,
-        "generated_sql": generated_sql,
-        "results": data,
         "messages": [AIMessage(content=json.dumps(response_json, indent=2, default=str))],
     }
 
@@ -405,10 +798,28 @@ def route_after_validation(state: AgentState):
     logger.warning(f"Current state of valid sql query: {valid_sql}")
     if valid_sql.get("valid", False):
         return "execute_sql"
+    elif (
+        settings.SQL_REPAIR_ENABLED
+        and state.get("repair_count", 0) < settings.SQL_REPAIR_MAX_ATTEMPTS
+        and parse_identifier_error(valid_sql.get("error", ""))
+    ):
+        return "repair_sql"
     else:
         return "retry_generate_sql_node"
 
 
+def route_after_execution(state: AgentState):
+    if state.get("results"):
+        return "summarize"
+    return "END"
+
+
+def route_after_repair(state: AgentState):
+    if state.get("decision") is None:
+        return "validate_sql"
+    return "retry_generate_sql_node"
+
+
 def builder(*args, **kwargs) -> CompiledStateGraph:
     graph_builder = StateGraph(AgentState)
     graph_builder.add_node("triage", triage_node)
@@ -418,7 +829,9 @@ def builder(*args, **kwargs) -> CompiledStateGraph:
     graph_builder.add_node("generate_sql", generate_sql_node)
     graph_builder.add_node("validate_sql", sql_validation_node)
     graph_builder.add_node("retry_generate_sql_node", retry_generate_sql_node)
+    graph_builder.add_node("repair_sql", repair_sql_node)
     graph_builder.add_node("execute_sql", execute_sql_node)
+    graph_builder.add_node("summarize", summarize_node)
 
     graph_builder.add_edge(START, "triage")
     graph_builder.add_conditional_edges(
@@ -438,14 +851,26 @@ def builder(*args, **kwargs) -> CompiledStateGraph:
     graph_builder.add_conditional_edges(
         "validate_sql",
         route_after_validation,
-        {"execute_sql": "execute_sql", "retry_generate_sql_node": "retry_generate_sql_node"},
+        {
+            "execute_sql": "execute_sql",
+            "repair_sql": "repair_sql",
+            "retry_generate_sql_node": "retry_generate_sql_node",
+        },
+    )
+    graph_builder.add_conditional_edges(
+        "repair_sql",
+        route_after_repair,
+        {"validate_sql": "validate_sql", "retry_generate_sql_node": "retry_generate_sql_node"},
     )
     graph_builder.add_conditional_edges(
         "retry_generate_sql_node",
         route_after_retry_sql_generation,
         {"validate_sql": "validate_sql", "END": END},
     )
-    graph_builder.add_edge("execute_sql", END)
+    graph_builder.add_conditional_edges(
+        "execute_sql", route_after_execution, {"summarize": "summarize", "END": END}
+    )
+    graph_builder.add_edge("summarize", END)
     graph_builder.add_edge("follow_up", END)
     graph_builder.add_edge("handle_modification", END)
 
@@ -458,6 +883,9 @@ def builder(*args, **kwargs) -> CompiledStateGraph:
         app_state.checkpointer = checkpointer
         app_state.memory_tools = memory_tools
 
+    if app_state.tool_registry is None:
+        app_state.tool_registry = ToolRegistry(client)
+
     return graph_builder.compile(
         checkpointer=checkpointer,
         store=store,
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Dict, Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from app.core.app_state import app_state
+from app.core.config import settings
+from app.core.database import system_id
+from app.core.logging import logger
+from app.utils.util import Util
+
+
+async def _run_stage(
+    name: str, coro: Awaitable[Any], timeout: float, timings: Dict[str, float]
+) -> Optional[Any]:
+    started = time.perf_counter()
+    try:
+        return await asyncio.wait_for(coro, timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Prefetch stage '{name}' timed out after {timeout}s")
+    except Exception as e:
+        logger.warning(f"Prefetch stage '{name}' failed: {e}")
+    finally:
+        timings[name] = round((time.perf_counter() - started) * 1000, 2)
+    return None
+
+
+async def fetch_relevant_schema(question: str) -> str:
+    schema_collection = await Util.get_root_collection_by_name("database_schema", system_id)
+    response = await schema_collection.search_min(question, limit=2)
+    return Util.clean_page_content_string("\n\n".join(response))
+
+
+async def fetch_table_list() -> Optional[str]:
+    list_tables_tool = await app_state.tool_registry.get("List Tables")
+    if not list_tables_tool:
+        return None
+    return await list_tables_tool.arun({})
+
+
+async def prefetch_sql_context(
+    question: str,
+    config: Optional[RunnableConfig] = None,
+    timeout: float = settings.SQL_PREFETCH_TIMEOUT_SECONDS,
+) -> Dict[str, Any]:
+    """Gather everything SQL generation needs before the LLM call, concurrently.
+
+    Schema retrieval, the ``List Tables`` call and (when a config is given) the user's memories
+    run side by side, each under its own timeout. A stage that fails or times out is logged and
+    replaced by a placeholder so generation can still go ahead. ``timings`` holds the duration
+    of every stage in milliseconds.
+    """
+    timings: Dict[str, float] = {}
+    stages = {
+        "schema": fetch_relevant_schema(question),
+        "tables": fetch_table_list(),
+    }
+    if config is not None and app_state.memory_tools is not None:
+        stages["user_context"] = app_state.memory_tools.get_user_context(config)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(_run_stage(name, coro, timeout, timings) for name, coro in stages.items())
+    )
+    timings["prefetch"] = round((time.perf_counter() - started) * 1000, 2)
+    context = dict(zip(stages, results, strict=True))
+
+    return {
+        "question": question,
+        "relevant_schema": context["schema"] or "Schema not available",
+        "all_tables": context["tables"] or "Unable to retrieve table list",
+        "user_context": context.get("user_context") or {},
+        "timings": timings,
+    }
+
+
+class SpeculativePrefetcher:
+    """Starts ``prefetch_sql_context`` while triage is still running.
+
+    Prefetches are keyed by thread id. ``generate_sql_node`` claims the one started for its
+    question, any prefetch that is not claimed is cancelled and counted as wasted.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[str, tuple[str, asyncio.Task]] = {}
+        self.started = 0
+        self.useful = 0
+        self.wasted = 0
+
+    def start(self, key: str, question: str, config: Optional[RunnableConfig] = None) -> None:
+        self.discard(key)
+        self._tasks[key] = (question, asyncio.create_task(prefetch_sql_context(question, config)))
+        self.started += 1
+
+    async def claim(self, key: str, question: str) -> Optional[Dict[str, Any]]:
+        entry = self._tasks.pop(key, None)
+        if entry is None:
+            return None
+        prefetched_question, task = entry
+        if prefetched_question != question:
+            self._cancel(task)
+            return None
+        try:
+            context = await task
+        except Exception as e:
+            self.wasted += 1
+            logger.warning(f"Speculative prefetch failed: {e}")
+            return None
+        self.useful += 1
+        return context
+
+    def discard(self, key: str) -> None:
+        entry = self._tasks.pop(key, None)
+        if entry is not None:
+            self._cancel(entry[1])
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "started": self.started,
+            "useful": self.useful,
+            "wasted": self.wasted,
+            "in_flight": len(self._tasks),
+        }
+
+    def _cancel(self, task: asyncio.Task) -> None:
+        self.wasted += 1
+        task.cancel()
+
+
+speculative_prefetcher = SpeculativePrefetcher()
@@ -1,4 +1,4 @@
-from typing import Annotated, Any, Dict, List, Optional, TypedDict
+from typing import Annotated, Any, Dict, List, Optional, TypedDict, Union
 
 from langchain_core.messages import BaseMessage
 from langgraph.graph import add_messages
@@ -9,16 +9,27 @@ class AgentState(TypedDict, total=False):
     decision: Optional[str]
     clarification_count: Optional[int]
     retry_count: Optional[int]
+    repair_count: Optional[int]
 
     user_id: str
     thread_id: str
     memory_agent: Optional[Any]
 
+    question: Optional[str]
+    sql_context: Optional[Dict[str, Any]]
     generated_sql: Optional[str]
     valid_sql: Optional[Dict[str, Any]]
+    sql_repairs: Optional[List[Dict[str, str]]]
+    sql_candidates: Optional[Dict[str, Any]]
+    execution_result: Optional[Dict[str, Any]]
+    # Rows of the last query, as row dicts or columnar (see app.core.result_format).
+    results: Optional[Union[List[Dict[str, Any]], Dict[str, Any]]]
     tables_used: Optional[List[str]]
     query_type: Optional[str]
     error_message: Optional[str]
+    sql_cache: Optional[Dict[str, Any]]
+    pre_triage: Optional[Dict[str, Any]]
+    timings: Optional[Dict[str, float]]
 
     # Memory context
     user_context: Optional[Dict[str, Any]]
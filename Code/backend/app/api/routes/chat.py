@@ -1,11 +1,19 @@
-from fastapi import APIRouter, Depends
+import json
+import re
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException
 from langchain_core.runnables import RunnableConfig
 from starlette.requests import Request
 from starlette.responses import StreamingResponse
 
+from app.core.app_state import app_state
 from app.core.auth import get_enhanced_user
 from app.core.logging import logger
-from app.schemas.chat import ChatRequest
+from app.schemas.chat import ChatRequest, ResultPage
+from app.services.chat_threads import claim_thread, thread_owner
+from app.services.export import export_csv, export_parquet, parquet_available
+from app.services.result_cursors import result_cursors
 from app.utils.util import Util
 
 router = APIRouter()
@@ -20,8 +28,81 @@ async def chat(
     logger.info(f"Received request: {input}")
     logger.info(f"User info: {user}")
 
+    if not await claim_thread(input.thread_id, user["sub"]):
+        raise HTTPException(status_code=403, detail="Thread belongs to another user")
+
     config = RunnableConfig(configurable={"thread_id": input.thread_id, "user_id": user["sub"]})
     return StreamingResponse(
-        Util.stream_generator(input.messages, config),
+        Util.stream_generator(input.messages, config, request),
         media_type="text/event-stream",
     )
+
+
+@router.get("/results/{cursor}", response_model=ResultPage)
+async def chat_results(cursor: str, user: dict = Depends(get_enhanced_user)):
+    """Next page of a query result, from the cursor returned with the previous page.
+
+    Cursors are held by the worker that ran the query, see ``ResultCursors``. On any other
+    worker, or after a restart, the cursor is not found.
+    """
+    entry = result_cursors.get(cursor, user["sub"])
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Result cursor not found or expired")
+
+    fetch_batch_tool = await app_state.tool_registry.get("Fetch Query Batch")
+    if not fetch_batch_tool:
+        raise HTTPException(status_code=503, detail="Query paging not available in the MCP Server")
+
+    page = json.loads(await fetch_batch_tool.arun({"stream_id": entry["stream_id"]}))
+    if not page.get("success"):
+        result_cursors.discard(cursor)
+        raise HTTPException(status_code=410, detail=page.get("error", "Result cursor expired"))
+
+    if page["done"]:
+        result_cursors.discard(cursor)
+    return ResultPage(
+        query=entry["query"],
+        columns=entry["columns"],
+        data=page["data"],
+        row_count=page["row_count"],
+        next_cursor=None if page["done"] else cursor,
+    )
+
+
+@router.get("/export/{thread_id}")
+async def chat_export(
+    thread_id: str,
+    format: Literal["csv", "parquet"] = "csv",
+    user: dict = Depends(get_enhanced_user),
+):
+    """Full result of the thread's last validated query as a CSV or Parquet download.
+
+    Capped at EXPORT_MAX_ROWS rows and streamed, so memory use does not grow with the result.
+    """
+    if await thread_owner(thread_id) != user["sub"]:
+        raise HTTPException(status_code=404, detail="Thread not found")
+
+    snapshot = await app_state.graph.aget_state(
+        RunnableConfig(configurable={"thread_id": thread_id})
+    )
+    values = snapshot.values if snapshot else {}
+
+    generated_sql = values.get("generated_sql")
+    valid_sql = values.get("valid_sql") or {}
+    if not generated_sql or not valid_sql.get("valid") or valid_sql.get("query") != generated_sql:
+        raise HTTPException(status_code=404, detail="No validated query to export in this thread")
+
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+
+    logger.info(f"Exporting {format} for thread {thread_id}: {generated_sql}")
+    filename = re.sub(r"[^\w.-]", "_", thread_id) + f".{format}"
+    if format == "parquet":
+        body, media_type = export_parquet(generated_sql), "application/vnd.apache.parquet"
+    else:
+        body, media_type = export_csv(generated_sql), "text/csv"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -2,9 +2,18 @@ from datetime import datetime
 
 from fastapi import APIRouter
 
+from app.agent.prefetch import speculative_prefetcher
+from app.core.app_state import app_state
+from app.core.config import settings
+
 router = APIRouter()
 
 
 @router.get("")
 async def health():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    response = {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    if app_state.tool_registry is not None:
+        response["mcp_tools"] = app_state.tool_registry.stats()
+    if settings.SPECULATIVE_PREFETCH:
+        response["speculative_prefetch"] = speculative_prefetcher.stats()
+    return response
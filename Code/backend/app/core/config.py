@@ -48,9 +48,65 @@ class Settings(BaseSettings):
     DB_NAME: str = Defaults.DB_NAME
     DB_USER: str = Defaults.DB_USER
     DB_PASSWORD: str = Defaults.DB_PASSWORD
+    DB_POOL_SIZE: int = Defaults.DB_POOL_SIZE
+    DB_MAX_OVERFLOW: int = Defaults.DB_MAX_OVERFLOW
+    DB_POOL_RECYCLE_SECONDS: int = Defaults.DB_POOL_RECYCLE_SECONDS
 
     # === Vector Database =====
     DEFAULT_COLLECTION_NAME: str = Defaults.DEFAULT_COLLECTION_NAME
+    VECTORSTORE_CACHE_SIZE: int = Defaults.VECTORSTORE_CACHE_SIZE
+
+    # === Semantic SQL cache ===
+    SQL_CACHE_ENABLED: bool = Defaults.SQL_CACHE_ENABLED
+    SQL_CACHE_BACKEND: Literal["pgvector", "memory"] = Defaults.SQL_CACHE_BACKEND
+    SQL_CACHE_SIMILARITY_THRESHOLD: float = Defaults.SQL_CACHE_SIMILARITY_THRESHOLD
+    SQL_CACHE_MAX_ENTRIES: int = Defaults.SQL_CACHE_MAX_ENTRIES
+    SQL_CACHE_SCHEMA_TTL_SECONDS: int = Defaults.SQL_CACHE_SCHEMA_TTL_SECONDS
+
+    # === Query result cache (MCP server) ===
+    QUERY_CACHE_ENABLED: bool = Defaults.QUERY_CACHE_ENABLED
+    QUERY_CACHE_TTL_SECONDS: int = Defaults.QUERY_CACHE_TTL_SECONDS
+    QUERY_CACHE_MAX_ENTRIES: int = Defaults.QUERY_CACHE_MAX_ENTRIES
+
+    # === Pre-triage ===
+    PRE_TRIAGE_ENABLED: bool = Defaults.PRE_TRIAGE_ENABLED
+    PRE_TRIAGE_MIN_CONFIDENCE: float = Defaults.PRE_TRIAGE_MIN_CONFIDENCE
+    PRE_TRIAGE_USE_EMBEDDINGS: bool = Defaults.PRE_TRIAGE_USE_EMBEDDINGS
+
+    # === SQL generation ===
+    SQL_PREFETCH_TIMEOUT_SECONDS: float = Defaults.SQL_PREFETCH_TIMEOUT_SECONDS
+    SPECULATIVE_PREFETCH: bool = Defaults.SPECULATIVE_PREFETCH
+    LOCAL_SQL_VALIDATION: bool = Defaults.LOCAL_SQL_VALIDATION
+    SCHEMA_CATALOG_TTL_SECONDS: int = Defaults.SCHEMA_CATALOG_TTL_SECONDS
+    SQL_REPAIR_ENABLED: bool = Defaults.SQL_REPAIR_ENABLED
+    SQL_REPAIR_MAX_ATTEMPTS: int = Defaults.SQL_REPAIR_MAX_ATTEMPTS
+    SQL_GENERATION_MODE: Literal["sequential", "parallel"] = Defaults.SQL_GENERATION_MODE
+    SQL_CANDIDATES: int = Defaults.SQL_CANDIDATES
+    SQL_CANDIDATE_CONCURRENCY: int = Defaults.SQL_CANDIDATE_CONCURRENCY
+    SQL_CANDIDATE_TOKEN_BUDGET: int = Defaults.SQL_CANDIDATE_TOKEN_BUDGET
+
+    # === Streaming ===
+    STREAM_TRIAGE_TOKENS: bool = Defaults.STREAM_TRIAGE_TOKENS
+
+    # === SQL execution ===
+    COMBINED_VALIDATE_EXECUTE: bool = Defaults.COMBINED_VALIDATE_EXECUTE
+    QUERY_STATEMENT_TIMEOUT_MS: int = Defaults.QUERY_STATEMENT_TIMEOUT_MS
+    QUERY_STREAMING: bool = Defaults.QUERY_STREAMING
+    QUERY_STREAM_BATCH_SIZE: int = Defaults.QUERY_STREAM_BATCH_SIZE
+    QUERY_STREAM_MAX_ROWS: int = Defaults.QUERY_STREAM_MAX_ROWS
+    QUERY_STREAM_IDLE_TIMEOUT_SECONDS: int = Defaults.QUERY_STREAM_IDLE_TIMEOUT_SECONDS
+    QUERY_STREAM_MAX_OPEN: int = Defaults.QUERY_STREAM_MAX_OPEN
+    QUERY_STATE_SAMPLE_ROWS: int = Defaults.QUERY_STATE_SAMPLE_ROWS
+    QUERY_RESULT_FORMAT: Literal["rows", "columnar"] = Defaults.QUERY_RESULT_FORMAT
+    QUERY_PAGINATION: bool = Defaults.QUERY_PAGINATION
+    QUERY_PAGE_SIZE: int = Defaults.QUERY_PAGE_SIZE
+    SUMMARY_SAMPLE_ROWS: int = Defaults.SUMMARY_SAMPLE_ROWS
+
+    # === Export ===
+    EXPORT_MAX_ROWS: int = Defaults.EXPORT_MAX_ROWS
+    EXPORT_BATCH_SIZE: int = Defaults.EXPORT_BATCH_SIZE
+    EXPORT_QUEUE_CHUNKS: int = Defaults.EXPORT_QUEUE_CHUNKS
+    EXPORT_STATEMENT_TIMEOUT_MS: int = Defaults.EXPORT_STATEMENT_TIMEOUT_MS
 
     # === API ===
     API_V1_STR: str = Defaults.API_V1_STR
@@ -98,7 +154,14 @@ class Settings(BaseSettings):
     MCP_SERVER_HOST: str = Defaults.MCP_SERVER_HOST
     MCP_SERVER_PORT: int = Defaults.MCP_SERVER_PORT
     MCP_SERVER_NAME: str = Defaults.MCP_SERVER_NAME
-    MCP_SERVER_TRANSPORT: Literal["streamable_http"] = Defaults.MCP_SERVER_TRANSPORT
+    MCP_SERVER_TRANSPORT: Literal["streamable_http", "in_process"] = Defaults.MCP_SERVER_TRANSPORT
+    MCP_PROMPT_CACHE_TTL_SECONDS: int = Defaults.MCP_PROMPT_CACHE_TTL_SECONDS
+    MCP_SESSION_MODE: Literal["pooled", "per_call"] = Defaults.MCP_SESSION_MODE
+    MCP_SESSION_POOL_SIZE: int = Defaults.MCP_SESSION_POOL_SIZE
+    MCP_SESSION_HEALTH_CHECK_INTERVAL_SECONDS: int = (
+        Defaults.MCP_SESSION_HEALTH_CHECK_INTERVAL_SECONDS
+    )
+    MCP_SESSION_CONNECT_TIMEOUT_SECONDS: int = Defaults.MCP_SESSION_CONNECT_TIMEOUT_SECONDS
 
     # =======Tracing & Evaluation========
     LANGSMITH_API_KEY: str = Defaults.LANGSMITH_API_KEY
@@ -23,6 +23,9 @@ class Defaults:
     DB_NAME = "postgres"
     DB_USER = "postgres"
     DB_PASSWORD = "postgres" #pragma: allowlist secret
+    DB_POOL_SIZE = 5
+    DB_MAX_OVERFLOW = 10
+    DB_POOL_RECYCLE_SECONDS = 1800
 
     # =======Model======
     LLM_API_KEY = "sk-...."  # pragma: allowlist secret
@@ -31,6 +34,59 @@ class Defaults:
 
     # == Vector Database ====
     DEFAULT_COLLECTION_NAME = "default_collection"
+    VECTORSTORE_CACHE_SIZE = 32
+
+    # === Semantic SQL cache ===
+    SQL_CACHE_ENABLED = False
+    SQL_CACHE_BACKEND = "pgvector"
+    SQL_CACHE_SIMILARITY_THRESHOLD = 0.95
+    SQL_CACHE_MAX_ENTRIES = 1000
+    SQL_CACHE_SCHEMA_TTL_SECONDS = 300
+
+    # === Query result cache (MCP server) ===
+    QUERY_CACHE_ENABLED = True
+    QUERY_CACHE_TTL_SECONDS = 60
+    QUERY_CACHE_MAX_ENTRIES = 256
+
+    # === Pre-triage ===
+    PRE_TRIAGE_ENABLED = True
+    PRE_TRIAGE_MIN_CONFIDENCE = 0.85
+    PRE_TRIAGE_USE_EMBEDDINGS = False
+
+    # === SQL generation ===
+    SQL_PREFETCH_TIMEOUT_SECONDS = 5.0
+    SPECULATIVE_PREFETCH = False
+    LOCAL_SQL_VALIDATION = True
+    SCHEMA_CATALOG_TTL_SECONDS = 300
+    SQL_REPAIR_ENABLED = True
+    SQL_REPAIR_MAX_ATTEMPTS = 2
+    SQL_GENERATION_MODE = "sequential"
+    SQL_CANDIDATES = 3
+    SQL_CANDIDATE_CONCURRENCY = 3
+    SQL_CANDIDATE_TOKEN_BUDGET = 512
+
+    # === Streaming ===
+    STREAM_TRIAGE_TOKENS = False
+
+    # === SQL execution ===
+    COMBINED_VALIDATE_EXECUTE = True
+    QUERY_STATEMENT_TIMEOUT_MS = 30000
+    QUERY_STREAMING = False
+    QUERY_STREAM_BATCH_SIZE = 500
+    QUERY_STREAM_MAX_ROWS = 10000
+    QUERY_STREAM_IDLE_TIMEOUT_SECONDS = 60
+    QUERY_STREAM_MAX_OPEN = 8
+    QUERY_STATE_SAMPLE_ROWS = 200
+    QUERY_RESULT_FORMAT = "rows"
+    QUERY_PAGINATION = False
+    QUERY_PAGE_SIZE = 50
+    SUMMARY_SAMPLE_ROWS = 20
+
+    # === Export ===
+    EXPORT_MAX_ROWS = 1_000_000
+    EXPORT_BATCH_SIZE = 10_000
+    EXPORT_QUEUE_CHUNKS = 16
+    EXPORT_STATEMENT_TIMEOUT_MS = 600_000
 
     # === Auth ===
     ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 8  # 8 days
@@ -59,6 +115,11 @@ class Defaults:
     MCP_SERVER_PORT = 8004
     MCP_SERVER_NAME = "sql_server"
     MCP_SERVER_TRANSPORT = "streamable_http"
+    MCP_PROMPT_CACHE_TTL_SECONDS = 300
+    MCP_SESSION_MODE = "pooled"
+    MCP_SESSION_POOL_SIZE = 4
+    MCP_SESSION_HEALTH_CHECK_INTERVAL_SECONDS = 30
+    MCP_SESSION_CONNECT_TIMEOUT_SECONDS = 10
 
     # =======Tracing & Evaluation========
     LANGSMITH_API_KEY = "lsv2_......"  # pragma: allowlist secret
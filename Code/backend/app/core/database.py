@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from contextlib import asynccontextmanager
 from typing import Any, AsyncGenerator, Optional, Union
 
@@ -12,10 +13,17 @@ from app.core.config import settings
 from app.core.logging import logger
 
 _pool: asyncpg.Pool | None = None
+_engine: Engine | None = None
+_vectorstores: OrderedDict[tuple[str, str], PGVector] = OrderedDict()
+default_embeddings: Embeddings = settings.DEFAULT_EMBEDDINGS
 
 SYSTEM_COLLECTIONS = [
     {"name": "database_schema", "metadata": {"description": "Database schema reference"}},
     {"name": "sql_queries", "metadata": {"description": "Few-shot SQL examples"}},
+    {
+        "name": "sql_cache",
+        "metadata": {"description": "Semantic cache of executed NL to SQL pairs"},
+    },
 ]
 system_id = "root"
 
@@ -48,16 +56,28 @@ async def close_db_pool():
 @asynccontextmanager
 async def get_db_connection() -> AsyncGenerator[asyncpg.Connection, None]:
     pool = await get_db_pool()
+    # Released back to the pool on exit, closing it here would force a new connection per call.
     async with pool.acquire() as conn:
-        try:
-            yield conn
-        finally:
-            await conn.close()
+        yield conn
 
 
 def get_vectorstore_engine() -> Engine:
-    engine = create_engine(settings.DATABASE_URL)
-    return engine
+    """Get the process-wide SQLAlchemy engine shared by all PGVector stores."""
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            settings.DATABASE_URL,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=True,
+        )
+        logger.info("Vector store engine created.")
+    return _engine
+
+
+def _embedding_model_name(embeddings: Embeddings) -> str:
+    return getattr(embeddings, "model", None) or type(embeddings).__name__
 
 
 DBConnection = Union[sqlalchemy.engine.Engine, str]
@@ -65,31 +85,44 @@ DBConnection = Union[sqlalchemy.engine.Engine, str]
 
 def get_vectorstore(
     collection_name: str = settings.DEFAULT_COLLECTION_NAME,
-    embeddings: Embeddings = settings.DEFAULT_EMBEDDINGS,
+    embeddings: Embeddings = default_embeddings,
     engine: Optional[Union[DBConnection, Engine, AsyncEngine]] = None,
     collection_metadata: Optional[dict[str, Any]] = None,
 ) -> PGVector:
     """Initializes and returns a PGVector store for a specific collection,
-    using an existing engine or creating one from connection parameters.
+    using an existing engine or the shared one. Stores on the shared engine are kept in an
+    LRU cache keyed by collection and embedding model, so the collection setup runs only once.
     """
+    cache_key = (collection_name, _embedding_model_name(embeddings))
     if engine is None:
-        engine = get_vectorstore_engine()
+        store = _vectorstores.get(cache_key)
+        if store is not None:
+            _vectorstores.move_to_end(cache_key)
+            return store
 
     store = PGVector(
         embeddings=embeddings,
         collection_name=collection_name,
-        connection=engine,
+        connection=engine if engine is not None else get_vectorstore_engine(),
         use_jsonb=True,
         collection_metadata=collection_metadata,
     )
+    if engine is None:
+        _vectorstores[cache_key] = store
+        while len(_vectorstores) > settings.VECTORSTORE_CACHE_SIZE:
+            _vectorstores.popitem(last=False)
     return store
 
 
 async def create_system_collections():
-    from app.services.embbedings import CollectionsManager
+    from app.services.embbedings import CollectionsManager, collection_catalog
 
-    existing = [c for c in await CollectionsManager(user_id=system_id).list()]
+    manager = CollectionsManager(user_id=system_id)
     for c in SYSTEM_COLLECTIONS:
-        if not any(col["name"] == c["name"] for col in existing):
-            await CollectionsManager(user_id=system_id).create(c["name"], c["metadata"])
+        details = await manager.get_by_name(c["name"])
+        if not details:
+            await manager.create(c["name"], c["metadata"])
             logger.info(f"Created System Collection: {c['name']}")
+            details = await manager.get_by_name(c["name"])
+        if details:
+            collection_catalog.register(system_id, details)
@@ -0,0 +1,100 @@
+from functools import cached_property
+from typing import Any, Iterator, Literal, Sequence
+
+ResultFormat = Literal["rows", "columnar"]
+
+ROWS: ResultFormat = "rows"
+COLUMNAR: ResultFormat = "columnar"
+
+
+def to_columnar(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> list[list[Any]]:
+    """Transpose database rows into one array per column, in the order of ``columns``."""
+    if not rows:
+        return [[] for _ in columns]
+    return [list(values) for values in zip(*rows, strict=True)]
+
+
+def encode_result(payload: dict[str, Any], result_format: ResultFormat) -> dict[str, Any]:
+    """Shape a columnar query payload for the wire.
+
+    ``rows`` gives the original ``data`` list with one dict per row, ``columnar`` keeps the
+    column names once and a ``values`` array per column, which is about half the JSON size.
+    """
+    if result_format == COLUMNAR:
+        return {**payload, "format": COLUMNAR}
+    rows_payload = {key: value for key, value in payload.items() if key != "values"}
+    rows_payload["format"] = ROWS
+    rows_payload["data"] = QueryResult(payload).rows
+    return rows_payload
+
+
+class QueryResult:
+    """Read access to a query result in either wire format, decoded only as far as needed.
+
+    Accepts a payload of ``Execute Query`` (or its ``encoded`` form kept in the agent state) in
+    the ``rows`` or ``columnar`` format, or a plain list of row dicts. Row dicts of a columnar
+    result are only built when ``rows`` or iteration asks for them.
+    """
+
+    def __init__(self, source: dict[str, Any] | list[dict[str, Any]] | None) -> None:
+        if source is None:
+            source = []
+        if isinstance(source, list):
+            source = {"format": ROWS, "data": source}
+        self._source = source
+        self.format: ResultFormat = source.get("format") or (
+            COLUMNAR if "values" in source else ROWS
+        )
+
+    @property
+    def columns(self) -> list[str]:
+        if "columns" in self._source:
+            return list(self._source["columns"])
+        data = self._source.get("data") or []
+        return list(data[0]) if data else []
+
+    def __len__(self) -> int:
+        if self.format == COLUMNAR:
+            values = self._source.get("values") or []
+            return len(values[0]) if values else 0
+        return len(self._source.get("data") or [])
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        if self.format == COLUMNAR:
+            columns = self.columns
+            for row in zip(*self._source.get("values") or [], strict=True):
+                yield dict(zip(columns, row, strict=True))
+        else:
+            yield from self._source.get("data") or []
+
+    @cached_property
+    def rows(self) -> list[dict[str, Any]]:
+        if self.format == ROWS:
+            return self._source.get("data") or []
+        return list(self)
+
+    def column(self, name: str) -> list[Any]:
+        if self.format == COLUMNAR:
+            return self._source["values"][self.columns.index(name)]
+        return [row.get(name) for row in self.rows]
+
+    def as_columns(self) -> dict[str, list[Any]]:
+        """Mapping of column name to values, ready for ``pd.DataFrame``."""
+        if self.format == COLUMNAR:
+            return dict(zip(self.columns, self._source.get("values") or [], strict=True))
+        return {name: self.column(name) for name in self.columns}
+
+    @property
+    def encoded(self) -> list[dict[str, Any]] | dict[str, Any]:
+        """The compact form to keep in state or send to the client: row dicts, or columns and
+        per-column values."""
+        if self.format == COLUMNAR:
+            return {
+                "format": COLUMNAR,
+                "columns": self.columns,
+                "values": self._source.get("values") or [],
+            }
+        return self.rows
@@ -0,0 +1,70 @@
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+from rich.console import Console
+from rich.table import Table
+
+from app.core.result_format import COLUMNAR, ROWS, QueryResult, encode_result, to_columnar
+
+console = Console()
+
+COLUMNS = ["order_id", "customer_name", "status", "amount", "quantity", "created_at"]
+STATUSES = ["pending", "shipped", "delivered", "cancelled"]
+
+
+def make_rows(count: int) -> list[tuple]:
+    started = datetime(2024, 1, 1)
+    return [
+        (
+            i,
+            f"Customer {random.randint(1, 5000)}",
+            random.choice(STATUSES),
+            round(random.uniform(1, 2500), 2),
+            random.randint(1, 20),
+            (started + timedelta(minutes=7 * i)).isoformat(),
+        )
+        for i in range(count)
+    ]
+
+
+def timed(fn, repeat: int = 5) -> float:
+    """Best of ``repeat`` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best
+
+
+def main():
+    table = Table(title="Query result wire formats")
+    for column in ("Rows", "Format", "JSON size", "Encode ms", "Parse ms", "Parse + rows ms"):
+        table.add_column(column, justify="right")
+
+    for count in (10, 1_000, 50_000):
+        rows = make_rows(count)
+        payload = {"success": True, "columns": COLUMNS, "values": to_columnar(COLUMNS, rows)}
+
+        for result_format in (ROWS, COLUMNAR):
+            encoded = json.dumps(encode_result(payload, result_format))
+            encode_ms = timed(lambda fmt=result_format: json.dumps(encode_result(payload, fmt)))
+            parse_ms = timed(lambda text=encoded: json.loads(text))
+            # What the agent pays when the summary needs every row as a dict.
+            rows_ms = timed(lambda text=encoded: QueryResult(json.loads(text)).rows)
+            table.add_row(
+                f"{count:,}",
+                result_format,
+                f"{len(encoded) / 1024:,.1f} KiB",
+                f"{encode_ms:.2f}",
+                f"{parse_ms:.2f}",
+                f"{rows_ms:.2f}",
+            )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
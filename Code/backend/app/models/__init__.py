@@ -1,10 +1,11 @@
 # Import the Base from its central location
 from app.models.base import Base
 
+from .chat_thread import ChatThread
 from .collection import CollectionStore
 from .embedding import EmbeddingStore
 
 # Import all the models here
 from .item import Item
 
-__all__ = ["Base", "Item", "CollectionStore", "EmbeddingStore"]
+__all__ = ["Base", "Item", "ChatThread", "CollectionStore", "EmbeddingStore"]
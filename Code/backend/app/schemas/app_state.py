@@ -6,3 +6,4 @@ class AppState:
     main_reflection_executor = None
     memory_tools = None
     langfuse_handler = None
+    tool_registry = None
@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic import BaseModel
 
 
@@ -14,3 +16,11 @@ class ChatResponse(BaseModel):
     thread_id: str
     session_id: str
     timestamp: str
+
+
+class ResultPage(BaseModel):
+    query: str
+    columns: list[str]
+    data: list[dict[str, Any]]
+    row_count: int
+    next_cursor: str | None = None
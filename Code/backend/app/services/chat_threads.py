@@ -0,0 +1,35 @@
+from typing import Optional
+
+from app.core.database import get_db_connection
+
+
+async def claim_thread(thread_id: str, user_id: str) -> bool:
+    """Record ``user_id`` as the owner of a thread on its first use.
+
+    Returns False when the thread already belongs to another user.
+    """
+    async with get_db_connection() as conn:
+        owner = await conn.fetchval(
+            """
+            WITH claimed AS (
+                INSERT INTO chat_threads (thread_id, user_id)
+                VALUES ($1, $2)
+                ON CONFLICT (thread_id) DO NOTHING
+                RETURNING user_id
+            )
+            SELECT user_id FROM claimed
+            UNION ALL
+            SELECT user_id FROM chat_threads WHERE thread_id = $1
+            LIMIT 1
+            """,
+            thread_id,
+            user_id,
+        )
+    return owner == user_id
+
+
+async def thread_owner(thread_id: str) -> Optional[str]:
+    async with get_db_connection() as conn:
+        return await conn.fetchval(
+            "SELECT user_id FROM chat_threads WHERE thread_id = $1", thread_id
+        )
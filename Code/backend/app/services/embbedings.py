@@ -1,3 +1,4 @@
+import asyncio
 import builtins
 import json
 import uuid
@@ -8,12 +9,49 @@ from fastapi.exceptions import HTTPException
 from langchain_core.documents import Document
 from loguru import logger
 
-from app.core.database import get_db_connection, get_vectorstore
+from app.core.database import default_embeddings, get_db_connection, get_vectorstore
 from app.schemas.collection import CollectionDetails
 
 SYSTEM_OWNERS = {"system", "root"}
 
 
+class CollectionCatalog:
+    """In-memory index of collections by (owner, name).
+
+    Resolves a collection name to its uuid and PGVector table id without listing every
+    collection. Entries are filled by ``create_system_collections`` or on the first lookup and
+    are dropped whenever ``CollectionsManager`` creates, updates or deletes a collection.
+    """
+
+    def __init__(self) -> None:
+        self._by_name: dict[tuple[str, str], CollectionDetails] = {}
+
+    def register(self, owner_id: str, details: CollectionDetails) -> None:
+        self._by_name[(owner_id, details["name"])] = details
+
+    def lookup(self, name: str, owner_id: str) -> CollectionDetails | None:
+        return self._by_name.get((owner_id, name))
+
+    async def resolve(self, name: str, owner_id: str) -> CollectionDetails | None:
+        details = self.lookup(name, owner_id)
+        if details is None:
+            details = await CollectionsManager(owner_id).get_by_name(name)
+            if details:
+                self.register(owner_id, details)
+        return details
+
+    def invalidate(self, collection_id: str | None = None) -> None:
+        if collection_id is None:
+            self._by_name.clear()
+            return
+        for key, details in list(self._by_name.items()):
+            if details["uuid"] == collection_id:
+                del self._by_name[key]
+
+
+collection_catalog = CollectionCatalog()
+
+
 class CollectionsManager:
     def __init__(self, user_id: str) -> None:
         self.user_id = user_id
@@ -81,6 +119,34 @@ class CollectionsManager:
             "table_id": rec["name"],
         }
 
+    async def get_by_name(
+        self,
+        collection_name: str,
+    ) -> CollectionDetails | None:
+        async with get_db_connection() as conn:
+            rec = await conn.fetchrow(
+                """
+                SELECT uuid, name, cmetadata
+                  FROM langchain_pg_collection
+                 WHERE cmetadata->>'name' = $1
+                   AND cmetadata->>'owner_id' = $2;
+                """,
+                collection_name,
+                self.user_id,
+            )
+
+        if not rec:
+            return None
+
+        metadata = json.loads(rec["cmetadata"])
+        name = metadata.pop("name", "Unnamed")
+        return {
+            "uuid": str(rec["uuid"]),
+            "name": name,
+            "metadata": metadata,
+            "table_id": rec["name"],
+        }
+
     async def create(
         self,
         collection_name: str,
@@ -93,6 +159,7 @@ class CollectionsManager:
         table_id = str(uuid.uuid4())
 
         get_vectorstore(table_id, collection_metadata=metadata)
+        collection_catalog.invalidate()
 
         async with get_db_connection() as conn:
             rec = await conn.fetchrow(
@@ -203,6 +270,7 @@ class CollectionsManager:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Collection '{collection_id}' not found or not owned by you.",
             )
+        collection_catalog.invalidate(collection_id)
 
         full_meta = json.loads(rec["cmetadata"])
         friendly_name = full_meta.pop("name", "Unnamed")
@@ -247,13 +315,15 @@ class CollectionsManager:
                 collection_id,
                 self.user_id,
             )
+        collection_catalog.invalidate(collection_id)
         return int(result.split()[-1])
 
 
 class Collection:
-    def __init__(self, collection_id: str, user_id: str) -> None:
+    def __init__(self, collection_id: str, user_id: str, table_id: Optional[str] = None) -> None:
         self.collection_id = collection_id
         self.user_id = user_id
+        self.table_id = table_id
 
     async def _get_details_or_raise(self) -> dict[str, Any]:
         details = await CollectionsManager(self.user_id).get(self.collection_id)
@@ -261,12 +331,29 @@ class Collection:
             raise HTTPException(status_code=404, detail="Collection not found")
         return details
 
+    async def _get_table_id(self) -> str:
+        if self.table_id is None:
+            details = await self._get_details_or_raise()
+            self.table_id = details["table_id"]
+        return self.table_id
+
     async def upsert(self, documents: list[Document]) -> list[str]:
-        details = await self._get_details_or_raise()
-        store = get_vectorstore(collection_name=details["table_id"])
+        store = get_vectorstore(collection_name=await self._get_table_id())
         added_ids = store.add_documents(documents)
         return added_ids
 
+    async def upsert_embeddings(
+        self,
+        texts: list[str],
+        embeddings: list[list[float]],
+        metadatas: list[dict[str, Any]],
+    ) -> list[str]:
+        """Store texts whose embeddings were already computed by the caller."""
+        store = get_vectorstore(collection_name=await self._get_table_id())
+        return await asyncio.to_thread(
+            store.add_embeddings, texts=texts, embeddings=embeddings, metadatas=metadatas
+        )
+
     async def delete(
         self,
         *,
@@ -393,22 +480,60 @@ class Collection:
             "metadata": metadata,
         }
 
-    async def search(self, query: str, *, limit: int = 4) -> builtins.list[dict[str, Any]]:
-        details = await self._get_details_or_raise()
-        store = get_vectorstore(collection_name=details["table_id"])
-        results = store.similarity_search_with_score(query, k=limit)
+    async def search_by_vector(
+        self,
+        embedding: builtins.list[float],
+        *,
+        limit: int = 4,
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> builtins.list[dict[str, Any]]:
+        """Cosine-distance nearest neighbours, same scoring as PGVector's default strategy.
+
+        The ANN query is awaited on the asyncpg pool, so a search never blocks the event loop
+        the way ``PGVector.similarity_search_with_score`` does. ``metadata`` restricts the search
+        to documents whose metadata contains those key/value pairs.
+        """
+        vector = "[" + ",".join(str(value) for value in embedding) + "]"
+        async with get_db_connection() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT e.id,
+                       e.document,
+                       e.cmetadata,
+                       e.embedding <=> $1::vector AS distance
+                  FROM langchain_pg_embedding e
+                  JOIN langchain_pg_collection c
+                    ON e.collection_id = c.uuid
+                 WHERE c.uuid = $2
+                   AND (c.cmetadata->>'owner_id' = $3 OR c.cmetadata->>'owner_id' = ANY($4))
+                   AND e.cmetadata @> $6::jsonb
+                 ORDER BY e.embedding <=> $1::vector
+                 LIMIT $5
+                """,
+                vector,
+                self.collection_id,
+                self.user_id,
+                list(SYSTEM_OWNERS),
+                limit,
+                json.dumps(metadata or {}),
+            )
+
+        if not rows:
+            await self._get_details_or_raise()
         return [
             {
-                "id": doc.id,
-                "page_content": doc.page_content,
-                "metadata": doc.metadata,
-                "score": score,
+                "id": r["id"],
+                "page_content": r["document"],
+                "metadata": json.loads(r["cmetadata"]) if r["cmetadata"] else {},
+                "score": r["distance"],
             }
-            for doc, score in results
+            for r in rows
         ]
 
+    async def search(self, query: str, *, limit: int = 4) -> builtins.list[dict[str, Any]]:
+        embedding = await default_embeddings.aembed_query(query)
+        return await self.search_by_vector(embedding, limit=limit)
+
     async def search_min(self, query: str, *, limit: int = 4) -> List[str]:
-        details = await self._get_details_or_raise()
-        store = get_vectorstore(collection_name=details["table_id"])
-        results = store.similarity_search_with_score(query, k=limit)
-        return [doc.page_content for doc, score in results]
+        results = await self.search(query, limit=limit)
+        return [r["page_content"] for r in results]
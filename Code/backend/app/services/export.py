@@ -0,0 +1,165 @@
+import asyncio
+import contextlib
+import importlib.util
+import io
+from typing import AsyncIterator, Optional
+
+from app.core.config import settings
+from app.core.database import get_db_connection
+from app.core.logging import logger
+
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _capped(sql: str, max_rows: int) -> str:
+    return f"SELECT * FROM ({sql.strip().rstrip(';')}) AS export LIMIT {int(max_rows)}"
+
+
+async def _begin_export(connection) -> None:
+    await connection.execute(
+        f"SET LOCAL statement_timeout = {int(settings.EXPORT_STATEMENT_TIMEOUT_MS)}"
+    )
+
+
+async def export_csv(sql: str, max_rows: int = settings.EXPORT_MAX_ROWS) -> AsyncIterator[bytes]:
+    """Stream the result of a query as CSV with a header row, using ``COPY ... TO STDOUT``.
+
+    Postgres produces the CSV itself. Chunks pass through a small bounded queue, so a slow client
+    slows the COPY down instead of letting the result pile up in memory.
+    """
+    queue: asyncio.Queue[Optional[bytes]] = asyncio.Queue(maxsize=settings.EXPORT_QUEUE_CHUNKS)
+
+    async def copy() -> None:
+        try:
+            async with get_db_connection() as connection, connection.transaction(readonly=True):
+                await _begin_export(connection)
+                await connection.copy_from_query(
+                    _capped(sql, max_rows), output=queue.put, format="csv", header=True
+                )
+        finally:
+            # Once the download was abandoned nobody reads the queue any more, waiting for room
+            # for the end marker would keep the task, and its connection, alive forever.
+            if not asyncio.current_task().cancelling():
+                await queue.put(None)
+
+    task = asyncio.create_task(copy())
+    try:
+        while (chunk := await queue.get()) is not None:
+            yield chunk
+        await task
+    except Exception as e:
+        logger.error(f"CSV export failed: {e}")
+        raise
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last ``drain``."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def arrow_schema(attributes):
+    """Parquet schema of a query from its Postgres column types (``PreparedStatement``
+    attributes), so it does not depend on which values the first rows happen to hold.
+
+    Types without an exact Arrow counterpart (UUID, JSON, arrays, ranges, ...) are written as
+    text, ``numeric`` as a double.
+    """
+    import pyarrow as pa
+
+    types = {
+        "bool": pa.bool_(),
+        "int2": pa.int16(),
+        "int4": pa.int32(),
+        "int8": pa.int64(),
+        "oid": pa.int64(),
+        "float4": pa.float32(),
+        "float8": pa.float64(),
+        "numeric": pa.float64(),
+        "money": pa.string(),
+        "date": pa.date32(),
+        "time": pa.time64("us"),
+        "timestamp": pa.timestamp("us"),
+        "timestamptz": pa.timestamp("us", tz="UTC"),
+        "interval": pa.duration("us"),
+        "bytea": pa.binary(),
+    }
+    return pa.schema(
+        [
+            pa.field(attribute.name, types.get(attribute.type.name, pa.string()))
+            for attribute in attributes
+        ]
+    )
+
+
+def _column_values(records: list, index: int, arrow_type) -> list:
+    import pyarrow as pa
+
+    values = [record[index] for record in records]
+    if pa.types.is_string(arrow_type):
+        return [v if v is None or isinstance(v, str) else str(v) for v in values]
+    if pa.types.is_floating(arrow_type):
+        return [v if v is None else float(v) for v in values]
+    return values
+
+
+async def export_parquet(
+    sql: str,
+    max_rows: int = settings.EXPORT_MAX_ROWS,
+    batch_size: int = settings.EXPORT_BATCH_SIZE,
+) -> AsyncIterator[bytes]:
+    """Stream the result of a query as a Parquet file, one row group per cursor batch.
+
+    Rows are read through a server-side cursor, so at most one batch is held in memory. The
+    schema comes from the query's column types, see ``arrow_schema``. Needs the optional
+    ``pyarrow`` package.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+
+    def write_batch(writer, records: list) -> None:
+        columns = [
+            pa.array(_column_values(records, index, field.type), type=field.type)
+            for index, field in enumerate(writer.schema)
+        ]
+        writer.write_batch(pa.RecordBatch.from_arrays(columns, schema=writer.schema))
+
+    try:
+        async with get_db_connection() as connection, connection.transaction(readonly=True):
+            await _begin_export(connection)
+            statement = await connection.prepare(_capped(sql, max_rows))
+            writer = pq.ParquetWriter(sink, arrow_schema(statement.get_attributes()))
+            cursor = await statement.cursor()
+            while records := await cursor.fetch(batch_size):
+                await asyncio.to_thread(write_batch, writer, records)
+                if chunk := sink.drain():
+                    yield chunk
+
+        writer.close()
+        if chunk := sink.drain():
+            yield chunk
+    except Exception as e:
+        logger.error(f"Parquet export failed: {e}")
+        raise
@@ -0,0 +1,90 @@
+import asyncio
+import secrets
+import time
+from typing import Any, Optional
+
+from app.core.app_state import app_state
+from app.core.config import settings
+from app.core.logging import logger
+
+
+class ResultCursors:
+    """Opaque tokens for the remaining pages of a query result.
+
+    A token stands for an open ``Open Query Stream`` cursor on the MCP server and belongs to the
+    user whose question produced it. Tokens are forgotten after the last page, or once they have
+    not been used for ``idle_timeout_seconds``. The stream behind an expired token is closed by
+    the next ``reap``, which ``run_reaper`` calls on a timer, so an abandoned cursor does not keep
+    its connection and transaction open on the MCP server.
+
+    Tokens live in process memory, like the open stream they stand for, so they do not survive
+    a restart and only the worker that answered the question can serve its next pages. Run the
+    API with a single worker, or route each user to the same worker (sticky sessions), when
+    ``QUERY_PAGINATION`` is on.
+    """
+
+    def __init__(self, idle_timeout_seconds: int) -> None:
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._cursors: dict[str, dict[str, Any]] = {}
+        # Streams of expired tokens, closed by the next ``reap``.
+        self._expired_streams: list[str] = []
+
+    def create(self, user_id: str, stream_id: str, query: str, columns: list[str]) -> str:
+        self._expire()
+        token = secrets.token_urlsafe(24)
+        self._cursors[token] = {
+            "user_id": user_id,
+            "stream_id": stream_id,
+            "query": query,
+            "columns": columns,
+            "last_used": time.monotonic(),
+        }
+        return token
+
+    def get(self, token: str, user_id: str) -> Optional[dict[str, Any]]:
+        """The cursor behind a token, or None if it is unknown, expired or someone else's."""
+        self._expire()
+        cursor = self._cursors.get(token)
+        if cursor is None or cursor["user_id"] != user_id:
+            return None
+        cursor["last_used"] = time.monotonic()
+        return cursor
+
+    def discard(self, token: str) -> None:
+        self._cursors.pop(token, None)
+
+    async def reap(self) -> None:
+        """Close the MCP streams of the tokens that expired since the last call."""
+        self._expire()
+        expired, self._expired_streams = self._expired_streams, []
+        if not expired:
+            return
+        close_stream_tool = await app_state.tool_registry.get("Close Query Stream")
+        if not close_stream_tool:
+            return
+        for stream_id in expired:
+            try:
+                await close_stream_tool.arun({"stream_id": stream_id})
+            except Exception as e:
+                logger.warning(f"Could not close expired query stream {stream_id}: {e}")
+
+    async def run_reaper(self, interval_seconds: float) -> None:
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.reap()
+            except Exception as e:
+                logger.warning(f"Reaping result cursors failed: {e}")
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        expired = [
+            token
+            for token, cursor in self._cursors.items()
+            if now - cursor["last_used"] > self.idle_timeout_seconds
+        ]
+        for token in expired:
+            self._expired_streams.append(self._cursors.pop(token)["stream_id"])
+
+
+result_cursors = ResultCursors(settings.QUERY_STREAM_IDLE_TIMEOUT_SECONDS)
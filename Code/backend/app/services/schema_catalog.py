@@ -0,0 +1,110 @@
+import asyncio
+import difflib
+import json
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from app.core.logging import logger
+from app.utils.sql_parser import analyze_sql
+
+READ_STATEMENTS = {"select", "with"}
+SYSTEM_COLUMNS = {"ctid", "xmin", "xmax", "cmin", "cmax", "tableoid", "oid"}
+
+
+class SchemaCatalog:
+    """Process-wide cache of the ``schema://catalog`` MCP resource, refreshed once per TTL.
+
+    The catalog covers tables, views and materialized views. Column names are indexed per
+    relation so that generated SQL can be checked without a database round trip.
+    """
+
+    def __init__(self, loader: Callable[[], Awaitable[Any]], ttl_seconds: int) -> None:
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self._tables: Optional[dict[str, dict[str, Any]]] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> dict[str, dict[str, Any]]:
+        if self._tables is None or time.monotonic() - self._loaded_at > self.ttl_seconds:
+            async with self._lock:
+                if self._tables is None or time.monotonic() - self._loaded_at > self.ttl_seconds:
+                    data = await self._loader()
+                    if isinstance(data, (str, bytes)):
+                        data = json.loads(data)
+                    self._tables = {
+                        name: {**table, "column_names": [c["name"] for c in table["columns"]]}
+                        for name, table in data["tables"].items()
+                    }
+                    self._loaded_at = time.monotonic()
+                    logger.info(f"Schema catalog loaded with {len(self._tables)} tables")
+        return self._tables
+
+    def invalidate(self) -> None:
+        self._tables = None
+
+
+def _error(query: str, error_type: str, message: str) -> dict[str, Any]:
+    return {
+        "valid": False,
+        "error": message,
+        "query": query,
+        "error_type": error_type,
+        "source": "local",
+    }
+
+
+def validate_sql_locally(query: str, tables: dict[str, dict[str, Any]]) -> Optional[dict[str, Any]]:
+    """Check the tables and qualified columns of a SELECT against the catalog.
+
+    Returns a validation result in the shape of the ``Validate SQL`` tool when an identifier is
+    certainly unknown, otherwise None. Error messages follow Postgres' wording so callers can
+    treat local and database errors alike. Only misses that cannot be explained by something the
+    tokenizer does not model are reported: unqualified column names (which may be output aliases,
+    keywords or function arguments) are always left for Postgres to judge, and so are qualifiers
+    that refer to different tables in different parts of the statement, or to a subquery or CTE.
+    The catalog only covers the current schema, so an unqualified table it does not know may
+    still resolve through the ``search_path`` and is passed on as well.
+    """
+    structure = analyze_sql(query)
+    if structure.statement not in READ_STATEMENTS:
+        return None
+
+    sources: dict[str, set[str]] = {}
+    for ref in structure.tables:
+        if ref.schema not in (None, "public") or ref.name in structure.cte_names:
+            continue
+        if ref.name not in tables:
+            if ref.schema is None:
+                continue  # e.g. pg_tables, or a table of another schema on the search path
+            message = f'relation "{ref.name}" does not exist.'
+            similar = difflib.get_close_matches(ref.name, list(tables), n=5, cutoff=0.6)
+            if similar:
+                message += f" Similar tables: {', '.join(similar)}"
+            return _error(query, "UndefinedTable", message)
+        sources.setdefault(ref.name, set()).add(ref.name)
+        if ref.alias:
+            sources.setdefault(ref.alias, set()).add(ref.name)
+
+    # Names of subqueries (``FROM (SELECT ...) orders``) and CTEs, which may shadow a table.
+    table_aliases = {ref.alias for ref in structure.tables if ref.alias}
+    derived = structure.cte_names | (structure.aliases - table_aliases)
+
+    for column in structure.columns:
+        if column.qualifier is None or column.name == "*" or column.name in SYSTEM_COLUMNS:
+            continue
+        if column.qualifier in derived:
+            continue
+        table_names = sources.get(column.qualifier)
+        if table_names is None or len(table_names) != 1:
+            continue
+        (table_name,) = table_names
+        if column.name not in tables[table_name]["column_names"]:
+            available = ", ".join(tables[table_name]["column_names"])
+            return _error(
+                query,
+                "UndefinedColumn",
+                f"column {column.qualifier}.{column.name} does not exist. "
+                f"Columns of {table_name}: {available}",
+            )
+    return None
@@ -0,0 +1,272 @@
+import asyncio
+import hashlib
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.database import default_embeddings, get_db_connection, system_id
+from app.core.logging import logger
+from app.services.embbedings import Collection, collection_catalog
+
+SQL_CACHE_COLLECTION = "sql_cache"
+
+# Quoted strings, dates and numbers, in that order so a date is not split into numbers.
+_LITERAL = re.compile(
+    r"'[^']*'|\"[^\"]*\"|\b\d{4}-\d{2}-\d{2}\b|\b\d+(?:[.,]\d+)?\b", re.IGNORECASE
+)
+
+
+def question_literals(question: str) -> str:
+    """The literal values of a question, in order, e.g. ``"10|2024-01-01|'berlin'"``.
+
+    Questions that differ only in a literal ("top 5" and "top 10 customers") embed almost
+    identically, so cached SQL is only reused when the literals match exactly.
+    """
+    return "|".join(match.group().lower() for match in _LITERAL.finditer(question))
+
+
+class SchemaFingerprint:
+    """Hash of the database schema, refreshed at most once per TTL.
+
+    Cached SQL is only reused when it was generated against the same fingerprint, so any DDL
+    change invalidates every cached query without having to track individual tables.
+    """
+
+    def __init__(self, loader: Callable[[], Awaitable[str]], ttl_seconds: int) -> None:
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self._value: Optional[str] = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> str:
+        if self._value is None or time.monotonic() - self._loaded_at > self.ttl_seconds:
+            async with self._lock:
+                if self._value is None or time.monotonic() - self._loaded_at > self.ttl_seconds:
+                    schema = await self._loader()
+                    self._value = hashlib.sha256(str(schema).encode()).hexdigest()
+                    self._loaded_at = time.monotonic()
+        return self._value
+
+
+class SemanticSQLCache(ABC):
+    """Reuses SQL generated for earlier questions that mean the same thing.
+
+    A question is embedded and compared with previously answered questions that have the same
+    literals (numbers, dates, quoted strings). If the closest one is above the similarity
+    threshold and was answered against the current schema fingerprint, its SQL is returned and
+    the LLM call is skipped. Subclasses provide the vector storage.
+    """
+
+    def __init__(self, fingerprint: SchemaFingerprint, threshold: float) -> None:
+        self.fingerprint = fingerprint
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        self._generation_ms: Optional[float] = None
+        self._pending: set[asyncio.Task] = set()
+
+    async def lookup(self, question: str) -> dict[str, Any]:
+        started = time.perf_counter()
+        result: dict[str, Any] = {"status": "miss", "question": question}
+        try:
+            embedding, schema_fingerprint = await asyncio.gather(
+                default_embeddings.aembed_query(question), self.fingerprint.get()
+            )
+            match = await self._nearest(embedding, schema_fingerprint, question_literals(question))
+        except Exception as e:
+            logger.warning(f"SQL cache lookup failed, generating SQL instead: {e}")
+            match = None
+
+        result["lookup_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        if match is not None and match["similarity"] >= self.threshold:
+            self.hits += 1
+            result.update(
+                status="hit",
+                sql=match["sql"],
+                similarity=round(match["similarity"], 4),
+                matched_question=match["question"],
+                latency_saved_ms=(
+                    round(max(self._generation_ms - result["lookup_ms"], 0.0), 2)
+                    if self._generation_ms is not None
+                    else None
+                ),
+            )
+        else:
+            self.misses += 1
+            if match is not None:
+                result["similarity"] = round(match["similarity"], 4)
+
+        logger.info(f"SQL cache {result['status']} ({self.hits} hits, {self.misses} misses)")
+        return result
+
+    def record_generation(self, elapsed_ms: float) -> None:
+        """Track LLM generation latency, used to estimate what a cache hit saves."""
+        if self._generation_ms is None:
+            self._generation_ms = elapsed_ms
+        else:
+            self._generation_ms = 0.8 * self._generation_ms + 0.2 * elapsed_ms
+
+    def store_in_background(self, question: str, sql: str) -> None:
+        task = asyncio.create_task(self.store(question, sql))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def store(self, question: str, sql: str) -> None:
+        try:
+            embedding, schema_fingerprint = await asyncio.gather(
+                default_embeddings.aembed_query(question), self.fingerprint.get()
+            )
+            await self._add(question, sql, embedding, schema_fingerprint)
+        except Exception as e:
+            logger.warning(f"Could not store SQL in the semantic cache: {e}")
+
+    @abstractmethod
+    async def _nearest(
+        self, embedding: list[float], schema_fingerprint: str, literals: str
+    ) -> Optional[dict[str, Any]]:
+        """The most similar cached question with this fingerprint and these literals."""
+
+    @abstractmethod
+    async def _add(
+        self, question: str, sql: str, embedding: list[float], schema_fingerprint: str
+    ) -> None:
+        """Store a question and its SQL."""
+
+
+class InMemorySQLCache(SemanticSQLCache):
+    """Process-local cache for local runs, bounded to ``max_entries`` (oldest evicted first)."""
+
+    def __init__(self, fingerprint: SchemaFingerprint, threshold: float, max_entries: int) -> None:
+        super().__init__(fingerprint, threshold)
+        self.max_entries = max_entries
+        self._vectors: list[np.ndarray] = []
+        self._entries: list[dict[str, str]] = []
+
+    async def _nearest(
+        self, embedding: list[float], schema_fingerprint: str, literals: str
+    ) -> Optional[dict[str, Any]]:
+        candidates = [
+            i
+            for i, e in enumerate(self._entries)
+            if e["schema_fingerprint"] == schema_fingerprint and e["literals"] == literals
+        ]
+        if not candidates:
+            return None
+        query = np.asarray(embedding, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        similarities = np.stack([self._vectors[i] for i in candidates]) @ query
+        best = int(np.argmax(similarities))
+        return {**self._entries[candidates[best]], "similarity": float(similarities[best])}
+
+    async def _add(
+        self, question: str, sql: str, embedding: list[float], schema_fingerprint: str
+    ) -> None:
+        vector = np.asarray(embedding, dtype=np.float32)
+        vector /= np.linalg.norm(vector) or 1.0
+        self._vectors.append(vector)
+        self._entries.append(
+            {
+                "question": question,
+                "sql": sql,
+                "schema_fingerprint": schema_fingerprint,
+                "literals": question_literals(question),
+            }
+        )
+        if len(self._entries) > self.max_entries:
+            del self._vectors[0]
+            del self._entries[0]
+
+
+class PGVectorSQLCache(SemanticSQLCache):
+    """Cache shared by all workers, stored in the ``sql_cache`` system collection.
+
+    The fingerprint and literals are filtered in the vector query itself. After each insert the
+    collection is trimmed to the ``max_entries`` most recent questions.
+    """
+
+    def __init__(self, fingerprint: SchemaFingerprint, threshold: float, max_entries: int) -> None:
+        super().__init__(fingerprint, threshold)
+        self.max_entries = max_entries
+
+    async def _collection(self) -> Optional[Collection]:
+        details = await collection_catalog.resolve(SQL_CACHE_COLLECTION, system_id)
+        if not details:
+            logger.warning(f"System collection '{SQL_CACHE_COLLECTION}' not found")
+            return None
+        return Collection(
+            collection_id=details["uuid"], user_id=system_id, table_id=details["table_id"]
+        )
+
+    async def _nearest(
+        self, embedding: list[float], schema_fingerprint: str, literals: str
+    ) -> Optional[dict[str, Any]]:
+        collection = await self._collection()
+        if collection is None:
+            return None
+        results = await collection.search_by_vector(
+            embedding,
+            limit=1,
+            metadata={"schema_fingerprint": schema_fingerprint, "literals": literals},
+        )
+        if not results:
+            return None
+        return {
+            "question": results[0]["page_content"],
+            "sql": results[0]["metadata"]["sql"],
+            "similarity": 1.0 - results[0]["score"],
+        }
+
+    async def _add(
+        self, question: str, sql: str, embedding: list[float], schema_fingerprint: str
+    ) -> None:
+        collection = await self._collection()
+        if collection is None:
+            return
+        await collection.upsert_embeddings(
+            texts=[question],
+            embeddings=[embedding],
+            metadatas=[
+                {
+                    "sql": sql,
+                    "schema_fingerprint": schema_fingerprint,
+                    "literals": question_literals(question),
+                    "created_at": time.time(),
+                }
+            ],
+        )
+        await self._trim(collection)
+
+    async def _trim(self, collection: Collection) -> None:
+        async with get_db_connection() as conn:
+            await conn.execute(
+                """
+                DELETE FROM langchain_pg_embedding
+                 WHERE id IN (
+                       SELECT id
+                         FROM langchain_pg_embedding
+                        WHERE collection_id = $1
+                        ORDER BY (cmetadata->>'created_at')::float DESC NULLS LAST
+                       OFFSET $2
+                 )
+                """,
+                collection.collection_id,
+                self.max_entries,
+            )
+
+
+def create_sql_cache(schema_loader: Callable[[], Awaitable[str]]) -> Optional[SemanticSQLCache]:
+    if not settings.SQL_CACHE_ENABLED:
+        return None
+    fingerprint = SchemaFingerprint(schema_loader, settings.SQL_CACHE_SCHEMA_TTL_SECONDS)
+    if settings.SQL_CACHE_BACKEND == "memory":
+        return InMemorySQLCache(
+            fingerprint, settings.SQL_CACHE_SIMILARITY_THRESHOLD, settings.SQL_CACHE_MAX_ENTRIES
+        )
+    return PGVectorSQLCache(
+        fingerprint, settings.SQL_CACHE_SIMILARITY_THRESHOLD, settings.SQL_CACHE_MAX_ENTRIES
+    )
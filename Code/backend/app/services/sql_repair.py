@@ -0,0 +1,185 @@
+import re
+from typing import Any, Optional
+
+from app.utils.sql_parser import analyze_sql, tokenize
+
+_UNDEFINED_COLUMN = re.compile(
+    r'column (?:"(?P<quoted>[^"]+)"|(?P<qualifier>[\w$]+)\.(?P<name>[\w$]+)|(?P<plain>[\w$]+))'
+    r" does not exist"
+)
+_UNDEFINED_RELATION = re.compile(r'relation "(?:[\w$]+\.)?(?P<name>[^"]+)" does not exist')
+_HINT_COLUMN = re.compile(
+    r'Perhaps you meant to reference the column "(?:[^".]+\.)?(?P<name>[^"]+)"'
+)
+_PLAIN_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_$]*$")
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance between two strings."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+            )
+        previous = current
+    return previous[-1]
+
+
+def parse_identifier_error(error: str) -> Optional[dict[str, Optional[str]]]:
+    """Extract the unknown identifier from a Postgres (or local validation) error message."""
+    match = _UNDEFINED_COLUMN.search(error)
+    if match:
+        hint = _HINT_COLUMN.search(error)
+        return {
+            "kind": "column",
+            "name": match.group("quoted") or match.group("name") or match.group("plain"),
+            "qualifier": match.group("qualifier"),
+            "hint": hint.group("name") if hint else None,
+        }
+    match = _UNDEFINED_RELATION.search(error)
+    if match:
+        return {"kind": "relation", "name": match.group("name"), "qualifier": None, "hint": None}
+    return None
+
+
+def _fk_aliases(table: dict[str, Any]) -> dict[str, str]:
+    """Map referenced table names (and their singular form) to the local FK column.
+
+    Lets ``customer`` or ``customers`` on ``orders`` resolve to ``orders.customer_id``.
+    """
+    aliases = {}
+    for fk in table.get("foreign_keys", []):
+        if len(fk["constrained_columns"]) != 1:
+            continue
+        column = fk["constrained_columns"][0]
+        referred = fk["referred_table"].lower()
+        aliases[referred] = column
+        aliases[referred.rstrip("s")] = column
+    return aliases
+
+
+def _best_match(name: str, candidates: list[str]) -> Optional[str]:
+    """The unique closest candidate within a small edit distance, if there is one."""
+    lowered = name.lower()
+    scored = sorted((edit_distance(lowered, c.lower()), c) for c in set(candidates))
+    if not scored:
+        return None
+    best_distance, best = scored[0]
+    if best_distance > max(1, len(name) // 3):
+        return None
+    if len(scored) > 1 and scored[1][0] == best_distance:
+        return None
+    return best
+
+
+def _quote(name: str) -> str:
+    return name if _PLAIN_IDENTIFIER.match(name) else '"' + name.replace('"', '""') + '"'
+
+
+def _rewrite(
+    query: str,
+    old: str,
+    new: str,
+    qualifier: Optional[str] = None,
+    positions: Optional[set[int]] = None,
+) -> str:
+    """Replace identifier tokens equal to ``old``.
+
+    ``qualifier`` limits this to ``qualifier.old`` and ``positions`` to tokens at the given
+    offsets (the table names of FROM and JOIN).
+    """
+    tokens = tokenize(query)
+    edits = []
+    for i, token in enumerate(tokens):
+        if token.identifier != old:
+            continue
+        if positions is not None and token.start not in positions:
+            continue
+        if i + 1 < len(tokens) and tokens[i + 1].value == "(":
+            continue
+        if qualifier is not None and not (
+            i >= 2 and tokens[i - 1].value == "." and tokens[i - 2].identifier == qualifier
+        ):
+            continue
+        edits.append(token)
+    for token in reversed(edits):
+        query = query[: token.start] + _quote(new) + query[token.start + len(token.value) :]
+    return query
+
+
+def repair_sql(
+    query: str, error: str, tables: dict[str, dict[str, Any]]
+) -> Optional[dict[str, Any]]:
+    """Fix an unknown table or column name without asking the LLM again.
+
+    The bad identifier is taken from the error message and matched against the schema catalog:
+    first Postgres' own hint, then foreign key columns named after the table they reference,
+    then the closest name by edit distance. Nothing is returned unless exactly one candidate
+    fits, so an ambiguous error is left to the LLM retry.
+    """
+    problem = parse_identifier_error(error)
+    if problem is None:
+        return None
+
+    structure = analyze_sql(query)
+    name = problem["name"]
+    replacement = None
+    qualifier = None
+    positions = None
+
+    if problem["kind"] == "relation":
+        replacement = _best_match(name, list(tables))
+        # Only the table name itself: an alias or a column may share the misspelled name.
+        refs = [ref for ref in structure.tables if ref.name == name]
+        positions = {ref.start for ref in refs}
+        if any(ref.alias is None for ref in refs) and name not in structure.aliases:
+            # Without an alias the table name also qualifies its columns (``ordrs.id``).
+            tokens = tokenize(query)
+            positions.update(
+                token.start
+                for token, following in zip(tokens, tokens[1:])
+                if token.identifier == name and following.value == "."
+            )
+    else:
+        sources = {}
+        for ref in structure.tables:
+            if ref.name in tables:
+                sources[ref.name] = ref.name
+                if ref.alias:
+                    sources[ref.alias] = ref.name
+        if problem["qualifier"]:
+            qualifier = problem["qualifier"].lower()
+            scope = [sources[qualifier]] if qualifier in sources else []
+        else:
+            scope = sorted(set(sources.values()))
+
+        columns = [c for table_name in scope for c in tables[table_name]["column_names"]]
+        fk_aliases = {}
+        for table_name in scope:
+            fk_aliases.update(_fk_aliases(tables[table_name]))
+
+        if problem["hint"] and problem["hint"] in columns:
+            replacement = problem["hint"]
+        elif name.lower() in fk_aliases:
+            replacement = fk_aliases[name.lower()]
+        else:
+            replacement = _best_match(name, columns)
+
+    if replacement is None or replacement == name:
+        return None
+    if problem["kind"] == "column" and qualifier is None and columns.count(replacement) > 1:
+        return None  # an unqualified name found in several tables would just be ambiguous
+    # Postgres reports identifiers after case folding, which is what Token.identifier gives.
+    repaired = _rewrite(query, name, replacement, qualifier, positions)
+    if repaired == query:
+        return None
+    return {
+        "sql": repaired,
+        "kind": problem["kind"],
+        "original": name,
+        "replacement": replacement,
+    }
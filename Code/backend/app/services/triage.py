@@ -0,0 +1,158 @@
+import asyncio
+import re
+from typing import Any, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.database import default_embeddings
+from app.core.logging import logger
+
+FOLLOW_UP = "handle_follow_up"
+MODIFICATION = "handle_modification_intent"
+MAIN_LOGIC = "handle_main_logic"
+
+# Decisions the classifier is allowed to take on its own. Everything else goes to the LLM.
+FAST_PATH_DECISIONS = {FOLLOW_UP, MODIFICATION}
+
+_GREETING = re.compile(
+    r"^(hi|hello|hey|hiya|yo|howdy|greetings|good (morning|afternoon|evening)|"
+    r"thanks|thank you|thx|cheers|bye|goodbye|see you)"
+    r"( there| simba| you| so much| a lot)?[\s!.?,:)]*$",
+    re.IGNORECASE,
+)
+# A complete write statement at the start of the message: verb, target and the clause that makes
+# it SQL. Loose phrasing ("drop-off rate", "delete rate", "insert into ... last week?") is left to
+# the LLM, since questions about write activity are legitimate read-only queries.
+_SQL_WRITE = re.compile(
+    r"^(please\s+|can you\s+|could you\s+)?("
+    r"delete\s+from\s+\w+(\s+where\b|\s*;|\s*$)"
+    r"|insert\s+into\s+\w+\s*(\(|values\b|select\b)"
+    r"|update\s+\w+\s+set\s+\w+\s*="
+    r"|drop\s+(table|database|schema|view|index)\s+(if\s+exists\s+)?\w+"
+    r"|truncate\s+table\s+\w+"
+    r"|alter\s+table\s+\w+\s+(add|drop|alter|rename)\b"
+    r"|create\s+(table\s+\w+\s*\(|(unique\s+)?index\s+\w+\s+on\s+\w+)"
+    r"|grant\s+\w+(\s*,\s*\w+)*\s+on\s+(table\s+)?\w+\s+to\s+\w+"
+    r")",
+    re.IGNORECASE,
+)
+
+LABELLED_EXAMPLES = {
+    FOLLOW_UP: [
+        "hi",
+        "hello there",
+        "good morning",
+        "how are you doing today?",
+        "who are you?",
+        "tell me a joke",
+        "what's the weather like today?",
+        "thanks for the help",
+        "write me a poem about the sea",
+        "what is the capital of France?",
+    ],
+    MODIFICATION: [
+        "delete all customers",
+        "remove the orders from last year",
+        "insert a new product called widget",
+        "add a new customer named John Smith",
+        "update the price of product 5 to 20 dollars",
+        "change the email of user 42",
+        "drop the users table",
+        "create a new table for invoices",
+        "rename the column name to full_name",
+        "truncate the sales table",
+    ],
+    MAIN_LOGIC: [
+        "how many customers do we have?",
+        "show me the top 10 products by revenue",
+        "list all orders placed last month",
+        "what is the average order value per customer?",
+        "which employees joined in 2023?",
+        "total sales by region",
+        "show the customers who have not placed an order",
+        "how many users signed up this week?",
+        "what were the most popular categories last quarter?",
+        "compare revenue between 2022 and 2023",
+    ],
+}
+
+
+class PreTriageClassifier:
+    """Deterministic triage that runs before the triage LLM call.
+
+    Greetings and complete SQL write statements are recognised with rules. Optionally, other
+    messages are compared with a handful of labelled examples by embedding similarity, at the cost
+    of an embedding call per message. Only confident ``handle_follow_up`` and
+    ``handle_modification_intent`` decisions are returned, anything else has ``decision`` set to
+    None and falls through to the LLM.
+    """
+
+    def __init__(
+        self,
+        min_confidence: float = settings.PRE_TRIAGE_MIN_CONFIDENCE,
+        use_embeddings: bool = settings.PRE_TRIAGE_USE_EMBEDDINGS,
+        neighbours: int = 3,
+    ) -> None:
+        self.min_confidence = min_confidence
+        self.use_embeddings = use_embeddings
+        self.neighbours = neighbours
+        self._labels: list[str] = []
+        self._vectors: Optional[np.ndarray] = None
+        self._lock = asyncio.Lock()
+
+    async def classify(self, message: str) -> dict[str, Any]:
+        text = message.strip()
+        result = self._classify_by_rules(text)
+        if result is None and self.use_embeddings and text:
+            try:
+                result = await self._classify_by_examples(text)
+            except Exception as e:
+                logger.warning(f"Pre-triage embedding lookup failed: {e}")
+
+        if result is None:
+            result = {"decision": None, "confidence": 0.0, "method": None}
+        elif (
+            result["decision"] not in FAST_PATH_DECISIONS
+            or result["confidence"] < self.min_confidence
+        ):
+            result = {**result, "suggested": result["decision"], "decision": None}
+        return result
+
+    @staticmethod
+    def _classify_by_rules(text: str) -> Optional[dict[str, Any]]:
+        if _GREETING.match(text):
+            return {"decision": FOLLOW_UP, "confidence": 0.99, "method": "rules"}
+        if _SQL_WRITE.match(text):
+            return {"decision": MODIFICATION, "confidence": 0.98, "method": "rules"}
+        return None
+
+    async def _classify_by_examples(self, text: str) -> dict[str, Any]:
+        vectors = await self._example_vectors()
+        query = np.asarray(await default_embeddings.aembed_query(text), dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        similarities = vectors @ query
+        nearest = np.argsort(similarities)[::-1][: self.neighbours]
+        labels = {self._labels[i] for i in nearest}
+        best = float(similarities[nearest[0]])
+        # Only trust the neighbours when they agree with each other.
+        confidence = best if len(labels) == 1 else 0.0
+        return {
+            "decision": self._labels[nearest[0]],
+            "confidence": round(confidence, 4),
+            "method": "embeddings",
+        }
+
+    async def _example_vectors(self) -> np.ndarray:
+        if self._vectors is None:
+            async with self._lock:
+                if self._vectors is None:
+                    labels = [label for label, texts in LABELLED_EXAMPLES.items() for _ in texts]
+                    texts = [text for examples in LABELLED_EXAMPLES.values() for text in examples]
+                    vectors = np.asarray(
+                        await default_embeddings.aembed_documents(texts), dtype=np.float32
+                    )
+                    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+                    self._labels = labels
+                    self._vectors = vectors
+        return self._vectors
@@ -0,0 +1,316 @@
+import asyncio
+import importlib.abc
+import importlib.util
+import itertools
+import sys
+import time
+import types
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable
+
+import anyio
+import httpx
+from fastmcp import Client
+from langchain_core.documents.base import Blob
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.tools import BaseTool
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from langchain_mcp_adapters.prompts import load_mcp_prompt
+from langchain_mcp_adapters.resources import load_mcp_resources
+from langchain_mcp_adapters.tools import load_mcp_tools
+
+from app.core.config import settings
+from app.core.logging import logger
+from mcp import ClientSession
+
+MCP_SERVER_DIR = Path(__file__).resolve().parent.parent.parent / "mcp"
+# Package name the server modules are imported under when the server runs in-process.
+MCP_SERVER_PACKAGE = "theanalyst_mcp"
+
+# Failures of the session itself, after which it is reopened and the request retried once.
+# Errors returned by the server (``McpError``, failing tools) leave the session untouched.
+TRANSPORT_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+    httpx.TransportError,
+)
+
+
+class _PooledSession:
+    """A single long-lived MCP session.
+
+    The session is entered and exited by its own task because the transport's anyio cancel
+    scopes must be closed by the task that opened them, while requests arrive from many tasks.
+    """
+
+    def __init__(self, client: MultiServerMCPClient, server_name: str) -> None:
+        self._client = client
+        self._server_name = server_name
+        self._task: asyncio.Task | None = None
+        self._ready: asyncio.Event | None = None
+        self._stop: asyncio.Event | None = None
+        self._error: BaseException | None = None
+        self.session: ClientSession | None = None
+        self.last_checked = 0.0
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def open(self, timeout: float) -> ClientSession:
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._error = None
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            await self.close(timeout)
+            raise
+        if self.session is None:
+            raise ConnectionError(f"Could not open MCP session: {self._error}")
+        self.last_checked = time.monotonic()
+        return self.session
+
+    async def ping(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout)
+        except Exception as e:
+            logger.warning(f"MCP session health check failed: {e}")
+            return False
+        self.last_checked = time.monotonic()
+        return True
+
+    async def close(self, timeout: float) -> None:
+        if self._task is None:
+            return
+        self._stop.set()
+        try:
+            await asyncio.wait_for(self._task, timeout)
+        except Exception:
+            self._task.cancel()
+        self._task = None
+        self.session = None
+
+    async def _run(self) -> None:
+        try:
+            async with self._client.session(self._server_name) as session:
+                self.session = session
+                self._ready.set()
+                await self._stop.wait()
+        except Exception as e:
+            self._error = e
+            logger.warning(f"MCP session to '{self._server_name}' closed with error: {e}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+
+class MCPSessionPool:
+    """Round-robin pool of long-lived MCP sessions to one server.
+
+    Sessions are opened lazily, pinged when they have been idle for longer than the health check
+    interval and transparently reopened when a ping fails or a call hits a transport error.
+    """
+
+    def __init__(
+        self,
+        client: MultiServerMCPClient,
+        server_name: str,
+        size: int,
+        health_check_interval: float,
+        connect_timeout: float,
+    ) -> None:
+        self.server_name = server_name
+        self.health_check_interval = health_check_interval
+        self.connect_timeout = connect_timeout
+        self._slots = [_PooledSession(client, server_name) for _ in range(max(size, 1))]
+        self._locks = [asyncio.Lock() for _ in self._slots]
+        self._counter = itertools.count()
+        self.reconnects = 0
+
+    async def acquire(self) -> ClientSession:
+        index = next(self._counter) % len(self._slots)
+        slot = self._slots[index]
+        async with self._locks[index]:
+            if not slot.alive:
+                if slot.last_checked:
+                    self.reconnects += 1
+                await slot.open(self.connect_timeout)
+            elif time.monotonic() - slot.last_checked > self.health_check_interval:
+                if not await slot.ping(self.connect_timeout):
+                    self.reconnects += 1
+                    await slot.close(self.connect_timeout)
+                    await slot.open(self.connect_timeout)
+            return slot.session
+
+    async def call(self, method: str, *args, **kwargs) -> Any:
+        session = await self.acquire()
+        try:
+            return await getattr(session, method)(*args, **kwargs)
+        except TRANSPORT_ERRORS as e:
+            logger.warning(f"MCP '{method}' failed on a pooled session ({e!r}), reconnecting")
+            await self._discard(session)
+            session = await self.acquire()
+            return await getattr(session, method)(*args, **kwargs)
+
+    async def close(self) -> None:
+        for slot, lock in zip(self._slots, self._locks, strict=True):
+            async with lock:
+                await slot.close(self.connect_timeout)
+
+    async def _discard(self, session: ClientSession) -> None:
+        for slot, lock in zip(self._slots, self._locks, strict=True):
+            async with lock:
+                if slot.session is session:
+                    await slot.close(self.connect_timeout)
+                    return
+
+
+class PooledSession:
+    """Stands in for a ``ClientSession`` and routes every request through the pool."""
+
+    def __init__(self, pool: MCPSessionPool) -> None:
+        self._pool = pool
+
+    def __getattr__(self, name: str):
+        async def method(*args, **kwargs):
+            return await self._pool.call(name, *args, **kwargs)
+
+        return method
+
+
+class PooledMCPClient:
+    """Drop-in replacement for ``MultiServerMCPClient`` backed by persistent session pools.
+
+    ``MultiServerMCPClient`` negotiates a new MCP session for every tool call, prompt and
+    resource fetch. This client keeps ``MCP_SESSION_POOL_SIZE`` sessions per server open for the
+    lifetime of the worker and shares them between all graph runs.
+    """
+
+    def __init__(
+        self,
+        connections: dict[str, dict[str, Any]],
+        *,
+        pool_size: int = settings.MCP_SESSION_POOL_SIZE,
+        health_check_interval: float = settings.MCP_SESSION_HEALTH_CHECK_INTERVAL_SECONDS,
+        connect_timeout: float = settings.MCP_SESSION_CONNECT_TIMEOUT_SECONDS,
+        client: Any = None,
+    ) -> None:
+        self.connections = connections
+        # Anything with a ``session(server_name)`` context manager that opens a new session.
+        self._client = client or MultiServerMCPClient(connections)
+        self._pools = {
+            name: MCPSessionPool(
+                self._client, name, pool_size, health_check_interval, connect_timeout
+            )
+            for name in connections
+        }
+
+    @asynccontextmanager
+    async def session(self, server_name: str, *, auto_initialize: bool = True) -> AsyncIterator:
+        yield PooledSession(self._pools[server_name])
+
+    async def get_tools(self, *, server_name: str | None = None) -> list[BaseTool]:
+        server_names = [server_name] if server_name else list(self._pools)
+        tools: list[BaseTool] = []
+        for name in server_names:
+            tools.extend(await load_mcp_tools(PooledSession(self._pools[name])))
+        return tools
+
+    async def get_prompt(
+        self, server_name: str, prompt_name: str, *, arguments: dict[str, Any] | None = None
+    ) -> list[HumanMessage | AIMessage]:
+        return await load_mcp_prompt(
+            PooledSession(self._pools[server_name]), prompt_name, arguments=arguments
+        )
+
+    async def get_resources(
+        self, server_name: str, *, uris: str | list[str] | None = None
+    ) -> list[Blob]:
+        return await load_mcp_resources(PooledSession(self._pools[server_name]), uris=uris)
+
+    async def aclose(self) -> None:
+        for pool in self._pools.values():
+            await pool.close()
+
+
+class _SiblingImporter(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """Resolves the server modules' bare sibling imports (``from tools import MCPTools``) to
+    the same modules loaded under ``MCP_SERVER_PACKAGE``, so each module exists only once."""
+
+    def find_spec(self, name, path=None, target=None):
+        if "." not in name and (MCP_SERVER_DIR / f"{name}.py").is_file():
+            return importlib.util.spec_from_loader(name, self)
+        return None
+
+    def create_module(self, spec):
+        return importlib.import_module(f"{MCP_SERVER_PACKAGE}.{spec.name}")
+
+    def exec_module(self, module) -> None:
+        pass
+
+
+def load_mcp_server():
+    """Import the FastMCP server defined in ``mcp/server.py`` into this process.
+
+    The server modules are loaded as ``MCP_SERVER_PACKAGE.<module>``. Their bare sibling imports
+    only resolve while the server is being imported, so generic names such as ``tools`` or
+    ``resources`` never end up on ``sys.path`` or in ``sys.modules``.
+    """
+    if MCP_SERVER_PACKAGE not in sys.modules:
+        package = types.ModuleType(MCP_SERVER_PACKAGE)
+        package.__path__ = [str(MCP_SERVER_DIR)]
+        sys.modules[MCP_SERVER_PACKAGE] = package
+
+    importer = _SiblingImporter()
+    sys.meta_path.insert(0, importer)
+    try:
+        server = importlib.import_module(f"{MCP_SERVER_PACKAGE}.server")
+    finally:
+        sys.meta_path.remove(importer)
+        for path in MCP_SERVER_DIR.glob("*.py"):
+            module = sys.modules.get(path.stem)
+            if module is not None and module.__name__.startswith(f"{MCP_SERVER_PACKAGE}."):
+                del sys.modules[path.stem]
+    return server.mcp
+
+
+class _InMemoryConnector:
+    """Opens MCP sessions to a FastMCP server object over FastMCP's in-memory transport."""
+
+    def __init__(self, load_server: Callable[[], Any]) -> None:
+        self._load_server = load_server
+
+    @asynccontextmanager
+    async def session(self, server_name: str) -> AsyncIterator[ClientSession]:
+        async with Client(self._load_server()) as client:
+            yield client.session
+
+
+class InProcessMCPClient(PooledMCPClient):
+    """``MultiServerMCPClient`` look-alike for a FastMCP server running in this process.
+
+    Used when ``MCP_SERVER_TRANSPORT`` is ``in_process``. Requests go through a regular MCP
+    session over FastMCP's in-memory transport, so arguments are validated and results
+    serialized exactly as over HTTP, without a socket or HTTP request per call.
+    """
+
+    def __init__(self, server_name: str, server=None) -> None:
+        self.server_name = server_name
+        self._server = server
+        super().__init__(
+            {server_name: {"transport": "in_process"}},
+            pool_size=1,
+            client=_InMemoryConnector(lambda: self.server),
+        )
+
+    @property
+    def server(self):
+        if self._server is None:
+            self._server = load_mcp_server()
+            logger.info("MCP server mounted in-process")
+        return self._server
@@ -0,0 +1,113 @@
+import json
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+QUANTILES = [0.0, 0.25, 0.5, 0.75, 1.0]
+
+
+def _scalar(value: Any) -> Any:
+    """Make a NumPy/pandas scalar JSON and YAML friendly."""
+    if value is None or (not isinstance(value, (str, bool)) and pd.isna(value)):
+        return None
+    if isinstance(value, (pd.Timestamp, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, (np.integer, int)) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (np.floating, float)):
+        return float(f"{float(value):.6g}")
+    if isinstance(value, np.bool_):
+        return bool(value)
+    return value if isinstance(value, (str, bool)) else str(value)
+
+
+def _coerce_types(df: pd.DataFrame) -> pd.DataFrame:
+    """Recover numeric and datetime columns that arrived as strings through JSON."""
+    for column in df.select_dtypes(include="object").columns:
+        # JSON columns hold dicts and lists, which cannot be counted or compared.
+        values = df[column].map(
+            lambda v: json.dumps(v, default=str) if isinstance(v, (dict, list)) else v
+        )
+        df[column] = values
+        present = values.notna()
+        if not present.any():
+            continue
+        numeric = pd.to_numeric(values, errors="coerce")
+        if numeric[present].notna().all():
+            df[column] = numeric
+            continue
+        dates = pd.to_datetime(values, errors="coerce", format="ISO8601", utc=True)
+        if dates[present].notna().all():
+            df[column] = dates
+    return df
+
+
+def profile_results(
+    rows: list[dict[str, Any]] | dict[str, list[Any]], top_k: int = 5, max_correlations: int = 10
+) -> dict[str, Any]:
+    """Statistical profile of a query result, computed column-wise with pandas.
+
+    Covers dtypes, null counts, min/max/quantiles, mean and standard deviation for numeric
+    columns, ranges for datetimes, the most frequent values of other columns and the strongest
+    pairwise correlations between numeric columns. ``rows`` is a list of row dicts or a mapping
+    of column name to values.
+    """
+    df = _coerce_types(pd.DataFrame(rows))
+    profile: dict[str, Any] = {"row_count": len(df), "column_count": df.shape[1], "columns": {}}
+    if df.empty:
+        return profile
+
+    null_counts = df.isna().sum()
+    unique_counts = df.nunique(dropna=True)
+    columns = profile["columns"]
+    for column in df.columns:
+        columns[column] = {
+            "dtype": str(df[column].dtype),
+            "nulls": int(null_counts[column]),
+            "distinct": int(unique_counts[column]),
+        }
+
+    numeric = df.select_dtypes(include="number", exclude="bool")
+    if not numeric.empty:
+        quantiles = numeric.quantile(QUANTILES)
+        means = numeric.mean()
+        stds = numeric.std()
+        for column in numeric.columns:
+            q = quantiles[column]
+            columns[column].update(
+                min=_scalar(q.loc[0.0]),
+                p25=_scalar(q.loc[0.25]),
+                median=_scalar(q.loc[0.5]),
+                p75=_scalar(q.loc[0.75]),
+                max=_scalar(q.loc[1.0]),
+                mean=_scalar(means[column]),
+                std=_scalar(stds[column]),
+            )
+
+    datetimes = df.select_dtypes(include=["datetime", "datetimetz"])
+    if not datetimes.empty:
+        minimums, maximums = datetimes.min(), datetimes.max()
+        for column in datetimes.columns:
+            columns[column].update(min=_scalar(minimums[column]), max=_scalar(maximums[column]))
+
+    for column in df.columns.difference(numeric.columns).difference(datetimes.columns):
+        counts = df[column].astype(str).where(df[column].notna()).value_counts().head(top_k)
+        columns[column]["top_values"] = {str(k): int(v) for k, v in counts.items()}
+
+    if numeric.shape[1] >= 2 and len(numeric) >= 3:
+        matrix = numeric.corr().to_numpy()
+        upper_rows, upper_cols = np.triu_indices_from(matrix, k=1)
+        strengths = np.abs(matrix[upper_rows, upper_cols])
+        valid = ~np.isnan(strengths)
+        order = np.argsort(-strengths[valid])[:max_correlations]
+        names = numeric.columns
+        profile["correlations"] = [
+            {
+                "columns": [names[i], names[j]],
+                "pearson": _scalar(matrix[i, j]),
+            }
+            for i, j in zip(upper_rows[valid][order], upper_cols[valid][order], strict=True)
+        ]
+
+    return profile
@@ -0,0 +1,245 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Set
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+      (?P<comment>--[^\n]*|/\*.*?\*/)
+    | (?P<string>[eEbBxXnN]?'(?:[^']|'')*'|\$(?P<tag>\w*)\$.*?\$(?P=tag)\$)
+    | (?P<quoted>"(?:[^"]|"")*")
+    | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+    | (?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+    | (?P<space>\s+)
+    | (?P<op>::|<=|>=|<>|!=|\|\||->>|->|\#>>|\#>|@>|<@|&&)
+    | (?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# Words that are never column references. Anything not listed is treated as a possible column,
+# so the list errs on the side of including interval fields and type names.
+KEYWORDS = frozenset(
+    """
+    all and any array as asc asymmetric between both by case cast check collate column constraint
+    create cross current_date current_time current_timestamp current_user default deferrable desc
+    distinct do else end except exists false fetch filter first following for foreign from full
+    grant group having ilike in inner intersect interval into is isnull join last lateral leading
+    left like limit localtime localtimestamp materialized natural not notnull null nulls offset on
+    only or order outer over overlaps partition placing preceding primary range recursive
+    references returning right row rows select session_user similar some symmetric table then ties
+    to trailing true unbounded union unique using values variadic verbose when where window with
+    within without zone time timestamp timestamptz date interval integer int int2 int4 int8 bigint
+    smallint numeric decimal real double precision float float4 float8 boolean bool text varchar
+    char character varying uuid json jsonb bytea serial bigserial money inet cidr year month day
+    hour minute second week quarter dow doy epoch decade century millennium isodow isoyear
+    timezone timezone_hour timezone_minute milliseconds microseconds escape ignore respect
+    current_schema current_catalog user current exclude groups others no grouping sets cube rollup
+    """.split()
+)
+
+
+@dataclass
+class Token:
+    kind: str
+    value: str
+    start: int = 0
+
+    @property
+    def lower(self) -> str:
+        return self.value.lower()
+
+    @property
+    def identifier(self) -> Optional[str]:
+        """Identifier as Postgres sees it: unquoted names fold to lower case."""
+        if self.kind == "word":
+            return self.value.lower()
+        if self.kind == "quoted":
+            return self.value[1:-1].replace('""', '"')
+        return None
+
+
+@dataclass
+class TableRef:
+    name: str
+    schema: Optional[str] = None
+    alias: Optional[str] = None
+    # Offset of the table name in the statement, so it can be rewritten in place.
+    start: Optional[int] = None
+
+
+@dataclass
+class ColumnRef:
+    name: str
+    qualifier: Optional[str] = None
+
+
+@dataclass
+class SqlStructure:
+    """Identifiers referenced by a statement, collected by ``analyze_sql``."""
+
+    statement: Optional[str] = None
+    tables: List[TableRef] = field(default_factory=list)
+    columns: List[ColumnRef] = field(default_factory=list)
+    cte_names: Set[str] = field(default_factory=set)
+    aliases: Set[str] = field(default_factory=set)
+    # Set when rows come from something other than a plain table (subquery, table function).
+    has_derived_tables: bool = False
+
+
+def tokenize(sql: str) -> List[Token]:
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer(sql):
+        kind = match.lastgroup
+        if kind == "tag":
+            kind = "string"
+        if kind in ("comment", "space"):
+            continue
+        tokens.append(Token(kind, match.group(), match.start()))
+    return tokens
+
+
+def _is_name(token: Optional[Token]) -> bool:
+    return token is not None and (
+        token.kind == "quoted" or (token.kind == "word" and token.lower not in KEYWORDS)
+    )
+
+
+def _is_member(token: Optional[Token]) -> bool:
+    return token is not None and (_is_name(token) or token.value == "*")
+
+
+def analyze_sql(sql: str) -> SqlStructure:
+    """Collect the tables, column references, CTEs and aliases of a single SQL statement.
+
+    This is a tokenizer with a few structural rules, not a full parser. It is written to
+    under-report: anything it cannot classify confidently is left out rather than guessed.
+    """
+    tokens = tokenize(sql)
+    structure = SqlStructure(statement=tokens[0].lower if tokens else None)
+    consumed: Set[int] = set()
+    # One entry per open parenthesis: True when it belongs to a function call.
+    parens: List[bool] = []
+
+    def token_at(index: int) -> Optional[Token]:
+        return tokens[index] if 0 <= index < len(tokens) else None
+
+    def parse_table_ref(index: int) -> int:
+        """Parse ``[schema.]name [[AS] alias]`` starting at index, return the next index."""
+        while token_at(index) is not None and token_at(index).lower in ("lateral", "only"):
+            index += 1
+        token = token_at(index)
+        if token is None or token.value == "(" or not _is_name(token):
+            if token is not None and token.value == "(":
+                structure.has_derived_tables = True
+            return index
+
+        parts = [token.identifier]
+        consumed.add(index)
+        index += 1
+        while (
+            token_at(index) is not None
+            and token_at(index).value == "."
+            and _is_name(token_at(index + 1))
+        ):
+            token = token_at(index + 1)
+            parts.append(token.identifier)
+            consumed.update((index, index + 1))
+            index += 2
+
+        if token_at(index) is not None and token_at(index).value == "(":
+            structure.has_derived_tables = True
+            return index
+
+        ref = TableRef(
+            name=parts[-1], schema=parts[-2] if len(parts) > 1 else None, start=token.start
+        )
+        if token_at(index) is not None and token_at(index).lower == "as":
+            index += 1
+        following = token_at(index + 1)
+        if _is_name(token_at(index)) and (following is None or following.value != "."):
+            ref.alias = token_at(index).identifier
+            structure.aliases.add(ref.alias)
+            consumed.add(index)
+            index += 1
+        structure.tables.append(ref)
+        return index
+
+    def cte_body(index: int) -> Optional[int]:
+        """Index of the ``AS`` of ``name [(columns)] AS [[NOT] MATERIALIZED] (``, if there is one."""
+        if token_at(index) is not None and token_at(index).value == "(":
+            depth = 0
+            for index in range(index, len(tokens)):
+                depth += {"(": 1, ")": -1}.get(tokens[index].value, 0)
+                if depth == 0:
+                    break
+            index += 1
+        body = token_at(index + 1)
+        if token_at(index) is None or token_at(index).lower != "as" or body is None:
+            return None
+        return index if body.value == "(" or body.lower in ("materialized", "not") else None
+
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        previous = token_at(i - 1)
+        following = token_at(i + 1)
+
+        if token.value == "(":
+            parens.append(_is_name(previous))
+        elif token.value == ")":
+            if parens:
+                parens.pop()
+        elif (
+            token.kind == "word" and token.lower in ("from", "join") and not (parens and parens[-1])
+        ):
+            # FROM inside a function call, e.g. ``extract(year FROM created_at)``, is skipped.
+            i = parse_table_ref(i + 1)
+            while token.lower == "from" and token_at(i) is not None and token_at(i).value == ",":
+                i = parse_table_ref(i + 1)
+            continue
+        elif i in consumed or not _is_name(token):
+            pass
+        elif (
+            previous is not None
+            and previous.lower in ("with", "recursive", ",", "window")
+            and (body := cte_body(i + 1)) is not None
+        ):
+            # ``WITH name [(columns)] AS (...)`` or ``WINDOW name AS (...)``
+            structure.cte_names.add(token.identifier)
+            for index in range(i + 1, body):
+                if _is_name(tokens[index]):
+                    structure.aliases.add(tokens[index].identifier)
+            i = body
+        elif following is not None and following.value == "(":
+            pass  # function call
+        elif following is not None and following.value == "." and _is_member(token_at(i + 2)):
+            # qualifier.column, or schema.table.column
+            parts = [token.identifier]
+            while (
+                token_at(i + 1) is not None
+                and token_at(i + 1).value == "."
+                and _is_member(token_at(i + 2))
+            ):
+                parts.append(token_at(i + 2).identifier or "*")
+                i += 2
+            if not (token_at(i + 1) is not None and token_at(i + 1).value == "("):
+                structure.columns.append(ColumnRef(name=parts[-1], qualifier=parts[-2]))
+        elif previous is not None and (
+            previous.lower in ("over", "collate") or previous.value in ("::", ".")
+        ):
+            pass  # window name, collation or type name
+        elif previous is not None and previous.lower == "as":
+            structure.aliases.add(token.identifier)
+        elif previous is not None and (
+            _is_name(previous)
+            or previous.kind in ("string", "number")
+            or previous.value == ")"
+            or previous.lower == "end"
+        ):
+            # An alias written without AS, e.g. ``count(*) total``.
+            structure.aliases.add(token.identifier)
+        else:
+            structure.columns.append(ColumnRef(name=token.identifier))
+        i += 1
+
+    return structure
@@ -1,28 +1,188 @@
+import asyncio
 import json
 import re
+import time
+from typing import Any
 
 import yaml
 from langchain_core.messages import BaseMessage, HumanMessage
+from langchain_core.tools import BaseTool
 from langchain_mcp_adapters.client import MultiServerMCPClient
+from starlette.requests import Request
 
 from app.core.app_state import app_state
 from app.core.config import settings
 from app.core.logging import logger
-from app.services.embbedings import Collection, CollectionsManager
+from app.services.embbedings import Collection, collection_catalog
+from app.utils.mcp_client import InProcessMCPClient, PooledMCPClient
+
+# Tag for LLM calls whose tokens are streamed to the client.
+LLM_STREAM_TAG = "llm_stream"
+# Custom event carrying one batch of rows of a streamed query.
+QUERY_BATCH_EVENT = "query_batch"
+
+
+class PromptRegistry:
+    """Process-wide cache of MCP prompt templates.
+
+    Templates are fetched from the MCP server once and then served from memory. When an entry is
+    older than the TTL the cached template is still returned and a background task asks the server
+    for the prompt version; the template is only downloaded again when that version changed.
+    """
+
+    def __init__(self, client, server_name: str, ttl_seconds: int | None = None) -> None:
+        self.client = client
+        self.server_name = server_name
+        self.ttl_seconds = (
+            settings.MCP_PROMPT_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        )
+        self._prompts: dict[str, dict[str, Any]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._refresh_tasks: dict[str, asyncio.Task] = {}
+
+    async def get_formatted_prompt(self, prompt_name: str, **kwargs) -> str:
+        entry = self._prompts.get(prompt_name)
+        if entry is None:
+            entry = await self._load(prompt_name)
+        elif time.monotonic() - entry["loaded_at"] > self.ttl_seconds:
+            self._schedule_refresh(prompt_name)
+        return entry["template"].format(**kwargs)
+
+    async def warm(self, prompt_names: list[str]) -> None:
+        """Load prompts ahead of the first request, e.g. during application startup."""
+        results = await asyncio.gather(
+            *(self._load(name) for name in prompt_names), return_exceptions=True
+        )
+        for name, result in zip(prompt_names, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning(f"Could not preload MCP prompt '{name}': {result}")
+
+    async def refresh(self, prompt_name: str) -> None:
+        """Re-download a prompt only if the server reports a version different from the cache."""
+        entry = self._prompts.get(prompt_name)
+        if entry is None:
+            versions, template = await asyncio.gather(
+                self._fetch_versions(), self._fetch_template(prompt_name)
+            )
+            version = versions.get(prompt_name)
+        else:
+            version = (await self._fetch_versions()).get(prompt_name)
+            if version is not None and version == entry["version"]:
+                entry["loaded_at"] = time.monotonic()
+                return
+            template = await self._fetch_template(prompt_name)
+
+        self._prompts[prompt_name] = {
+            "template": template,
+            "version": version,
+            "loaded_at": time.monotonic(),
+        }
+        logger.info(f"MCP prompt '{prompt_name}' refreshed (version: {version})")
+
+    def invalidate(self, prompt_name: str | None = None) -> None:
+        if prompt_name is None:
+            self._prompts.clear()
+        else:
+            self._prompts.pop(prompt_name, None)
+
+    async def _load(self, prompt_name: str) -> dict[str, Any]:
+        lock = self._locks.setdefault(prompt_name, asyncio.Lock())
+        async with lock:
+            if prompt_name not in self._prompts:
+                await self.refresh(prompt_name)
+        return self._prompts[prompt_name]
+
+    def _schedule_refresh(self, prompt_name: str) -> None:
+        task = self._refresh_tasks.get(prompt_name)
+        if task is not None and not task.done():
+            return
+        task = asyncio.create_task(self._refresh_in_background(prompt_name))
+        self._refresh_tasks[prompt_name] = task
+
+    async def _refresh_in_background(self, prompt_name: str) -> None:
+        try:
+            await self.refresh(prompt_name)
+        except Exception as e:
+            # Keep serving the stale template, the next call past the TTL will try again.
+            logger.warning(f"Background refresh of MCP prompt '{prompt_name}' failed: {e}")
+
+    async def _fetch_versions(self) -> dict[str, str | None]:
+        async with self.client.session(self.server_name) as session:
+            result = await session.list_prompts()
+        return {prompt.name: (prompt.meta or {}).get("version") for prompt in result.prompts}
+
+    async def _fetch_template(self, prompt_name: str) -> str:
+        prompt = await self.client.get_prompt(server_name=self.server_name, prompt_name=prompt_name)
+        data = json.loads(prompt[0].content)
+        return data["template"]
+
+
+class ToolRegistry:
+    """Name-indexed cache of the MCP server's tools.
+
+    Listing tools is a round trip to the MCP server, so it is done once per process (and again
+    on an explicit ``refresh``) instead of in every graph node. ``saved_list_calls`` counts the
+    lookups that were answered from memory.
+    """
+
+    def __init__(self, client) -> None:
+        self.client = client
+        self._tools: dict[str, BaseTool] = {}
+        self._lock = asyncio.Lock()
+        self.loaded_at: float | None = None
+        self.list_calls = 0
+        self.saved_list_calls = 0
+
+    async def refresh(self) -> dict[str, BaseTool]:
+        async with self._lock:
+            await self._load()
+        return self._tools
+
+    async def warm(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"Could not preload MCP tools, they will be loaded on first use: {e}")
+
+    async def get(self, name: str) -> BaseTool | None:
+        if self.loaded_at is None:
+            async with self._lock:
+                if self.loaded_at is None:
+                    await self._load()
+        else:
+            self.saved_list_calls += 1
+        return self._tools.get(name)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "tools": list(self._tools),
+            "list_calls": self.list_calls,
+            "saved_list_calls": self.saved_list_calls,
+        }
+
+    async def _load(self) -> None:
+        tools = await self.client.get_tools()
+        self.list_calls += 1
+        self._tools = {tool.name: tool for tool in tools}
+        self.loaded_at = time.monotonic()
+        logger.info(f"MCP tool registry loaded {len(self._tools)} tools: {list(self._tools)}")
 
 
 class Util:
     @staticmethod
     def get_mcp_client():
-        """Connect to MCP server"""
-        return MultiServerMCPClient(
-            {
-                settings.MCP_SERVER_NAME: {
-                    "transport": settings.MCP_SERVER_TRANSPORT,
-                    "url": f"http://{settings.MCP_SERVER_HOST}:{settings.MCP_SERVER_PORT}/mcp",
-                }
+        """Connect to MCP server, through pooled sessions unless MCP_SESSION_MODE is per_call"""
+        if settings.MCP_SERVER_TRANSPORT == "in_process":
+            return InProcessMCPClient(settings.MCP_SERVER_NAME)
+        connections = {
+            settings.MCP_SERVER_NAME: {
+                "transport": settings.MCP_SERVER_TRANSPORT,
+                "url": f"http://{settings.MCP_SERVER_HOST}:{settings.MCP_SERVER_PORT}/mcp",
             }
-        )
+        }
+        if settings.MCP_SESSION_MODE == "pooled":
+            return PooledMCPClient(connections)
+        return MultiServerMCPClient(connections)
 
     @staticmethod
     async def get_formatted_prompt(client, server_name: str, prompt_name: str, **kwargs) -> str:
@@ -41,12 +201,10 @@ class Util:
 
     @staticmethod
     async def get_root_collection_by_name(name: str, system_id: str) -> Collection:
-        manager = CollectionsManager(user_id=system_id)
-        collections = await manager.list()
-        col = next((c for c in collections if c["name"] == name), None)
+        col = await collection_catalog.resolve(name, system_id)
         if not col:
             logger.error(f"System collection : '{name}' not found")
-        return Collection(collection_id=col["uuid"], user_id=system_id)
+        return Collection(collection_id=col["uuid"], user_id=system_id, table_id=col["table_id"])
 
     @staticmethod
     def clean_page_content_string(text: str) -> str:
@@ -62,10 +220,14 @@ class Util:
         return yaml.dump(data, sort_keys=False, default_flow_style=False, indent=2).strip()
 
     @staticmethod
-    async def stream_generator(input_messages: list, config: dict):
-        """Yields server-sent events for each step of the graph's execution."""
+    async def stream_generator(input_messages: list, config: dict, request: Request | None = None):
+        """Yields server-sent events for each step of the graph's execution.
+
+        Stops, and thereby cancels the remaining graph run (e.g. the summary), once the client
+        has disconnected.
+        """
         messages_as_objects = [HumanMessage(content=msg) for msg in input_messages]
-        nodes_to_monitor = ["Text-to-SQL Agent", "triage", "llm_stream"]
+        nodes_to_monitor = ["Text-to-SQL Agent", "triage", "execute_sql", QUERY_BATCH_EVENT]
         async for event in app_state.graph.astream_events(
             {"messages": messages_as_objects},
             config={
@@ -77,12 +239,34 @@ class Util:
                 },
             },
             version="v2",
+            # Events matching any of the filters are emitted.
             include_names=nodes_to_monitor,
+            include_tags=[LLM_STREAM_TAG],
         ):
+            if request is not None and await request.is_disconnected():
+                logger.info("Client disconnected, cancelling the graph run")
+                break
+
             event_name = event["event"]
 
+            # LLM Stream
+            if event_name == "on_chat_model_stream":
+                chunk = event["data"]["chunk"]
+                serializable_chunk = Util.serialize_langgraph_output(chunk)
+                node = event.get("metadata", {}).get("langgraph_node")
+                yield f"data: {json.dumps({'stage': LLM_STREAM_TAG, 'node': node, 'chunk': serializable_chunk})}\n\n"
+
+            # Tagged LLM calls only contribute their tokens
+            elif event_name.startswith("on_chat_model"):
+                continue
+
+            # Rows of a streamed query, as each batch arrives
+            elif event_name == "on_custom_event":
+                serializable_batch = Util.serialize_langgraph_output(event["data"])
+                yield f"data: {json.dumps({'stage': event['name'], 'result': serializable_batch})}\n\n"
+
             # Node start
-            if event_name.endswith("_start"):
+            elif event_name.endswith("_start"):
                 node_name = event["name"]
                 yield f"data: {json.dumps({'stage': node_name, 'status': 'running'})}\n\n"
 
@@ -91,16 +275,25 @@ class Util:
                 node_name = event["name"]
                 output = event["data"].get("output")
 
-                # Langgraph serialize
-                serializable_result = Util.serialize_langgraph_output(output)
+                if node_name == "execute_sql" and isinstance(output, dict):
+                    # Only the query and its rows, sent before the summary is generated.
+                    # Streamed rows already went out batch by batch.
+                    execution_result = output.get("execution_result") or {}
+                    streamed = execution_result.get("streamed", False)
+                    serializable_result = Util.serialize_langgraph_output(
+                        {
+                            "input": {"query": output.get("generated_sql")},
+                            "output": [] if streamed else output.get("results") or [],
+                            "streamed": streamed,
+                            # Further pages come from GET /chat/results/{next_cursor}.
+                            "next_cursor": execution_result.get("cursor"),
+                        }
+                    )
+                else:
+                    # Langgraph serialize
+                    serializable_result = Util.serialize_langgraph_output(output)
                 yield f"data: {json.dumps({'stage': node_name, 'status': 'completed', 'result': serializable_result})}\n\n"
 
-            # LLM Stream
-            elif event_name == "on_chat_model_stream":
-                chunk = event["data"]["chunk"]
-                serializable_chunk = Util.serialize_langgraph_output(chunk)
-                yield f"data: {json.dumps({'stage': 'llm_stream', 'chunk': serializable_chunk})}\n\n"
-
     @staticmethod
     def serialize_langgraph_output(output):
         """
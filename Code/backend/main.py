@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
@@ -7,7 +8,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 
-from app.agent.graph import builder
+from app.agent.graph import builder, prompt_registry
+from app.agent.graph import client as mcp_client
 from app.api.routes import router
 from app.core.app_state import app_state
 from app.core.auth import zitadel_auth
@@ -17,6 +19,8 @@ from app.core.langfuse import init_langfuse
 from app.core.memory import init_memory
 from app.core.rate_limiter import limiter, rate_limit_exceeded_handler
 from app.services.memory import MemoryTools
+from app.services.result_cursors import result_cursors
+from app.utils.util import ToolRegistry
 
 
 @asynccontextmanager
@@ -25,6 +29,13 @@ async def lifespan(_: FastAPI) -> AsyncGenerator:
     checker.run()
     await zitadel_auth.openid_config.load_config()
     await create_system_collections()
+    await prompt_registry.warm(["Triage System Prompt"])
+    app_state.tool_registry = ToolRegistry(mcp_client)
+    await app_state.tool_registry.warm()
+    # Closes the MCP streams of result cursors nobody came back for.
+    cursor_reaper = asyncio.create_task(
+        result_cursors.run_reaper(settings.QUERY_STREAM_IDLE_TIMEOUT_SECONDS / 2)
+    )
     client, app_state.langfuse_handler = init_langfuse()
 
     async with init_memory() as memory:
@@ -41,6 +52,10 @@ async def lifespan(_: FastAPI) -> AsyncGenerator:
 
         yield
 
+    cursor_reaper.cancel()
+    if hasattr(mcp_client, "aclose"):
+        await mcp_client.aclose()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
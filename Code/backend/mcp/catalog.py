@@ -0,0 +1,195 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.logging import logger
+
+# Every query is limited to the relations of the current schema that can be selected from:
+# tables, partitioned tables, views, materialized views and foreign tables.
+_IN_SCHEMA = "n.nspname = current_schema() AND c.relkind IN ('r', 'p', 'v', 'm', 'f')"
+
+RELATION_KINDS = {
+    "r": "table",
+    "p": "table",
+    "v": "view",
+    "m": "materialized view",
+    "f": "foreign table",
+}
+
+TABLES_QUERY = f"""
+    SELECT c.relname AS table_name,
+           c.relkind::text AS relkind,
+           pg_catalog.obj_description(c.oid, 'pg_class') AS comment
+    FROM pg_catalog.pg_class c
+    JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+    WHERE {_IN_SCHEMA}
+    ORDER BY c.relname
+"""
+
+COLUMNS_QUERY = f"""
+    SELECT c.relname AS table_name,
+           a.attname AS name,
+           pg_catalog.format_type(a.atttypid, a.atttypmod) AS type,
+           NOT a.attnotnull AS nullable,
+           pg_catalog.pg_get_expr(d.adbin, d.adrelid) AS "default",
+           pg_catalog.col_description(c.oid, a.attnum) AS comment
+    FROM pg_catalog.pg_class c
+    JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_catalog.pg_attribute a ON a.attrelid = c.oid
+    LEFT JOIN pg_catalog.pg_attrdef d ON d.adrelid = c.oid AND d.adnum = a.attnum
+    WHERE {_IN_SCHEMA} AND a.attnum > 0 AND NOT a.attisdropped
+    ORDER BY c.relname, a.attnum
+"""
+
+FOREIGN_KEYS_QUERY = f"""
+    SELECT c.relname AS table_name,
+           ARRAY(
+               SELECT a.attname
+               FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+               JOIN pg_catalog.pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+               ORDER BY k.ord
+           ) AS constrained_columns,
+           rc.relname AS referred_table,
+           ARRAY(
+               SELECT a.attname
+               FROM unnest(con.confkey) WITH ORDINALITY AS k(attnum, ord)
+               JOIN pg_catalog.pg_attribute a ON a.attrelid = con.confrelid AND a.attnum = k.attnum
+               ORDER BY k.ord
+           ) AS referred_columns
+    FROM pg_catalog.pg_class c
+    JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_catalog.pg_constraint con ON con.conrelid = c.oid AND con.contype = 'f'
+    JOIN pg_catalog.pg_class rc ON rc.oid = con.confrelid
+    WHERE {_IN_SCHEMA}
+    ORDER BY c.relname, con.conname
+"""
+
+# Primary key indexes are left out, as they are by ``Inspector.get_indexes``.
+INDEXES_QUERY = f"""
+    SELECT c.relname AS table_name,
+           i.relname AS name,
+           ix.indisunique AS "unique",
+           ARRAY(
+               SELECT pg_catalog.pg_get_indexdef(ix.indexrelid, k, true)
+               FROM generate_series(1, ix.indnkeyatts) AS k
+               ORDER BY k
+           ) AS column_names
+    FROM pg_catalog.pg_class c
+    JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+    JOIN pg_catalog.pg_index ix ON ix.indrelid = c.oid AND NOT ix.indisprimary
+    JOIN pg_catalog.pg_class i ON i.oid = ix.indexrelid
+    WHERE {_IN_SCHEMA}
+    ORDER BY c.relname, i.relname
+"""
+
+# Any DDL on the schema rewrites at least one of these catalog rows, which gives it a new xmin.
+DDL_FINGERPRINT_QUERY = """
+    WITH schema_relations AS (
+        SELECT c.oid, c.xmin, c.relkind
+        FROM pg_catalog.pg_class c
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = current_schema() AND c.relkind IN ('r', 'p', 'v', 'm', 'f', 'i', 'I')
+    )
+    SELECT md5(coalesce(string_agg(part, ',' ORDER BY part), '')) FROM (
+        SELECT 'c' || r.oid::text || ':' || r.xmin::text AS part FROM schema_relations r
+        UNION ALL
+        SELECT 'a' || a.attrelid::text || '.' || a.attnum::text || ':' || a.xmin::text
+        FROM pg_catalog.pg_attribute a
+        JOIN schema_relations r ON r.oid = a.attrelid AND r.relkind NOT IN ('i', 'I')
+        WHERE a.attnum > 0
+        UNION ALL
+        SELECT 'f' || con.oid::text || ':' || con.xmin::text
+        FROM pg_catalog.pg_constraint con
+        JOIN schema_relations r ON r.oid = con.conrelid
+        UNION ALL
+        SELECT 'd' || d.objoid::text || '.' || d.objsubid::text || ':' || d.xmin::text
+        FROM pg_catalog.pg_description d
+        JOIN schema_relations r ON r.oid = d.objoid
+        WHERE d.classoid = 'pg_catalog.pg_class'::regclass
+    ) parts
+"""
+
+
+def load_catalog(connection: Connection) -> Dict[str, Any]:
+    """Tables and views of the current schema with their columns, keys, indexes and comments.
+
+    Four catalog queries in total, whatever the number of tables. The result has the same
+    shape as the one ``MCPResources.get_database_catalog`` used to build with the inspector.
+    """
+    tables: Dict[str, Dict[str, Any]] = {}
+    for row in connection.execute(text(TABLES_QUERY)).mappings():
+        tables[row["table_name"]] = {
+            "kind": RELATION_KINDS[row["relkind"]],
+            "comment": row["comment"] or "",
+            "columns": [],
+            "foreign_keys": [],
+            "indexes": [],
+        }
+
+    for row in connection.execute(text(COLUMNS_QUERY)).mappings():
+        tables[row["table_name"]]["columns"].append(
+            {
+                "name": row["name"],
+                "type": row["type"],
+                "nullable": row["nullable"],
+                "default": row["default"],
+                "comment": row["comment"],
+            }
+        )
+
+    for row in connection.execute(text(FOREIGN_KEYS_QUERY)).mappings():
+        tables[row["table_name"]]["foreign_keys"].append(
+            {
+                "constrained_columns": list(row["constrained_columns"]),
+                "referred_table": row["referred_table"],
+                "referred_columns": list(row["referred_columns"]),
+            }
+        )
+
+    for row in connection.execute(text(INDEXES_QUERY)).mappings():
+        tables[row["table_name"]]["indexes"].append(
+            {
+                "name": row["name"],
+                "column_names": list(row["column_names"]),
+                "unique": bool(row["unique"]),
+            }
+        )
+
+    return {"tables": tables}
+
+
+class CatalogCache:
+    """Keeps the loaded catalog until the schema's DDL fingerprint changes.
+
+    Each ``get`` costs one fingerprint query; the four catalog queries only run again after a
+    table, column, constraint, index or comment was created, altered or dropped.
+    """
+
+    def __init__(self) -> None:
+        self._catalog: Optional[Dict[str, Any]] = None
+        self._fingerprint: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def get(self, engine: Engine) -> Dict[str, Any]:
+        with self._lock, engine.connect() as connection:
+            fingerprint = connection.execute(text(DDL_FINGERPRINT_QUERY)).scalar()
+            if self._catalog is None or fingerprint != self._fingerprint:
+                started = time.perf_counter()
+                self._catalog = load_catalog(connection)
+                self._fingerprint = fingerprint
+                logger.info(
+                    f"Loaded catalog of {len(self._catalog['tables'])} tables in "
+                    f"{(time.perf_counter() - started) * 1000:.0f} ms"
+                )
+            return self._catalog
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._catalog = None
+            self._fingerprint = None
+
+
+catalog_cache = CatalogCache()
@@ -0,0 +1,169 @@
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, CursorResult, Engine, RootTransaction
+
+from app.core.config import settings
+from app.core.logging import logger
+
+
+@dataclass
+class QueryStream:
+    """An open server-side cursor and the connection that owns it."""
+
+    query: str
+    connection: Connection
+    transaction: RootTransaction
+    result: CursorResult
+    columns: List[str]
+    batch_size: int
+    max_rows: int
+    rows_sent: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def close(self) -> None:
+        try:
+            self.result.close()
+            self.transaction.rollback()
+        finally:
+            self.connection.close()
+
+
+class QueryStreamStore:
+    """Server-side cursors that are read batch by batch across ``Fetch Query Batch`` calls.
+
+    Rows are fetched from Postgres ``batch_size`` at a time (``yield_per``), so the MCP server
+    never holds more than one batch per stream. A stream is closed once it is exhausted, once
+    ``max_rows`` have been sent, or when nobody fetched from it for ``idle_timeout_seconds``;
+    a background thread checks for idle streams every half timeout, so a client that went away
+    does not leave a connection in an open transaction.
+    Each open stream pins a connection, which is why their number is capped. The engine passed
+    to ``open`` should have a pool of ``max_open`` connections reserved for streams.
+    """
+
+    def __init__(self, idle_timeout_seconds: int, max_open: int) -> None:
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.max_open = max_open
+        self._streams: Dict[str, QueryStream] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+
+    def open(self, engine: Engine, query: str, batch_size: int, max_rows: int) -> dict:
+        self._start_reaper()
+        self.close_idle()
+        with self._lock:
+            if len(self._streams) >= self.max_open:
+                raise RuntimeError(f"Too many open query streams ({self.max_open})")
+
+        connection = engine.connect()
+        try:
+            transaction = connection.begin()
+            connection.execute(text("SET TRANSACTION READ ONLY"))
+            connection.execute(
+                text(f"SET LOCAL statement_timeout = {int(settings.QUERY_STATEMENT_TIMEOUT_MS)}")
+            )
+            # Only the query itself runs through a server-side cursor, psycopg would wrap the
+            # SETs above in a DECLARE too, which Postgres rejects.
+            result = connection.execute(text(query), execution_options={"yield_per": batch_size})
+            if not result.returns_rows:
+                raise ValueError("Only queries that return rows can be streamed")
+        except Exception:
+            connection.close()
+            raise
+
+        stream_id = uuid.uuid4().hex
+        stream = QueryStream(
+            query=query,
+            connection=connection,
+            transaction=transaction,
+            result=result,
+            columns=list(result.keys()),
+            batch_size=batch_size,
+            max_rows=max_rows,
+        )
+        with self._lock:
+            self._streams[stream_id] = stream
+        return self._next_batch(stream_id, stream)
+
+    def fetch(self, stream_id: str) -> Optional[dict]:
+        """The next batch of a stream, or None if it is unknown, closed or expired."""
+        self.close_idle()
+        with self._lock:
+            stream = self._streams.get(stream_id)
+        if stream is None:
+            return None
+        return self._next_batch(stream_id, stream)
+
+    def close(self, stream_id: str) -> bool:
+        with self._lock:
+            stream = self._streams.pop(stream_id, None)
+        if stream is None:
+            return False
+        with stream.lock:
+            stream.close()
+        return True
+
+    def close_idle(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                stream_id
+                for stream_id, stream in self._streams.items()
+                if now - stream.last_used > self.idle_timeout_seconds
+            ]
+        for stream_id in expired:
+            if self.close(stream_id):
+                logger.info(f"Closed idle query stream {stream_id}")
+
+    def _start_reaper(self) -> None:
+        with self._lock:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(
+                target=self._reap, name="query-stream-reaper", daemon=True
+            )
+        self._reaper.start()
+
+    def _reap(self) -> None:
+        while True:
+            time.sleep(max(1.0, self.idle_timeout_seconds / 2))
+            try:
+                self.close_idle()
+            except Exception as e:
+                logger.warning(f"Closing idle query streams failed: {e}")
+
+    def _next_batch(self, stream_id: str, stream: QueryStream) -> dict:
+        with stream.lock:
+            size = min(stream.batch_size, stream.max_rows - stream.rows_sent)
+            rows = stream.result.fetchmany(size) if size > 0 else []
+            stream.rows_sent += len(rows)
+            stream.last_used = time.monotonic()
+            exhausted = len(rows) < size
+            truncated = not exhausted and stream.rows_sent >= stream.max_rows
+            columns = stream.columns
+
+        done = exhausted or truncated
+        if done:
+            self.close(stream_id)
+        return {
+            "success": True,
+            "stream_id": None if done else stream_id,
+            "columns": columns,
+            "data": [dict(zip(columns, row)) for row in rows],
+            "row_count": len(rows),
+            "rows_sent": stream.rows_sent,
+            "done": done,
+            "truncated": truncated,
+            "query": stream.query,
+        }
+
+
+query_streams = QueryStreamStore(
+    idle_timeout_seconds=settings.QUERY_STREAM_IDLE_TIMEOUT_SECONDS,
+    max_open=settings.QUERY_STREAM_MAX_OPEN,
+)
@@ -1,8 +1,14 @@
+import hashlib
 import textwrap
 
 from langchain_core.prompts import PromptTemplate
 
 
+def prompt_version(prompt: PromptTemplate) -> str:
+    """Short hash of a prompt's template, so its version changes exactly when its text does."""
+    return hashlib.sha256(prompt.template.encode()).hexdigest()[:12]
+
+
 class MCPPrompts:
     @staticmethod
     def get_intent_analysis_prompt() -> PromptTemplate:
@@ -0,0 +1,279 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.core.logging import logger
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+      (?P<comment>--[^\n]*|/\*.*?\*/)
+    | (?P<string>'(?:[^']|'')*')
+    | (?P<quoted>"(?:[^"]|"")*")
+    | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+    | (?P<word>[A-Za-z_][A-Za-z0-9_$]*)
+    | (?P<space>\s+)
+    | (?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_TABLE_KEYWORDS = {"from", "join"}
+# Functions whose arguments use FROM, e.g. ``extract(year FROM created_at)``.
+_FROM_FUNCTIONS = {"extract", "substring", "trim", "overlay"}
+# Words that continue a FROM list with another item ...
+_JOIN_KEYWORDS = {
+    "join", "inner", "left", "right", "full", "cross", "natural", "on", "using", "lateral",
+    "tablesample",
+}  # fmt: skip
+# ... and words that end it.
+_END_OF_FROM = {
+    "where", "group", "order", "limit", "offset", "union", "intersect", "except", "having",
+    "window", "fetch", "for",
+}  # fmt: skip
+# None of them is ever read as the alias of a FROM item.
+_CLAUSE_KEYWORDS = _JOIN_KEYWORDS | _END_OF_FROM
+# Results of queries calling these differ between runs even when no table changes.
+VOLATILE_FUNCTIONS = {
+    "now", "random", "current_date", "current_time", "current_timestamp", "localtime",
+    "localtimestamp", "clock_timestamp", "statement_timestamp", "transaction_timestamp",
+    "timeofday", "gen_random_uuid", "uuid_generate_v4", "nextval", "currval", "setval",
+    "txid_current", "pg_sleep",
+}  # fmt: skip
+# Inserted, updated and deleted tuple counts and the live tuple count of a table. Compared as a
+# whole: a DELETE moves rows from live to deleted, which would leave a sum of them unchanged.
+TableVersion = Tuple[int, int, int, int]
+
+
+def _normalize_number(token: str) -> str:
+    try:
+        value = Decimal(token)
+    except InvalidOperation:
+        return token
+    if re.fullmatch(r"\d+", token):
+        return str(int(token))
+    # Keep a decimal point so that 1.0 and 1 (numeric vs integer) stay distinct.
+    normalized = format(value.normalize(), "f")
+    return normalized if "." in normalized else f"{normalized}.0"
+
+
+def tokenize_sql(query: str) -> List[Tuple[str, str]]:
+    """Split SQL into (kind, value) tokens with comments and whitespace removed."""
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer(query):
+        kind = match.lastgroup
+        if kind in ("comment", "space"):
+            continue
+        tokens.append((kind, match.group()))
+    return tokens
+
+
+def fingerprint_sql(query: str) -> str:
+    """Normalized form of a query that ignores whitespace, comments, keyword/identifier case
+    and number formatting. String literals and quoted identifiers are kept verbatim."""
+    parts = []
+    for kind, value in tokenize_sql(query):
+        if kind == "word":
+            parts.append(value.lower())
+        elif kind == "number":
+            parts.append(_normalize_number(value))
+        else:
+            parts.append(value)
+    while parts and parts[-1] == ";":
+        parts.pop()
+    return " ".join(parts)
+
+
+def _name(kind: str, value: str) -> str:
+    return value[1:-1].replace('""', '"') if kind == "quoted" else value.lower()
+
+
+def referenced_tables(query: str) -> Optional[List[str]]:
+    """The table names a query reads, or None when one of its sources cannot be resolved.
+
+    Follows FROM and JOIN items, including comma joins and subqueries, and leaves out CTE
+    names. A function call used as a source (``FROM generate_series(...)``) makes the result
+    None, since there is no table whose changes would invalidate it.
+    """
+    tokens = tokenize_sql(query)
+    tables: set = set()
+    ctes: set = set()
+    # One entry per open parenthesis: True when it belongs to a function that takes FROM.
+    parens: List[bool] = []
+    # Per nesting level: True while inside a FROM list, where a comma starts another item.
+    in_from: List[bool] = [False]
+
+    def value_at(index: int) -> str:
+        return tokens[index][1].lower() if 0 <= index < len(tokens) else ""
+
+    def is_name(index: int) -> bool:
+        return 0 <= index < len(tokens) and tokens[index][0] in ("word", "quoted")
+
+    def from_item(index: int) -> Optional[int]:
+        """Read ``[LATERAL|ONLY] [schema.]name [[AS] alias]``, None if it is not a table."""
+        while value_at(index) in ("lateral", "only"):
+            index += 1
+        if value_at(index) == "(":
+            return index  # subquery, its own FROM is read by the main loop
+        if not is_name(index):
+            return None
+        name = _name(*tokens[index])
+        while value_at(index + 1) == "." and is_name(index + 2):
+            index += 2
+            name = _name(*tokens[index])
+        index += 1
+        if value_at(index) == "(":
+            return None
+        tables.add(name)
+        if value_at(index) == "as":
+            index += 1
+        if is_name(index) and value_at(index) not in _CLAUSE_KEYWORDS:
+            index += 1
+        return index
+
+    i = 0
+    while i < len(tokens):
+        kind, value = tokens[i]
+        lower = value.lower()
+        if value == "(":
+            parens.append(value_at(i - 1) in _FROM_FUNCTIONS)
+            in_from.append(False)
+        elif value == ")":
+            if parens:
+                parens.pop()
+                in_from.pop()
+        elif (
+            kind == "word"
+            and lower in _TABLE_KEYWORDS
+            and not (parens and parens[-1])
+            and value_at(i - 1) != "distinct"  # IS [NOT] DISTINCT FROM
+        ) or (value == "," and in_from[-1]):
+            in_from[-1] = True
+            index = from_item(i + 1)
+            if index is None:
+                return None
+            i = index
+            continue
+        elif kind == "word" and lower in _END_OF_FROM:
+            in_from[-1] = False
+        elif is_name(i) and value_at(i - 1) in ("with", "recursive", ","):
+            # ``WITH name [(columns)] AS (``
+            j = i + 1
+            if value_at(j) == "(":
+                while j < len(tokens) and value_at(j) != ")":
+                    j += 1
+                j += 1
+            if value_at(j) == "as" and value_at(j + 1) in ("(", "materialized", "not"):
+                ctes.add(_name(kind, value))
+        i += 1
+    return sorted(tables - ctes)
+
+
+def calls_volatile_function(query: str) -> bool:
+    return any(
+        kind == "word" and value.lower() in VOLATILE_FUNCTIONS
+        for kind, value in tokenize_sql(query)
+    )
+
+
+class QueryResultCache:
+    """Size-bounded LRU cache of ``Execute Query`` results keyed by SQL fingerprint.
+
+    An entry is served while it is younger than the TTL and the modification counters in
+    ``pg_stat_user_tables`` for every table the query reads are unchanged since it was stored.
+    Postgres updates those counters when a writing transaction ends (with a short delay on some
+    versions), so a write can take a moment to invalidate an entry.
+
+    Queries that nothing could invalidate are not cached: those without a base table, those
+    reading a view, foreign table or unresolvable source, and those calling a volatile function
+    such as ``now()`` or ``random()``.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def table_versions(connection: Connection, tables: List[str]) -> Dict[str, TableVersion]:
+        if not tables:
+            return {}
+        rows = connection.execute(
+            text(
+                """
+                SELECT relname, n_tup_ins, n_tup_upd, n_tup_del, n_live_tup
+                  FROM pg_stat_user_tables
+                 WHERE relname = ANY(:tables)
+                """
+            ),
+            {"tables": tables},
+        )
+        versions: Dict[str, TableVersion] = {}
+        for relname, *counters in rows:
+            # Tables of the same name in other schemas are counted together.
+            previous = versions.get(relname, (0, 0, 0, 0))
+            versions[relname] = tuple(a + int(b) for a, b in zip(previous, counters, strict=True))
+        return versions
+
+    def get(
+        self, connection: Connection, query: str
+    ) -> Tuple[Optional[dict], Optional[Dict[str, TableVersion]]]:
+        """Return the cached payload (or None) and the current table versions of the query.
+
+        The versions are None when the query must not be cached.
+        """
+        tables = referenced_tables(query)
+        if not tables or calls_volatile_function(query):
+            return None, None
+        versions = self.table_versions(connection, tables)
+        if set(versions) != set(tables):
+            return None, None
+
+        key = fingerprint_sql(query)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = time.monotonic() - entry["stored_at"]
+                if age <= self.ttl_seconds and entry["versions"] == versions:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return {
+                        **entry["payload"],
+                        "cached": True,
+                        "cache_age_seconds": round(age, 3),
+                    }, versions
+                del self._entries[key]
+            self.misses += 1
+        return None, versions
+
+    def put(self, query: str, payload: dict, versions: Dict[str, TableVersion]) -> None:
+        key = fingerprint_sql(query)
+        with self._lock:
+            self._entries[key] = {
+                "payload": payload,
+                "versions": versions,
+                "stored_at": time.monotonic(),
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        logger.debug(f"Query result cached ({self.hits} hits, {self.misses} misses)")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+query_result_cache = QueryResultCache(
+    ttl_seconds=settings.QUERY_CACHE_TTL_SECONDS, max_entries=settings.QUERY_CACHE_MAX_ENTRIES
+)
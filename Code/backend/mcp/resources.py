@@ -1,88 +1,110 @@
-from typing import Dict
+from typing import Any, Dict
 
-from sqlalchemy import create_engine, inspect
+from catalog import catalog_cache
+from sqlalchemy import create_engine
 
 from app.core.config import settings
-from app.core.logging import logger
 
 
 class MCPResources:
     _engine = None
+    _stream_engine = None
 
     @staticmethod
     def get_engine():
         if MCPResources._engine is None:
-            MCPResources._engine = create_engine(settings.DATABASE_URL)
+            MCPResources._engine = create_engine(
+                settings.DATABASE_URL,
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+                pool_pre_ping=True,
+            )
         return MCPResources._engine
 
+    @staticmethod
+    def get_stream_engine():
+        """Engine for ``Open Query Stream``, with one connection per allowed open stream.
+
+        Open streams hold their connection between fetches, so they get their own pool instead
+        of draining the one every other tool uses.
+        """
+        if MCPResources._stream_engine is None:
+            MCPResources._stream_engine = create_engine(
+                settings.DATABASE_URL,
+                pool_size=settings.QUERY_STREAM_MAX_OPEN,
+                max_overflow=0,
+                pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+                pool_pre_ping=True,
+            )
+        return MCPResources._stream_engine
+
+    @staticmethod
+    def get_database_catalog() -> Dict[str, Any]:
+        """Tables and views with their columns, foreign keys and indexes as plain data.
+
+        This is the single source for ``get_database_schema`` and the ``schema://catalog``
+        resource, which the agent uses to check generated SQL before it reaches the database.
+        It is loaded with a handful of bulk ``pg_catalog`` queries and kept in memory until the
+        schema's DDL changes.
+        """
+        return catalog_cache.get(MCPResources.get_engine())
+
     @staticmethod
     def get_database_schema() -> str:
         try:
-            inspector = inspect(MCPResources.get_engine())
-            table_names = inspector.get_table_names()
+            catalog = MCPResources.get_database_catalog()
             schema_parts = []
 
-            for table_name in table_names:
-                try:
-                    table_comment = inspector.get_table_comment(table_name).get("text", "")
-                    columns = inspector.get_columns(table_name)
-                    foreign_keys = inspector.get_foreign_keys(table_name)
-                    indexes = inspector.get_indexes(table_name)
-
-                    fk_lookup = {}
-                    for fk in foreign_keys:
-                        for col in fk.get("constrained_columns", []):
-                            fk_lookup[col] = (
-                                f"References {fk['referred_table']}.{fk['referred_columns'][0]}"
-                            )
-
-                    column_details = []
-                    for col in columns:
-                        col_info = f"{col['name']} ({col['type']})"
-                        if col.get("nullable", True):
-                            col_info += " NULL"
-                        else:
-                            col_info += " NOT NULL"
-                        if col.get("default"):
-                            col_info += f" DEFAULT {col['default']}"
-                        if col["name"] in fk_lookup:
-                            col_info += f" - {fk_lookup[col['name']]}"
-                        if col.get("comment"):
-                            col_info += f" -- {col['comment']}"
-                        column_details.append(col_info)
-
-                    index_info = []
-                    for idx in indexes:
-                        idx_cols = ", ".join(idx["column_names"])
-                        idx_type = "UNIQUE" if idx.get("unique") else "INDEX"
-                        index_info.append(f"{idx_type} {idx['name']} ({idx_cols})")
-
-                    table_parts = []
-                    table_parts.append(f"TABLE: {table_name}")
-                    table_parts.append(
-                        f"Description: {table_comment or 'No description available'}"
-                    )
-
-                    table_parts.append("Columns:")
-                    for col in column_details:
-                        table_parts.append(f"  - {col}")
-
-                    if index_info:
-                        table_parts.append("Indexes:")
-                        for idx in index_info:
-                            table_parts.append(f"  - {idx}")
-
-                    if fk_lookup:
-                        table_parts.append("Foreign Keys:")
-                        for fk_string in fk_lookup.values():
-                            table_parts.append(f"  - {fk_string}")
-
-                    table_schema = "\n".join(table_parts)
-                    schema_parts.append(table_schema)
-
-                except Exception as e:
-                    logger.warning(f"Error processing table {table_name}: {e}")
-                    continue
+            for table_name, table in catalog["tables"].items():
+                fk_lookup = {}
+                for fk in table["foreign_keys"]:
+                    for col in fk["constrained_columns"]:
+                        fk_lookup[col] = (
+                            f"References {fk['referred_table']}.{fk['referred_columns'][0]}"
+                        )
+
+                column_details = []
+                for col in table["columns"]:
+                    col_info = f"{col['name']} ({col['type']})"
+                    if col["nullable"]:
+                        col_info += " NULL"
+                    else:
+                        col_info += " NOT NULL"
+                    if col["default"]:
+                        col_info += f" DEFAULT {col['default']}"
+                    if col["name"] in fk_lookup:
+                        col_info += f" - {fk_lookup[col['name']]}"
+                    if col["comment"]:
+                        col_info += f" -- {col['comment']}"
+                    column_details.append(col_info)
+
+                index_info = []
+                for idx in table["indexes"]:
+                    idx_cols = ", ".join(idx["column_names"])
+                    idx_type = "UNIQUE" if idx["unique"] else "INDEX"
+                    index_info.append(f"{idx_type} {idx['name']} ({idx_cols})")
+
+                table_parts = []
+                table_parts.append(f"{table.get('kind', 'table').upper()}: {table_name}")
+                table_parts.append(f"Description: {table['comment'] or 'No description available'}")
+
+                table_parts.append("Columns:")
+                for col in column_details:
+                    table_parts.append(f"  - {col}")
+
+                if index_info:
+                    table_parts.append("Indexes:")
+                    for idx in index_info:
+                        table_parts.append(f"  - {idx}")
+
+                if fk_lookup:
+                    table_parts.append("Foreign Keys:")
+                    for fk_string in fk_lookup.values():
+                        table_parts.append(f"  - {fk_string}")
+
+                table_schema = "\n".join(table_parts)
+                schema_parts.append(table_schema)
 
             return "\n" + "\n\n".join(schema_parts)
 
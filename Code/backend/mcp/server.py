@@ -1,7 +1,9 @@
+import functools
 from datetime import datetime
 
+import anyio.to_thread
 from fastmcp import FastMCP
-from prompts import MCPPrompts
+from prompts import MCPPrompts, prompt_version
 from resources import MCPResources
 from starlette.responses import JSONResponse
 from tools import MCPTools
@@ -14,9 +16,23 @@ mcp = FastMCP(
     version="1.0.1",
 )
 
+
+def in_thread(fn):
+    """Run a blocking database call in a worker thread, so it never stalls the event loop.
+
+    This matters most with the in-process transport, where that loop is the API's own.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs))
+
+    return wrapper
+
+
 # ==================================================================================================Tools=============================================================================================
 mcp.tool(
-    MCPTools.list_tables,
+    in_thread(MCPTools.list_tables),
     name="List Tables",
     description="Retrieve the names of all tables available in the connected database. Use this to understand what data structures exist.",
     tags={"tables", "schema"},
@@ -24,7 +40,7 @@ mcp.tool(
 )
 
 mcp.tool(
-    MCPTools.execute_sql_query,
+    in_thread(MCPTools.execute_sql_query),
     name="Execute Query",
     description="Execute a validated SQL query and return the resulting rows. Only use after the query is confirmed to be safe and syntactically correct.",
     tags={"sql", "execute"},
@@ -32,7 +48,39 @@ mcp.tool(
 )
 
 mcp.tool(
-    MCPTools.validate_sql_syntax,
+    in_thread(MCPTools.validate_and_execute),
+    name="Validate and Execute",
+    description="Validate and run a read-only SQL query in a single round trip. Returns the validation error if the query is invalid, otherwise the resulting rows.",
+    tags={"sql", "validation", "execute"},
+    meta={"version": settings.APP_VERSION, "author": settings.AUTHOR},
+)
+
+mcp.tool(
+    in_thread(MCPTools.open_query_stream),
+    name="Open Query Stream",
+    description="Run a read-only SQL query on a server-side cursor and return its first batch of rows together with a stream id for fetching the rest.",
+    tags={"sql", "execute", "stream"},
+    meta={"version": settings.APP_VERSION, "author": settings.AUTHOR},
+)
+
+mcp.tool(
+    in_thread(MCPTools.fetch_query_batch),
+    name="Fetch Query Batch",
+    description="Return the next batch of rows of a query stream. The stream is closed after the last batch.",
+    tags={"sql", "stream"},
+    meta={"version": settings.APP_VERSION, "author": settings.AUTHOR},
+)
+
+mcp.tool(
+    in_thread(MCPTools.close_query_stream),
+    name="Close Query Stream",
+    description="Close a query stream that is no longer needed and release its database connection.",
+    tags={"sql", "stream"},
+    meta={"version": settings.APP_VERSION, "author": settings.AUTHOR},
+)
+
+mcp.tool(
+    in_thread(MCPTools.validate_sql_syntax),
     name="Validate SQL",
     description="Check whether a SQL statement is syntactically correct and safe to execute. Use this to catch issues before running the query.",
     tags={"sql", "validation"},
@@ -48,8 +96,20 @@ mcp.tool(
     tags={"schema", "metadata"},
     meta={"version": settings.APP_VERSION, "author": settings.AUTHOR},
 )
-def database_schema() -> str:
-    return MCPResources.get_database_schema()
+async def database_schema() -> str:
+    return await in_thread(MCPResources.get_database_schema)()
+
+
+@mcp.resource(
+    uri="schema://catalog",
+    name="Database Catalog",
+    description="Machine-readable catalog of every table with its columns, foreign keys and indexes. Useful for checking identifiers in generated SQL.",
+    mime_type="application/json",
+    tags={"schema", "metadata"},
+    meta={"version": settings.APP_VERSION, "author": settings.AUTHOR},
+)
+async def database_catalog() -> dict:
+    return await in_thread(MCPResources.get_database_catalog)()
 
 
 @mcp.resource(
@@ -83,6 +143,7 @@ def chart_templates() -> dict:
         "requires clarification (need_clarification), modifies a previous query (handle_modification_intent), "
         "or is a follow-up question (handle_follow_up)."
     ),
+    meta={"version": prompt_version(MCPPrompts.get_triage_prompt()), "author": settings.AUTHOR},
 )
 def get_triage_system_prompt():
     return MCPPrompts.get_triage_prompt()
@@ -1,9 +1,15 @@
 from datetime import datetime
 
+from cursors import query_streams
+from query_cache import query_result_cache
 from resources import MCPResources
 from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.core.config import settings
+from app.core.result_format import ROWS, ResultFormat, encode_result, to_columnar
+
 
 class MCPTools:
     @staticmethod
@@ -41,27 +47,118 @@ class MCPTools:
             return {"valid": False, "error": str(e), "query": query, "error_type": type(e).__name__}
 
     @staticmethod
-    def execute_sql_query(query: str, limit: int = 10) -> dict:
+    def _run_query(
+        connection: Connection, query: str, limit: int, result_format: ResultFormat
+    ) -> dict | None:
+        is_select = query.strip().upper().startswith("SELECT")
+        if is_select and "LIMIT" not in query.upper():
+            query = f"{query.rstrip(';')} LIMIT {limit}"
+
+        use_cache = settings.QUERY_CACHE_ENABLED and is_select
+        if use_cache:
+            cached, table_versions = query_result_cache.get(connection, query)
+            if cached is not None:
+                return encode_result(cached, result_format)
+
+        result = connection.execute(text(query))
+        if result.returns_rows:
+            columns = list(result.keys())
+            rows = result.fetchall()
+            # Results are cached columnar and only expanded to row dicts when asked for.
+            payload = {
+                "success": True,
+                "columns": columns,
+                "values": to_columnar(columns, rows),
+                "row_count": len(rows),
+                "query": query,
+                "executed_at": datetime.now().isoformat(),
+                "cached": False,
+            }
+            if use_cache and table_versions is not None:
+                query_result_cache.put(query, payload, table_versions)
+            return encode_result(payload, result_format)
+        return None
+
+    @staticmethod
+    def execute_sql_query(query: str, limit: int = 10, result_format: ResultFormat = ROWS) -> dict:
+        """
+        Executes a query and returns its rows, either as one dict per row ("rows") or as the
+        column names plus one array of values per column ("columnar").
+        """
         engine = MCPResources.get_engine()
         try:
             with engine.connect() as connection:
-                if query.strip().upper().startswith("SELECT") and "LIMIT" not in query.upper():
-                    query = f"{query.rstrip(';')} LIMIT {limit}"
-
-                result = connection.execute(text(query))
-                if result.returns_rows:
-                    columns = list(result.keys())
-                    rows = result.fetchall()
-                    data = [dict(zip(columns, row)) for row in rows]
+                return MCPTools._run_query(connection, query, limit, result_format)
+        except SQLAlchemyError as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "query": query,
+                "error_type": type(e).__name__,
+            }
+
+    @staticmethod
+    def validate_and_execute(
+        query: str, limit: int = 10, result_format: ResultFormat = ROWS
+    ) -> dict:
+        """
+        Validates and executes a query on one connection, in a read-only transaction with a
+        statement timeout. Postgres parses and plans the statement once; errors raised while
+        doing so (syntax errors, unknown tables or columns) are reported as validation errors.
+
+        Returns:
+         dict: {"valid": False, "error": ...} or {"valid": True, **result of Execute Query}.
+        """
+        engine = MCPResources.get_engine()
+        try:
+            with engine.connect() as connection, connection.begin():
+                connection.execute(text("SET TRANSACTION READ ONLY"))
+                connection.execute(
+                    text(
+                        f"SET LOCAL statement_timeout = {int(settings.QUERY_STATEMENT_TIMEOUT_MS)}"
+                    )
+                )
+                payload = MCPTools._run_query(connection, query, limit, result_format)
+                if payload is None:
                     return {
-                        "success": True,
-                        "data": data,
-                        "columns": columns,
-                        "row_count": len(data),
+                        "valid": True,
+                        "success": False,
                         "query": query,
-                        "executed_at": datetime.now().isoformat(),
+                        "error": "Query returned no rows",
                     }
+                return {"valid": True, **payload}
         except SQLAlchemyError as e:
+            sqlstate = getattr(getattr(e, "orig", None), "sqlstate", None) or ""
+            return {
+                # Class 42 covers syntax errors and undefined tables, columns and functions.
+                "valid": not sqlstate.startswith("42"),
+                "success": False,
+                "error": str(e),
+                "query": query,
+                "error_type": type(e).__name__,
+            }
+
+    @staticmethod
+    def open_query_stream(
+        query: str,
+        batch_size: int = settings.QUERY_STREAM_BATCH_SIZE,
+        max_rows: int = settings.QUERY_STREAM_MAX_ROWS,
+    ) -> dict:
+        """
+        Runs a read-only query on a server-side cursor and returns its first batch of rows.
+        No LIMIT is added, instead the stream stops after max_rows.
+
+        Returns:
+         dict: The batch, with a stream_id to pass to Fetch Query Batch unless done is true.
+        """
+        try:
+            return query_streams.open(
+                MCPResources.get_stream_engine(),
+                query,
+                max(1, min(batch_size, settings.QUERY_STREAM_BATCH_SIZE)),
+                max(1, min(max_rows, settings.QUERY_STREAM_MAX_ROWS)),
+            )
+        except (SQLAlchemyError, RuntimeError, ValueError) as e:
             return {
                 "success": False,
                 "error": str(e),
@@ -69,6 +166,24 @@ class MCPTools:
                 "error_type": type(e).__name__,
             }
 
+    @staticmethod
+    def fetch_query_batch(stream_id: str) -> dict:
+        """
+        Returns the next batch of rows of a stream opened with Open Query Stream.
+        """
+        try:
+            batch = query_streams.fetch(stream_id)
+        except SQLAlchemyError as e:
+            query_streams.close(stream_id)
+            return {"success": False, "error": str(e), "error_type": type(e).__name__}
+        if batch is None:
+            return {"success": False, "error": f"Query stream {stream_id} is closed or expired"}
+        return batch
+
+    @staticmethod
+    def close_query_stream(stream_id: str) -> dict:
+        return {"success": True, "closed": query_streams.close(stream_id)}
+
     @staticmethod
     def get_sample_data(table_name: str, limit: int = 5) -> dict:
         query = f"SELECT * FROM {table_name} LIMIT {limit}"
@@ -0,0 +1,41 @@
+"""add chat threads
+
+Revision ID: 3f9c2a7d1e84
+Revises: 6b139e0b2e7b
+Create Date: 2026-10-17 09:12:41.508213
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9c2a7d1e84"
+down_revision: Union[str, Sequence[str], None] = "6b139e0b2e7b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "chat_threads",
+        sa.Column("thread_id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("thread_id"),
+    )
+    op.create_index(op.f("ix_chat_threads_user_id"), "chat_threads", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_chat_threads_user_id"), table_name="chat_threads")
+    op.drop_table("chat_threads")
@@ -0,0 +1,9 @@
+import os
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BACKEND_DIR)
+
+# The auth module validates these when the API routes are imported.
+os.environ.setdefault("CLIENT_ID", "test-client")
+os.environ.setdefault("PROJECT_ID", "test-project")
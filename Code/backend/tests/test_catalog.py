@@ -0,0 +1,127 @@
+import importlib.util
+from pathlib import Path
+
+MCP_DIR = Path(__file__).resolve().parent.parent / "mcp"
+spec = importlib.util.spec_from_file_location("catalog", MCP_DIR / "catalog.py")
+catalog = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(catalog)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def mappings(self):
+        return self.rows
+
+    def scalar(self):
+        return self.rows
+
+
+class FakeConnection:
+    """Answers each catalog query with canned rows and counts the round trips."""
+
+    def __init__(self, fingerprint="v1"):
+        self.fingerprint = fingerprint
+        self.queries = []
+        self.rows = {
+            catalog.TABLES_QUERY: [
+                {"table_name": "orders", "relkind": "r", "comment": "Customer orders"},
+                {"table_name": "order_totals", "relkind": "v", "comment": None},
+            ],
+            catalog.COLUMNS_QUERY: [
+                column("orders", "id", "integer", False),
+                column("orders", "customer_id", "integer", True),
+                column("order_totals", "total", "numeric", True),
+            ],
+            catalog.FOREIGN_KEYS_QUERY: [
+                {
+                    "table_name": "orders",
+                    "constrained_columns": ["customer_id"],
+                    "referred_table": "customers",
+                    "referred_columns": ["id"],
+                }
+            ],
+            catalog.INDEXES_QUERY: [
+                {
+                    "table_name": "orders",
+                    "name": "orders_customer_idx",
+                    "unique": False,
+                    "column_names": ["customer_id"],
+                }
+            ],
+        }
+
+    def execute(self, statement):
+        query = statement.text
+        self.queries.append(query)
+        if query == catalog.DDL_FINGERPRINT_QUERY:
+            return FakeResult(self.fingerprint)
+        return FakeResult(self.rows[query])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def column(table_name, name, type_, nullable):
+    return {
+        "table_name": table_name,
+        "name": name,
+        "type": type_,
+        "nullable": nullable,
+        "default": None,
+        "comment": None,
+    }
+
+
+class FakeEngine:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def connect(self):
+        return self.connection
+
+
+def test_catalog_is_loaded_with_four_queries():
+    connection = FakeConnection()
+
+    tables = catalog.load_catalog(connection)["tables"]
+
+    assert len(connection.queries) == 4
+    assert tables["orders"]["kind"] == "table"
+    assert tables["orders"]["comment"] == "Customer orders"
+    assert [c["name"] for c in tables["orders"]["columns"]] == ["id", "customer_id"]
+    assert tables["orders"]["foreign_keys"] == [
+        {
+            "constrained_columns": ["customer_id"],
+            "referred_table": "customers",
+            "referred_columns": ["id"],
+        }
+    ]
+    assert tables["orders"]["indexes"][0]["unique"] is False
+    assert tables["order_totals"] == {
+        "kind": "view",
+        "comment": "",
+        "columns": [
+            {"name": "total", "type": "numeric", "nullable": True, "default": None, "comment": None}
+        ],
+        "foreign_keys": [],
+        "indexes": [],
+    }
+
+
+def test_catalog_is_reloaded_only_after_ddl():
+    connection = FakeConnection()
+    cache = catalog.CatalogCache()
+    engine = FakeEngine(connection)
+
+    first = cache.get(engine)
+    assert cache.get(engine) is first
+    assert len(connection.queries) == 6  # fingerprint, four catalog queries, fingerprint
+
+    connection.fingerprint = "v2"
+    assert cache.get(engine) is not first
+    assert len(connection.queries) == 11
@@ -0,0 +1,136 @@
+import asyncio
+import json
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import embbedings
+from app.services.embbedings import Collection, CollectionCatalog, CollectionsManager
+from app.utils import util
+from app.utils.util import Util
+
+
+def details(name, uuid, table_id="t1"):
+    return {"uuid": uuid, "name": name, "metadata": {}, "table_id": table_id}
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    lookups = []
+
+    async def get_by_name(self, name):
+        lookups.append((self.user_id, name))
+        return details(name, f"uuid-{name}") if name != "missing" else None
+
+    monkeypatch.setattr(CollectionsManager, "get_by_name", get_by_name)
+    return lookups
+
+
+def test_catalog_resolves_each_name_once(lookups):
+    catalog = CollectionCatalog()
+
+    async def run():
+        first = await catalog.resolve("sql_queries", "root")
+        second = await catalog.resolve("sql_queries", "root")
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first is second
+    assert first["uuid"] == "uuid-sql_queries"
+    assert lookups == [("root", "sql_queries")]
+
+
+def test_catalog_does_not_remember_misses(lookups):
+    catalog = CollectionCatalog()
+
+    assert asyncio.run(catalog.resolve("missing", "root")) is None
+    assert asyncio.run(catalog.resolve("missing", "root")) is None
+    assert len(lookups) == 2
+
+
+def test_catalog_is_keyed_by_owner_and_invalidated_by_id(lookups):
+    catalog = CollectionCatalog()
+    catalog.register("root", details("sql_queries", "a"))
+    catalog.register("root", details("database_schema", "b"))
+
+    assert catalog.lookup("sql_queries", "alice") is None
+
+    catalog.invalidate("a")
+    assert catalog.lookup("sql_queries", "root") is None
+    assert catalog.lookup("database_schema", "root")["uuid"] == "b"
+
+    catalog.invalidate()
+    assert catalog.lookup("database_schema", "root") is None
+
+
+def test_root_collection_carries_its_table_id(lookups, monkeypatch):
+    monkeypatch.setattr(util, "collection_catalog", CollectionCatalog())
+
+    collection = asyncio.run(Util.get_root_collection_by_name("sql_queries", "root"))
+
+    assert isinstance(collection, Collection)
+    assert (collection.collection_id, collection.table_id) == ("uuid-sql_queries", "t1")
+
+
+class FakeEmbeddings:
+    async def aembed_query(self, query):
+        return [0.5, 0.25]
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+        self.arguments = None
+
+    async def fetch(self, sql, *arguments):
+        self.arguments = arguments
+        return self.rows
+
+
+def use_connection(monkeypatch, connection):
+    @asynccontextmanager
+    async def get_db_connection():
+        yield connection
+
+    monkeypatch.setattr(embbedings, "get_db_connection", get_db_connection)
+    monkeypatch.setattr(embbedings, "default_embeddings", FakeEmbeddings())
+
+
+def test_search_embeds_and_queries_asynchronously(monkeypatch):
+    connection = FakeConnection(
+        [
+            {
+                "id": "d1",
+                "document": "SELECT 1",
+                "cmetadata": json.dumps({"question": "one"}),
+                "distance": 0.1,
+            }
+        ]
+    )
+    use_connection(monkeypatch, connection)
+    collection = Collection("c1", "alice")
+
+    results = asyncio.run(collection.search("one?", limit=3))
+
+    assert results == [
+        {"id": "d1", "page_content": "SELECT 1", "metadata": {"question": "one"}, "score": 0.1}
+    ]
+    vector, collection_id, user_id, owners, limit, metadata = connection.arguments
+    assert (vector, collection_id, user_id, limit) == ("[0.5,0.25]", "c1", "alice", 3)
+    assert json.loads(metadata) == {}
+    assert asyncio.run(collection.search_min("one?")) == ["SELECT 1"]
+
+
+def test_search_of_unknown_collection_is_not_found(monkeypatch):
+    use_connection(monkeypatch, FakeConnection([]))
+
+    async def get(self, collection_id):
+        return None
+
+    monkeypatch.setattr(CollectionsManager, "get", get)
+
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(Collection("c1", "alice").search("one?"))
+    assert raised.value.status_code == 404
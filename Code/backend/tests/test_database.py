@@ -0,0 +1,100 @@
+import asyncio
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import database
+
+
+class FakePGVector:
+    created = 0
+
+    def __init__(self, embeddings, collection_name, connection, **kwargs):
+        FakePGVector.created += 1
+        self.collection_name = collection_name
+        self.connection = connection
+
+
+@pytest.fixture
+def stores(monkeypatch):
+    FakePGVector.created = 0
+    monkeypatch.setattr(database, "PGVector", FakePGVector)
+    monkeypatch.setattr(database, "_vectorstores", OrderedDict())
+    monkeypatch.setattr(database, "get_vectorstore_engine", lambda: "shared engine")
+    monkeypatch.setattr(database.settings, "VECTORSTORE_CACHE_SIZE", 2)
+    return database._vectorstores
+
+
+def test_stores_on_the_shared_engine_are_reused(stores):
+    embeddings = SimpleNamespace(model="small")
+
+    first = database.get_vectorstore("a", embeddings)
+
+    assert database.get_vectorstore("a", embeddings) is first
+    assert first.connection == "shared engine"
+    assert database.get_vectorstore("a", SimpleNamespace(model="large")) is not first
+    assert FakePGVector.created == 2
+
+
+def test_least_recently_used_store_is_evicted(stores):
+    embeddings = SimpleNamespace(model="small")
+    a = database.get_vectorstore("a", embeddings)
+    database.get_vectorstore("b", embeddings)
+    database.get_vectorstore("a", embeddings)
+    database.get_vectorstore("c", embeddings)
+
+    assert [name for name, model in stores] == ["a", "c"]
+    assert database.get_vectorstore("a", embeddings) is a
+
+
+def test_explicit_engine_is_not_cached(stores):
+    embeddings = SimpleNamespace(model="small")
+
+    store = database.get_vectorstore("a", embeddings, engine="other engine")
+
+    assert store.connection == "other engine"
+    assert not stores
+
+
+def test_engine_is_created_once_with_pool_settings(monkeypatch):
+    calls = []
+    monkeypatch.setattr(database, "_engine", None)
+
+    def create_engine(url, **kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(url=url)
+
+    monkeypatch.setattr(database, "create_engine", create_engine)
+
+    engine = database.get_vectorstore_engine()
+
+    assert database.get_vectorstore_engine() is engine
+    assert len(calls) == 1
+    assert calls[0]["pool_size"] == database.settings.DB_POOL_SIZE
+    assert calls[0]["pool_pre_ping"] is True
+
+
+def test_connections_go_back_to_the_pool(monkeypatch):
+    connection = SimpleNamespace(closed=False)
+    released = []
+
+    @asynccontextmanager
+    async def acquire():
+        yield connection
+        released.append(connection)
+
+    async def get_db_pool():
+        return SimpleNamespace(acquire=acquire)
+
+    monkeypatch.setattr(database, "get_db_pool", get_db_pool)
+
+    async def run():
+        async with database.get_db_connection() as conn:
+            assert conn is connection
+
+    asyncio.run(run())
+
+    assert released == [connection]
+    assert connection.closed is False
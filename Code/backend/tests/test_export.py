@@ -0,0 +1,173 @@
+import asyncio
+import io
+from contextlib import asynccontextmanager
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import UUID
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from fastapi import HTTPException
+
+from app.api.routes import chat as chat_routes
+from app.services import export
+
+
+def attribute(name, type_name):
+    return SimpleNamespace(name=name, type=SimpleNamespace(name=type_name))
+
+
+ATTRIBUTES = [
+    attribute("id", "int8"),
+    attribute("amount", "numeric"),
+    attribute("day", "date"),
+    attribute("ref", "uuid"),
+]
+
+
+class FakeCursor:
+    def __init__(self, batches):
+        self.batches = list(batches)
+
+    async def fetch(self, size):
+        return self.batches.pop(0) if self.batches else []
+
+
+class FakeConnection:
+    def __init__(self, batches):
+        self.batches = batches
+
+    def transaction(self, readonly):
+        @asynccontextmanager
+        async def transaction():
+            yield
+
+        return transaction()
+
+    async def execute(self, sql):
+        pass
+
+    async def prepare(self, sql):
+        async def cursor():
+            return FakeCursor(self.batches)
+
+        return SimpleNamespace(get_attributes=lambda: ATTRIBUTES, cursor=cursor)
+
+
+def run_export(monkeypatch, batches):
+    @asynccontextmanager
+    async def get_db_connection():
+        yield FakeConnection(batches)
+
+    monkeypatch.setattr(export, "get_db_connection", get_db_connection)
+
+    async def collect():
+        return b"".join([chunk async for chunk in export.export_parquet("SELECT 1")])
+
+    return pq.read_table(io.BytesIO(asyncio.run(collect())))
+
+
+def test_schema_follows_the_column_types():
+    schema = export.arrow_schema(ATTRIBUTES)
+
+    assert schema.types == [pa.int64(), pa.float64(), pa.date32(), pa.string()]
+
+
+def test_all_null_first_batch_keeps_the_column_types(monkeypatch):
+    ref = UUID("12345678-1234-5678-1234-567812345678")
+    batches = [
+        [(None, None, None, None)],
+        [(1, Decimal("9.50"), date(2024, 1, 1), ref)],
+    ]
+
+    table = run_export(monkeypatch, batches)
+
+    assert table.schema == export.arrow_schema(ATTRIBUTES)
+    assert table.column("amount").to_pylist() == [None, 9.5]
+    assert table.column("ref").to_pylist() == [None, str(ref)]
+
+
+def test_empty_result_still_has_its_columns(monkeypatch):
+    table = run_export(monkeypatch, [])
+
+    assert table.num_rows == 0
+    assert table.column_names == ["id", "amount", "day", "ref"]
+
+
+def test_export_of_another_users_thread_is_not_found(monkeypatch):
+    async def thread_owner(thread_id):
+        return "alice"
+
+    async def aget_state(config):
+        raise AssertionError("the checkpoint must not be read")
+
+    monkeypatch.setattr(chat_routes, "thread_owner", thread_owner)
+    monkeypatch.setattr(chat_routes.app_state, "graph", SimpleNamespace(aget_state=aget_state))
+
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(chat_routes.chat_export("t1", user={"sub": "mallory"}))
+    assert raised.value.status_code == 404
+
+
+def test_chat_on_another_users_thread_is_forbidden(monkeypatch):
+    async def claim_thread(thread_id, user_id):
+        return user_id == "alice"
+
+    monkeypatch.setattr(chat_routes, "claim_thread", claim_thread)
+    request = SimpleNamespace(thread_id="t1", messages=[])
+
+    with pytest.raises(HTTPException) as raised:
+        asyncio.run(chat_routes.chat(None, request, user={"sub": "mallory"}))
+    assert raised.value.status_code == 403
+
+
+def test_abandoned_csv_download_finishes_its_copy(monkeypatch):
+    released = []
+
+    class CopyingConnection(FakeConnection):
+        async def copy_from_query(self, sql, output, **kwargs):
+            while True:  # Postgres produces rows faster than the client reads them
+                await output(b"1,2\n")
+
+    @asynccontextmanager
+    async def get_db_connection():
+        try:
+            yield CopyingConnection([])
+        finally:
+            released.append(True)
+
+    monkeypatch.setattr(export, "get_db_connection", get_db_connection)
+    monkeypatch.setattr(export.settings, "EXPORT_QUEUE_CHUNKS", 1)
+
+    async def download_first_chunk():
+        body = export.export_csv("SELECT 1")
+        first = await anext(body)
+        await asyncio.sleep(0)  # let the COPY fill the queue
+        await asyncio.wait_for(body.aclose(), timeout=1)
+        # Finished before the event loop shuts down and cancels whatever is left.
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+        assert released == [True]
+        return first
+
+    assert asyncio.run(download_first_chunk()) == b"1,2\n"
+
+
+def test_csv_download_ends_after_the_last_chunk(monkeypatch):
+    class CopyingConnection(FakeConnection):
+        async def copy_from_query(self, sql, output, **kwargs):
+            for line in (b"n\n", b"1\n", b"2\n"):
+                await output(line)
+
+    @asynccontextmanager
+    async def get_db_connection():
+        yield CopyingConnection([])
+
+    monkeypatch.setattr(export, "get_db_connection", get_db_connection)
+    monkeypatch.setattr(export.settings, "EXPORT_QUEUE_CHUNKS", 1)
+
+    async def download():
+        return [chunk async for chunk in export.export_csv("SELECT 1")]
+
+    assert asyncio.run(asyncio.wait_for(download(), timeout=1)) == [b"n\n", b"1\n", b"2\n"]
@@ -0,0 +1,118 @@
+import asyncio
+import json
+import sys
+from datetime import date
+
+import anyio
+import pytest
+from fastmcp import FastMCP
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData
+
+from app.utils.mcp_client import (
+    MCP_SERVER_PACKAGE,
+    InProcessMCPClient,
+    MCPSessionPool,
+    load_mcp_server,
+)
+
+
+class FakeSession:
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    async def call_tool(self, name, arguments=None):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return f"{name} ok"
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = MCPSessionPool(None, "sql", size=1, health_check_interval=60, connect_timeout=1)
+    pool.sessions = []
+    pool.discarded = []
+
+    async def acquire():
+        return pool.sessions.pop(0)
+
+    async def discard(session):
+        pool.discarded.append(session)
+
+    monkeypatch.setattr(pool, "acquire", acquire)
+    monkeypatch.setattr(pool, "_discard", discard)
+    return pool
+
+
+def test_transport_error_reconnects_and_retries(pool):
+    broken, fresh = FakeSession(anyio.ClosedResourceError()), FakeSession()
+    pool.sessions = [broken, fresh]
+
+    assert asyncio.run(pool.call("call_tool", "List Tables")) == "List Tables ok"
+    assert pool.discarded == [broken]
+    assert fresh.calls == 1
+
+
+@pytest.mark.parametrize(
+    "error",
+    [McpError(ErrorData(code=-32602, message="Unknown tool")), ValueError("bad arguments")],
+)
+def test_server_errors_are_raised_unchanged(pool, error):
+    session = FakeSession(error)
+    pool.sessions = [session, FakeSession()]
+
+    with pytest.raises(type(error)) as raised:
+        asyncio.run(pool.call("call_tool", "Missing"))
+    assert raised.value is error
+    assert session.calls == 1
+    assert pool.discarded == []
+
+
+def test_load_mcp_server_keeps_module_names_private():
+    server = load_mcp_server()
+
+    assert "Execute Query" in asyncio.run(server.get_tools())
+    assert not {"server", "tools", "resources", "catalog", "prompts"} & set(sys.modules)
+    assert f"{MCP_SERVER_PACKAGE}.tools" in sys.modules
+
+
+def make_server():
+    server = FastMCP("test")
+
+    @server.tool(name="Add")
+    def add(a: int, b: int) -> dict:
+        return {"sum": a + b, "at": date(2024, 1, 1)}
+
+    @server.resource("config://answer")
+    def answer() -> dict:
+        return {"answer": 42}
+
+    @server.prompt(name="Greeting")
+    def greeting(name: str) -> str:
+        return f"Hello {name}"
+
+    return server
+
+
+def test_in_process_client_goes_through_fastmcp():
+    client = InProcessMCPClient("test", server=make_server())
+
+    async def run():
+        try:
+            (tool,) = await client.get_tools()
+            assert json.loads(await tool.arun({"a": 1, "b": 2})) == {"sum": 3, "at": "2024-01-01"}
+
+            async with client.session("test") as session:
+                invalid = await session.call_tool("Add", {"a": "one", "b": 2})
+            assert invalid.isError
+
+            (resource,) = await client.get_resources("test", uris="config://answer")
+            assert json.loads(resource.as_string()) == {"answer": 42}
+            (message,) = await client.get_prompt("test", "Greeting", arguments={"name": "Ada"})
+            assert message.content == "Hello Ada"
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
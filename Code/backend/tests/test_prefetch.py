@@ -0,0 +1,95 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.agent import prefetch
+
+
+async def slow(value, delay=0.2):
+    await asyncio.sleep(delay)
+    return value
+
+
+@pytest.fixture
+def stages(monkeypatch):
+    async def get_user_context(config):
+        return await slow({"sql_patterns": ["SELECT ..."]})
+
+    monkeypatch.setattr(prefetch, "fetch_relevant_schema", lambda question: slow("orders(id)"))
+    monkeypatch.setattr(prefetch, "fetch_table_list", lambda: slow("orders"))
+    monkeypatch.setattr(
+        prefetch.app_state, "memory_tools", SimpleNamespace(get_user_context=get_user_context)
+    )
+
+
+def test_stages_run_concurrently(stages):
+    started = time.perf_counter()
+    context = asyncio.run(prefetch.prefetch_sql_context("orders?", config={}, timeout=5))
+
+    assert time.perf_counter() - started < 0.5
+    assert context["relevant_schema"] == "orders(id)"
+    assert context["all_tables"] == "orders"
+    assert context["user_context"] == {"sql_patterns": ["SELECT ..."]}
+    assert set(context["timings"]) == {"schema", "tables", "user_context", "prefetch"}
+
+
+def test_slow_or_failing_stages_fall_back_to_placeholders(stages, monkeypatch):
+    async def broken(question):
+        raise ConnectionError("vector store down")
+
+    monkeypatch.setattr(prefetch, "fetch_relevant_schema", broken)
+    monkeypatch.setattr(prefetch, "fetch_table_list", lambda: slow("orders", delay=5))
+
+    context = asyncio.run(prefetch.prefetch_sql_context("orders?", timeout=0.1))
+
+    assert context["relevant_schema"] == "Schema not available"
+    assert context["all_tables"] == "Unable to retrieve table list"
+    # Without a config the user's memories are not read.
+    assert context["user_context"] == {}
+
+
+@pytest.fixture
+def prefetcher(monkeypatch):
+    async def prefetch_sql_context(question, config=None):
+        return await slow({"question": question}, delay=0.05)
+
+    monkeypatch.setattr(prefetch, "prefetch_sql_context", prefetch_sql_context)
+    return prefetch.SpeculativePrefetcher()
+
+
+def test_prefetch_started_during_triage_is_claimed(prefetcher):
+    async def run():
+        prefetcher.start("t1", "orders?")
+        return await prefetcher.claim("t1", "orders?")
+
+    assert asyncio.run(run()) == {"question": "orders?"}
+    assert prefetcher.stats() == {"started": 1, "useful": 1, "wasted": 0, "in_flight": 0}
+
+
+def test_prefetch_for_another_question_is_cancelled(prefetcher):
+    async def run():
+        prefetcher.start("t1", "orders?")
+        _, task = prefetcher._tasks["t1"]
+        context = await prefetcher.claim("t1", "customers?")
+        await asyncio.sleep(0)
+        return context, task
+
+    context, task = asyncio.run(run())
+
+    assert context is None
+    assert task.cancelled()
+    assert prefetcher.stats()["wasted"] == 1
+
+
+def test_restarting_a_thread_discards_its_previous_prefetch(prefetcher):
+    async def run():
+        prefetcher.start("t1", "orders?")
+        prefetcher.start("t1", "customers?")
+        claimed = await prefetcher.claim("t1", "customers?")
+        assert await prefetcher.claim("t1", "customers?") is None
+        return claimed
+
+    assert asyncio.run(run()) == {"question": "customers?"}
+    assert prefetcher.stats() == {"started": 2, "useful": 1, "wasted": 1, "in_flight": 0}
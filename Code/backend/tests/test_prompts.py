@@ -0,0 +1,65 @@
+import asyncio
+import importlib.util
+import json
+from contextlib import asynccontextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+from langchain_core.prompts import PromptTemplate
+
+from app.utils.util import PromptRegistry
+
+MCP_DIR = Path(__file__).resolve().parent.parent / "mcp"
+spec = importlib.util.spec_from_file_location("prompts", MCP_DIR / "prompts.py")
+prompts = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(prompts)
+
+
+def test_version_follows_the_prompt_text():
+    triage = prompts.MCPPrompts.get_triage_prompt()
+    edited = PromptTemplate(template=triage.template + "\nAnswer in English.")
+
+    assert prompts.prompt_version(triage) == prompts.prompt_version(
+        prompts.MCPPrompts.get_triage_prompt()
+    )
+    assert prompts.prompt_version(edited) != prompts.prompt_version(triage)
+
+
+class FakePromptClient:
+    def __init__(self):
+        self.version = "v1"
+        self.template = "Hello {name}"
+        self.downloads = 0
+
+    @asynccontextmanager
+    async def session(self, server_name):
+        prompt = SimpleNamespace(name="Greeting", meta={"version": self.version})
+        yield SimpleNamespace(list_prompts=self._list_prompts(prompt))
+
+    @staticmethod
+    def _list_prompts(prompt):
+        async def list_prompts():
+            return SimpleNamespace(prompts=[prompt])
+
+        return list_prompts
+
+    async def get_prompt(self, server_name, prompt_name):
+        self.downloads += 1
+        return [SimpleNamespace(content=json.dumps({"template": self.template}))]
+
+
+def test_registry_downloads_only_changed_prompts():
+    client = FakePromptClient()
+    registry = PromptRegistry(client, "sql", ttl_seconds=0)
+
+    async def run():
+        assert await registry.get_formatted_prompt("Greeting", name="Ada") == "Hello Ada"
+        await registry.refresh("Greeting")
+        assert client.downloads == 1
+
+        client.version, client.template = "v2", "Hi {name}"
+        await registry.refresh("Greeting")
+        assert client.downloads == 2
+        assert await registry.get_formatted_prompt("Greeting", name="Ada") == "Hi Ada"
+
+    asyncio.run(run())
@@ -0,0 +1,88 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+MCP_DIR = Path(__file__).resolve().parent.parent / "mcp"
+spec = importlib.util.spec_from_file_location("query_cache", MCP_DIR / "query_cache.py")
+query_cache = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(query_cache)
+
+
+class FakeConnection:
+    """Answers the ``pg_stat_user_tables`` lookup from a dict of (ins, upd, del, live) counters."""
+
+    def __init__(self, counters):
+        self.counters = counters
+
+    def execute(self, statement, parameters):
+        return [(t, *self.counters[t]) for t in parameters["tables"] if t in self.counters]
+
+
+@pytest.mark.parametrize(
+    "query, tables",
+    [
+        ("SELECT * FROM orders", ["orders"]),
+        ('SELECT * FROM public."Orders" o JOIN customers c ON c.id = o.customer_id', ["Orders", "customers"]),
+        ("SELECT * FROM orders o, customers c WHERE c.id = o.customer_id", ["customers", "orders"]),
+        ("SELECT * FROM orders AS o, public.customers", ["customers", "orders"]),
+        ("SELECT * FROM (SELECT id FROM orders) AS o, customers", ["customers", "orders"]),
+        ("SELECT * FROM customers WHERE id IN (SELECT customer_id FROM orders)", ["customers", "orders"]),
+        ("WITH recent AS (SELECT * FROM orders) SELECT * FROM recent", ["orders"]),
+        ("WITH r(id) AS (SELECT id FROM orders) SELECT * FROM r, customers", ["customers", "orders"]),
+        ("SELECT extract(year FROM created_at) FROM orders", ["orders"]),
+        ("SELECT a IS DISTINCT FROM b FROM orders", ["orders"]),
+        ("SELECT 1", []),
+        ("SELECT * FROM generate_series(1, 10)", None),
+        ("SELECT * FROM orders, generate_series(1, 10)", None),
+    ],
+)  # fmt: skip
+def test_referenced_tables(query, tables):
+    assert query_cache.referenced_tables(query) == tables
+
+
+def test_volatile_functions():
+    assert query_cache.calls_volatile_function("SELECT * FROM orders WHERE day = current_date")
+    assert query_cache.calls_volatile_function("SELECT random() FROM orders")
+    assert not query_cache.calls_volatile_function("SELECT 'now' AS label FROM orders")
+
+
+@pytest.fixture
+def cache():
+    return query_cache.QueryResultCache(ttl_seconds=60, max_entries=10)
+
+
+def test_served_until_a_table_changes(cache):
+    connection = FakeConnection({"orders": (5, 0, 0, 5), "customers": (2, 0, 0, 2)})
+    query = "SELECT * FROM orders o, customers c WHERE c.id = o.customer_id"
+
+    payload, versions = cache.get(connection, query)
+    assert payload is None
+    cache.put(query, {"success": True}, versions)
+    assert cache.get(connection, query)[0]["cached"] is True
+
+    connection.counters["customers"] = (2, 1, 0, 2)
+    assert cache.get(connection, query)[0] is None
+
+
+def test_a_delete_invalidates_the_entry(cache):
+    connection = FakeConnection({"orders": (5, 0, 0, 5)})
+    query = "SELECT count(*) FROM orders"
+    cache.put(query, {"success": True}, cache.get(connection, query)[1])
+
+    # DELETE of two rows: n_tup_del + 2, n_live_tup - 2, the same sum as before.
+    connection.counters["orders"] = (5, 0, 2, 3)
+    assert cache.get(connection, query)[0] is None
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SELECT count(*) FROM orders WHERE created_at > now() - interval '1 day'",
+        "SELECT * FROM monthly_revenue",  # a view, not in pg_stat_user_tables
+        "SELECT * FROM orders, generate_series(1, 3)",
+        "SELECT 1",
+    ],
+)
+def test_uncacheable_queries(cache, query):
+    assert cache.get(FakeConnection({"orders": (1, 0, 0, 1)}), query) == (None, None)
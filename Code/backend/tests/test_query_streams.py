@@ -0,0 +1,63 @@
+import sys
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import StaticPool
+
+from app.utils.mcp_client import MCP_SERVER_PACKAGE, load_mcp_server
+
+load_mcp_server()
+cursors = sys.modules[f"{MCP_SERVER_PACKAGE}.cursors"]
+
+
+@pytest.fixture
+def engine():
+    """SQLite stand-in that records which statements were run through a server-side cursor."""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    engine.statements = []
+
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def record(connection, cursor, statement, parameters, context, executemany):
+        engine.statements.append((statement, context.execution_options.get("stream_results")))
+        if statement.startswith("SET "):
+            statement = "SELECT 1"  # Postgres only
+        return statement, parameters
+
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE t (n INTEGER)"))
+        connection.execute(text("INSERT INTO t VALUES (1), (2), (3)"))
+    engine.statements.clear()
+    return engine
+
+
+def test_only_the_query_uses_a_server_side_cursor(engine):
+    store = cursors.QueryStreamStore(idle_timeout_seconds=60, max_open=2)
+
+    first = store.open(engine, "SELECT n FROM t ORDER BY n", batch_size=2, max_rows=10)
+
+    assert engine.statements == [
+        ("SET TRANSACTION READ ONLY", None),
+        (f"SET LOCAL statement_timeout = {cursors.settings.QUERY_STATEMENT_TIMEOUT_MS}", None),
+        ("SELECT n FROM t ORDER BY n", True),
+    ]
+    assert [row["n"] for row in first["data"]] == [1, 2]
+
+    last = store.fetch(first["stream_id"])
+    assert [row["n"] for row in last["data"]] == [3]
+    assert last["done"] is True
+    assert store.fetch(first["stream_id"]) is None
+
+
+def test_idle_streams_are_closed_in_the_background(engine, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cursors.time, "monotonic", lambda: now[0])
+    store = cursors.QueryStreamStore(idle_timeout_seconds=60, max_open=2)
+
+    stream_id = store.open(engine, "SELECT n FROM t", batch_size=1, max_rows=10)["stream_id"]
+    connection = store._streams[stream_id].connection
+
+    assert store._reaper.is_alive()
+    now[0] += 61
+    store.close_idle()  # what the reaper thread runs every half timeout
+    assert connection.closed
+    assert store.fetch(stream_id) is None
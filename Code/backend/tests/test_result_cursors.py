@@ -0,0 +1,139 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.agent import graph
+from app.api.routes import chat as chat_routes
+from app.services import result_cursors as cursors_module
+from app.services.result_cursors import ResultCursors
+
+
+class FakeStreamServer:
+    """``Open Query Stream`` and ``Fetch Query Batch`` over a fixed list of rows."""
+
+    def __init__(self, rows, batch_size):
+        self.rows = rows
+        self.batch_size = batch_size
+        self.offset = 0
+
+    def page(self):
+        data = self.rows[self.offset : self.offset + self.batch_size]
+        self.offset += len(data)
+        return {
+            "success": True,
+            "stream_id": "s1",
+            "columns": ["n"],
+            "data": data,
+            "row_count": len(data),
+            "done": self.offset >= len(self.rows),
+        }
+
+    async def open(self, arguments):
+        return json.dumps(self.page())
+
+    async def fetch(self, arguments):
+        assert arguments == {"stream_id": "s1"}
+        return json.dumps(self.page())
+
+
+@pytest.fixture
+def cursors(monkeypatch):
+    cursors = ResultCursors(idle_timeout_seconds=60)
+    monkeypatch.setattr(graph, "result_cursors", cursors)
+    monkeypatch.setattr(chat_routes, "result_cursors", cursors)
+    return cursors
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FakeStreamServer([{"n": i} for i in range(5)], batch_size=2)
+
+    async def get(name):
+        assert name == "Fetch Query Batch"
+        return SimpleNamespace(arun=server.fetch)
+
+    monkeypatch.setattr(chat_routes.app_state, "tool_registry", SimpleNamespace(get=get))
+    return server
+
+
+def open_pages(server, user_id="alice"):
+    config = {"configurable": {"user_id": user_id}}
+    tool = SimpleNamespace(arun=server.open)
+    return asyncio.run(graph.open_result_pages(tool, "SELECT n FROM t", config))
+
+
+def next_page(cursor, user_id="alice"):
+    return asyncio.run(chat_routes.chat_results(cursor, user={"sub": user_id}))
+
+
+def test_pages_follow_the_cursor_until_the_last_one(cursors, server):
+    first = open_pages(server)
+    assert [row["n"] for row in first["data"]] == [0, 1]
+
+    second = next_page(first["cursor"])
+    assert [row["n"] for row in second.data] == [2, 3]
+    assert second.next_cursor == first["cursor"]
+    assert second.query == "SELECT n FROM t"
+
+    last = next_page(second.next_cursor)
+    assert [row["n"] for row in last.data] == [4]
+    assert last.next_cursor is None
+
+    with pytest.raises(HTTPException) as raised:
+        next_page(first["cursor"])
+    assert raised.value.status_code == 404
+
+
+def test_cursor_of_another_user_is_not_found(cursors, server):
+    cursor = open_pages(server, user_id="alice")["cursor"]
+
+    with pytest.raises(HTTPException) as raised:
+        next_page(cursor, user_id="mallory")
+    assert raised.value.status_code == 404
+    # The owner can still use it.
+    assert [row["n"] for row in next_page(cursor).data] == [2, 3]
+
+
+def test_unused_cursors_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cursors_module.time, "monotonic", lambda: now[0])
+    cursors = ResultCursors(idle_timeout_seconds=60)
+    token = cursors.create("alice", "s1", "SELECT 1", ["n"])
+
+    now[0] += 59
+    assert cursors.get(token, "alice")["stream_id"] == "s1"
+    now[0] += 59
+    assert cursors.get(token, "alice") is not None
+    now[0] += 61
+    assert cursors.get(token, "alice") is None
+
+
+def test_streams_of_expired_cursors_are_closed(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cursors_module.time, "monotonic", lambda: now[0])
+    closed = []
+
+    async def close(arguments):
+        closed.append(arguments["stream_id"])
+        return json.dumps({"success": True, "closed": True})
+
+    async def get(name):
+        assert name == "Close Query Stream"
+        return SimpleNamespace(arun=close)
+
+    monkeypatch.setattr(cursors_module.app_state, "tool_registry", SimpleNamespace(get=get))
+    cursors = ResultCursors(idle_timeout_seconds=60)
+    cursors.create("alice", "s1", "SELECT 1", ["n"])
+    cursors.create("alice", "s2", "SELECT 2", ["n"])
+
+    now[0] += 30
+    asyncio.run(cursors.reap())
+    assert closed == []
+
+    now[0] += 31
+    asyncio.run(cursors.reap())
+    asyncio.run(cursors.reap())
+    assert sorted(closed) == ["s1", "s2"]
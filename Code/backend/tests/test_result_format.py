@@ -0,0 +1,56 @@
+import pytest
+
+from app.core.result_format import COLUMNAR, ROWS, QueryResult, encode_result, to_columnar
+
+COLUMNS = ["customer", "revenue"]
+ROW_TUPLES = [("Ada", 30), ("Grace", 20), ("Linus", None)]
+ROW_DICTS = [dict(zip(COLUMNS, row)) for row in ROW_TUPLES]
+
+
+def payload():
+    return {
+        "success": True,
+        "columns": COLUMNS,
+        "values": to_columnar(COLUMNS, ROW_TUPLES),
+        "row_count": 3,
+    }
+
+
+def test_to_columnar():
+    assert to_columnar(COLUMNS, ROW_TUPLES) == [["Ada", "Grace", "Linus"], [30, 20, None]]
+    assert to_columnar(COLUMNS, []) == [[], []]
+
+
+def test_rows_format_restores_the_row_dicts():
+    encoded = encode_result(payload(), ROWS)
+
+    assert encoded["format"] == ROWS
+    assert encoded["data"] == ROW_DICTS
+    assert "values" not in encoded
+    assert encoded["row_count"] == 3
+
+
+def test_columnar_format_keeps_the_values():
+    encoded = encode_result(payload(), COLUMNAR)
+
+    assert encoded["format"] == COLUMNAR
+    assert encoded["values"] == [["Ada", "Grace", "Linus"], [30, 20, None]]
+
+
+@pytest.mark.parametrize("result_format", [ROWS, COLUMNAR])
+def test_query_result_reads_both_formats_alike(result_format):
+    result = QueryResult(encode_result(payload(), result_format))
+
+    assert len(result) == 3
+    assert result.columns == COLUMNS
+    assert result.rows == ROW_DICTS
+    assert list(result) == ROW_DICTS
+    assert result.column("revenue") == [30, 20, None]
+    assert result.as_columns() == {"customer": ["Ada", "Grace", "Linus"], "revenue": [30, 20, None]}
+    assert QueryResult(result.encoded).rows == ROW_DICTS
+
+
+def test_query_result_of_a_row_list_or_nothing():
+    assert QueryResult(ROW_DICTS).column("customer") == ["Ada", "Grace", "Linus"]
+    assert not QueryResult(None)
+    assert QueryResult([]).columns == []
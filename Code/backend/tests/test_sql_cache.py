@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from app.services import sql_cache
+from app.services.sql_cache import (
+    InMemorySQLCache,
+    SchemaFingerprint,
+    SemanticSQLCache,
+    question_literals,
+)
+
+
+class FakeEmbeddings:
+    """Every question embeds to the same vector, so only the filters decide a hit."""
+
+    async def aembed_query(self, text):
+        return [1.0, 0.0, 0.0]
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(sql_cache, "default_embeddings", FakeEmbeddings())
+    schema = {"value": "orders(id, amount)"}
+
+    async def load_schema():
+        return schema["value"]
+
+    cache = InMemorySQLCache(SchemaFingerprint(load_schema, ttl_seconds=0), 0.95, max_entries=2)
+    cache.schema = schema
+    return cache
+
+
+def test_question_literals():
+    assert question_literals("top 10 customers by revenue") == "10"
+    assert question_literals("orders since 2024-01-01 in 'Berlin'") == "2024-01-01|'berlin'"
+    assert question_literals("how many customers do we have?") == ""
+
+
+def test_hit_requires_identical_literals(cache):
+    async def run():
+        await cache.store("top 5 customers by revenue", "SELECT ... LIMIT 5")
+        assert (await cache.lookup("top 5 customers by revenue"))["status"] == "hit"
+        assert (await cache.lookup("top 10 customers by revenue"))["status"] == "miss"
+
+    asyncio.run(run())
+
+
+def test_schema_change_invalidates(cache):
+    async def run():
+        await cache.store("total revenue", "SELECT sum(amount) FROM orders")
+        cache.schema["value"] = "orders(id, amount, status)"
+        assert (await cache.lookup("total revenue"))["status"] == "miss"
+
+    asyncio.run(run())
+
+
+def test_in_memory_cache_is_bounded(cache):
+    async def run():
+        for year in (2021, 2022, 2023):
+            await cache.store(f"revenue in {year}", f"SELECT {year}")
+        assert len(cache._entries) == 2
+        assert (await cache.lookup("revenue in 2021"))["status"] == "miss"
+        assert (await cache.lookup("revenue in 2023"))["sql"] == "SELECT 2023"
+
+    asyncio.run(run())
+
+
+def test_backends_must_implement_storage():
+    with pytest.raises(TypeError):
+        SemanticSQLCache(SchemaFingerprint(None, 0), 0.95)
@@ -0,0 +1,134 @@
+import asyncio
+from types import SimpleNamespace
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from app.agent import graph
+
+
+class FakeLLM:
+    """Candidate 0 answers at once, the others only after a long time."""
+
+    def __init__(self):
+        self.cancelled = []
+
+    def bind(self, temperature, **kwargs):
+        return SimpleNamespace(ainvoke=lambda messages: self.answer(temperature))
+
+    async def answer(self, temperature):
+        index = round((temperature - graph.settings.LLM_TEMPERATURE) / 0.3)
+        if index > 0:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                self.cancelled.append(index)
+                raise
+        return SimpleNamespace(content=f"SELECT {index}")
+
+
+def test_losing_candidates_are_cancelled_and_awaited(monkeypatch):
+    fake_llm = FakeLLM()
+    monkeypatch.setattr(graph, "llm", fake_llm)
+    monkeypatch.setattr(graph.settings, "SQL_CANDIDATES", 3)
+    monkeypatch.setattr(graph.settings, "SQL_CANDIDATE_CONCURRENCY", 3)
+    monkeypatch.setattr(graph.settings, "LLM_TEMPERATURE", 0.0)
+
+    async def validate(sql):
+        return {"valid": True, "query": sql}
+
+    monkeypatch.setattr(graph, "validate_generated_sql", validate)
+
+    async def run():
+        sql, validation, stats = await graph.generate_sql_candidates([])
+        # The losers have finished cancelling before the node moves on.
+        assert sorted(fake_llm.cancelled) == [1, 2]
+        return sql, validation, stats
+
+    sql, validation, stats = asyncio.run(run())
+    assert sql == "SELECT 0"
+    assert validation["valid"] is True
+    assert stats["selected"] == 0
+
+
+def test_sql_cache_hit_clears_the_previous_validation(monkeypatch):
+    async def lookup(question):
+        return {"status": "hit", "question": question, "sql": "SELECT count(*) FROM orders"}
+
+    monkeypatch.setattr(graph, "sql_cache", SimpleNamespace(lookup=lookup))
+    monkeypatch.setattr(
+        graph.app_state,
+        "memory_tools",
+        SimpleNamespace(
+            save_semantic_memory=lambda **kwargs: None,
+            save_episodic_memory=lambda **kwargs: None,
+        ),
+    )
+    state = {
+        "messages": [HumanMessage(content="how many orders?")],
+        "generated_sql": "SELECT count(*) FROM orders",
+        "valid_sql": {"valid": True, "query": "SELECT count(*) FROM orders"},
+        "execution_result": {"validated_sql": "SELECT count(*) FROM orders", "data": [[1]]},
+    }
+
+    result = asyncio.run(graph.generate_sql_node(state, {"configurable": {"thread_id": "t1"}}))
+
+    assert result["generated_sql"] == "SELECT count(*) FROM orders"
+    assert result["valid_sql"] is None
+    assert result["execution_result"] is None
+
+
+class PromptRecorder:
+    def __init__(self, answer):
+        self.answer = answer
+        self.prompts = []
+
+    async def ainvoke(self, messages):
+        self.prompts.append(messages[0].content)
+        return SimpleNamespace(content=self.answer)
+
+
+def retry_state(**values):
+    return {
+        "messages": [HumanMessage(content="how many orders?"), AIMessage(content="SELECT x")],
+        "question": "how many orders?",
+        "generated_sql": "SELECT x FROM orders",
+        "valid_sql": {"valid": False, "error": 'column "x" does not exist'},
+        **values,
+    }
+
+
+def test_retry_reuses_the_question_and_schema_context(monkeypatch):
+    recorder = PromptRecorder("SELECT count(*) FROM orders")
+    monkeypatch.setattr(graph, "streaming_llm", recorder)
+
+    async def prefetch_sql_context(question, config=None):
+        raise AssertionError("the context is already in state")
+
+    monkeypatch.setattr(graph, "prefetch_sql_context", prefetch_sql_context)
+    context = {"relevant_schema": "orders(id, total)", "all_tables": "orders"}
+
+    result = asyncio.run(graph.retry_generate_sql_node(retry_state(sql_context=context), {}))
+
+    (prompt,) = recorder.prompts
+    assert "PREVIOUS QUERY: SELECT x FROM orders" in prompt
+    assert "orders(id, total)" in prompt
+    assert "how many orders?" in prompt
+    assert result["generated_sql"] == "SELECT count(*) FROM orders"
+    assert result["sql_context"] == context
+    assert result["retry_count"] == 1
+
+
+def test_retry_after_a_cache_hit_fetches_the_context_for_the_question(monkeypatch):
+    monkeypatch.setattr(graph, "streaming_llm", PromptRecorder("SELECT 1"))
+    questions = []
+
+    async def prefetch_sql_context(question, config=None):
+        questions.append(question)
+        return {"relevant_schema": "orders(id)", "all_tables": "orders"}
+
+    monkeypatch.setattr(graph, "prefetch_sql_context", prefetch_sql_context)
+
+    result = asyncio.run(graph.retry_generate_sql_node(retry_state(sql_context=None), {}))
+
+    assert questions == ["how many orders?"]
+    assert result["sql_context"] == {"relevant_schema": "orders(id)", "all_tables": "orders"}
@@ -0,0 +1,105 @@
+from app.services.sql_repair import edit_distance, parse_identifier_error, repair_sql
+
+TABLES = {
+    "orders": {
+        "column_names": ["id", "customer_id", "total_amount", "created_at"],
+        "foreign_keys": [
+            {"constrained_columns": ["customer_id"], "referred_table": "customers"},
+        ],
+    },
+    "customers": {"column_names": ["id", "name", "country"], "foreign_keys": []},
+    "order_items": {"column_names": ["order_id", "quantity"], "foreign_keys": []},
+}
+
+
+def test_edit_distance():
+    assert edit_distance("total_amout", "total_amount") == 1
+    assert edit_distance("", "abc") == 3
+
+
+def test_parse_identifier_error():
+    assert parse_identifier_error("column o.totl does not exist") == {
+        "kind": "column",
+        "name": "totl",
+        "qualifier": "o",
+        "hint": None,
+    }
+    assert parse_identifier_error('relation "public.ordrs" does not exist')["name"] == "ordrs"
+    assert parse_identifier_error("division by zero") is None
+
+
+def test_misspelled_column_is_fixed_by_edit_distance():
+    repair = repair_sql(
+        "SELECT sum(o.total_amout) FROM orders o",
+        "column o.total_amout does not exist",
+        TABLES,
+    )
+
+    assert repair["sql"] == "SELECT sum(o.total_amount) FROM orders o"
+    assert (repair["kind"], repair["original"], repair["replacement"]) == (
+        "column",
+        "total_amout",
+        "total_amount",
+    )
+
+
+def test_postgres_hint_wins():
+    repair = repair_sql(
+        "SELECT createdat FROM orders",
+        'column "createdat" does not exist\nHINT: Perhaps you meant to reference the column '
+        '"orders.created_at".',
+        TABLES,
+    )
+
+    assert repair["sql"] == "SELECT created_at FROM orders"
+
+
+def test_foreign_key_named_after_the_referenced_table():
+    repair = repair_sql(
+        "SELECT customer, count(*) FROM orders GROUP BY customer",
+        'column "customer" does not exist',
+        TABLES,
+    )
+
+    assert repair["sql"] == "SELECT customer_id, count(*) FROM orders GROUP BY customer_id"
+
+
+def test_misspelled_table():
+    repair = repair_sql("SELECT id FROM ordrs", 'relation "ordrs" does not exist', TABLES)
+
+    assert repair["sql"] == "SELECT id FROM orders"
+
+
+def test_misspelled_table_name_used_as_a_column_or_alias_is_kept():
+    error = 'relation "ordrs" does not exist'
+    repair = repair_sql(
+        "SELECT ordrs.id, c.ordrs FROM ordrs JOIN customers c ON c.id = ordrs.customer_id",
+        error,
+        TABLES,
+    )
+    assert repair["sql"] == (
+        "SELECT orders.id, c.ordrs FROM orders JOIN customers c ON c.id = orders.customer_id"
+    )
+
+    repair = repair_sql(
+        "SELECT ordrs.name FROM ordrs AS o JOIN customers AS ordrs ON ordrs.id = o.customer_id",
+        error,
+        TABLES,
+    )
+    assert repair["sql"] == (
+        "SELECT ordrs.name FROM orders AS o JOIN customers AS ordrs ON ordrs.id = o.customer_id"
+    )
+
+
+def test_ambiguous_or_distant_names_are_left_to_the_llm():
+    assert repair_sql("SELECT xyz FROM orders", 'column "xyz" does not exist', TABLES) is None
+    # Both tables in scope have an "id", so the repaired query would be ambiguous.
+    assert (
+        repair_sql(
+            "SELECT ix FROM orders JOIN customers ON true",
+            'column "ix" does not exist',
+            TABLES,
+        )
+        is None
+    )
+    assert repair_sql("SELECT 1/0", "division by zero", TABLES) is None
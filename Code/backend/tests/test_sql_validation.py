@@ -0,0 +1,103 @@
+import pytest
+
+from app.services.schema_catalog import validate_sql_locally
+from app.utils.sql_parser import analyze_sql
+
+TABLES = {
+    "orders": {
+        "kind": "table",
+        "column_names": ["id", "customer_id", "amount", "status", "created_at"],
+    },
+    "customers": {"kind": "table", "column_names": ["id", "name", "region"]},
+    "monthly_revenue": {"kind": "view", "column_names": ["month", "revenue"]},
+}
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        # Window frames
+        "SELECT id, sum(amount) OVER (ORDER BY created_at ROWS BETWEEN UNBOUNDED PRECEDING "
+        "AND CURRENT ROW) AS running FROM orders",
+        "SELECT id, avg(amount) OVER (PARTITION BY customer_id ORDER BY created_at "
+        "RANGE BETWEEN INTERVAL '7 days' PRECEDING AND CURRENT ROW EXCLUDE NO OTHERS) FROM orders",
+        "SELECT id, rank() OVER w FROM orders WINDOW w AS (ORDER BY amount DESC)",
+        # Grouping sets
+        "SELECT status, customer_id, sum(amount) FROM orders "
+        "GROUP BY GROUPING SETS ((status), (customer_id), ())",
+        "SELECT status, sum(amount) FROM orders GROUP BY ROLLUP (status)",
+        "SELECT status, GROUPING(status), sum(amount) FROM orders GROUP BY CUBE (status)",
+        # Collations
+        'SELECT name FROM customers ORDER BY name COLLATE "C"',
+        'SELECT c.name COLLATE "en_US" AS name FROM customers c',
+        # CTEs
+        "WITH big AS (SELECT * FROM orders WHERE amount > 100) SELECT big.id, big.total FROM big",
+        "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 5) "
+        "SELECT x FROM n",
+        # Views
+        "SELECT month, revenue FROM monthly_revenue ORDER BY month",
+        "SELECT v.month, v.revenue FROM monthly_revenue v",
+        # Output aliases and unqualified names are left to Postgres
+        "SELECT amount * 2 AS doubled FROM orders ORDER BY doubled",
+        "SELECT extract(year FROM created_at) AS year FROM orders",
+        # System catalogs and columns
+        "SELECT tablename FROM pg_tables",
+        "SELECT o.ctid, o.id FROM orders o",
+        # Subqueries and CTEs named like a table
+        "SELECT orders.total FROM (SELECT customer_id, sum(amount) AS total FROM orders "
+        "GROUP BY customer_id) orders",
+        "WITH orders AS (SELECT 1 AS total) SELECT orders.total FROM orders",
+        # Tables of other schemas on the search path
+        "SELECT * FROM order_items",
+        "SELECT i.sku FROM order_items i JOIN orders o ON o.id = i.order_id",
+        # A qualifier bound to different tables in different scopes
+        "SELECT t.id FROM orders t WHERE EXISTS (SELECT 1 FROM customers t WHERE t.region = 'EU')",
+    ],
+)
+def test_valid_queries_pass(query):
+    assert validate_sql_locally(query, TABLES) is None
+
+
+def test_unknown_table_is_rejected_with_the_closest_names():
+    tables = {**TABLES, **{f"audit_{i}": {"column_names": ["id"]} for i in range(100)}}
+
+    result = validate_sql_locally("SELECT * FROM public.ordrs", tables)
+
+    assert result["valid"] is False
+    assert result["error_type"] == "UndefinedTable"
+    assert result["error"] == 'relation "ordrs" does not exist. Similar tables: orders'
+
+
+def test_unknown_qualified_column_is_rejected():
+    result = validate_sql_locally(
+        "SELECT o.total FROM orders o JOIN customers c ON c.id = o.customer_id", TABLES
+    )
+    assert result["error_type"] == "UndefinedColumn"
+    assert result["error"].startswith("column o.total does not exist")
+
+
+def test_non_select_statements_are_not_checked():
+    assert validate_sql_locally("DELETE FROM nowhere", TABLES) is None
+
+
+def test_analyze_window_frame_has_no_keyword_columns():
+    structure = analyze_sql(
+        "SELECT sum(amount) OVER (ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW) FROM orders"
+    )
+    assert {c.name for c in structure.columns} == {"amount"}
+
+
+def test_analyze_grouping_sets_and_collation():
+    structure = analyze_sql(
+        'SELECT status FROM orders GROUP BY GROUPING SETS ((status)) ORDER BY status COLLATE "C"'
+    )
+    assert {c.name for c in structure.columns} == {"status"}
+
+
+def test_analyze_cte_and_aliases():
+    structure = analyze_sql(
+        "WITH recent AS (SELECT id FROM orders) SELECT r.id AS order_id FROM recent r"
+    )
+    assert structure.cte_names == {"recent"}
+    assert [t.name for t in structure.tables] == ["orders", "recent"]
+    assert "order_id" in structure.aliases
@@ -0,0 +1,133 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from langchain_core.messages import AIMessageChunk
+
+from app.utils import util
+from app.utils.util import LLM_STREAM_TAG, Util
+
+
+def use_events(monkeypatch, events):
+    seen = {}
+
+    async def astream_events(graph_input, config, version, include_names, include_tags):
+        seen.update(include_names=include_names, include_tags=include_tags)
+        for event in events:
+            yield event
+
+    monkeypatch.setattr(util.app_state, "graph", SimpleNamespace(astream_events=astream_events))
+    monkeypatch.setattr(util.app_state, "langfuse_handler", None)
+    return seen
+
+
+def stream(request=None):
+    config = {"configurable": {"thread_id": "t1", "user_id": "alice"}}
+
+    async def collect():
+        return [event async for event in Util.stream_generator(["orders?"], config, request)]
+
+    return [json.loads(event.removeprefix("data: ")) for event in asyncio.run(collect())]
+
+
+def token(text, node):
+    return {
+        "event": "on_chat_model_stream",
+        "name": "ChatOpenAI",
+        "data": {"chunk": AIMessageChunk(content=text)},
+        "metadata": {"langgraph_node": node},
+    }
+
+
+def test_tagged_llm_tokens_are_streamed_with_their_node(monkeypatch):
+    seen = use_events(
+        monkeypatch,
+        [
+            {"event": "on_chat_model_start", "name": "ChatOpenAI", "data": {}},
+            token("SELECT", "generate_sql"),
+            token(" 1", "generate_sql"),
+            {"event": "on_chat_model_end", "name": "ChatOpenAI", "data": {}},
+        ],
+    )
+
+    events = stream()
+
+    assert seen["include_tags"] == [LLM_STREAM_TAG]
+    assert [(e["stage"], e["node"]) for e in events] == [(LLM_STREAM_TAG, "generate_sql")] * 2
+    assert [e["chunk"]["content"] for e in events] == ["SELECT", " 1"]
+
+
+def test_stream_stops_when_the_client_disconnects(monkeypatch):
+    use_events(monkeypatch, [token("a", "summarize"), token("b", "summarize")])
+    checks = []
+
+    async def is_disconnected():
+        checks.append(True)
+        return len(checks) > 1
+
+    events = stream(SimpleNamespace(is_disconnected=is_disconnected))
+
+    assert [e["chunk"]["content"] for e in events] == ["a"]
+
+
+def test_sql_and_summary_calls_are_tagged_for_streaming():
+    from app.agent import graph
+
+    assert graph.streaming_llm.config["tags"] == [LLM_STREAM_TAG]
+
+
+def execute_sql_end(output):
+    return {"event": "on_chain_end", "name": "execute_sql", "data": {"output": output}}
+
+
+def test_rows_are_sent_when_execute_sql_ends(monkeypatch):
+    use_events(
+        monkeypatch,
+        [
+            execute_sql_end(
+                {
+                    "generated_sql": "SELECT n FROM t",
+                    "results": [{"n": 1}],
+                    "execution_result": {"cursor": "abc"},
+                    "messages": ["not sent"],
+                }
+            )
+        ],
+    )
+
+    (event,) = stream()
+
+    assert event["stage"] == "execute_sql"
+    assert event["result"] == {
+        "input": {"query": "SELECT n FROM t"},
+        "output": [{"n": 1}],
+        "streamed": False,
+        "next_cursor": "abc",
+    }
+
+
+def test_streamed_rows_are_not_sent_again(monkeypatch):
+    use_events(
+        monkeypatch,
+        [
+            execute_sql_end(
+                {
+                    "generated_sql": "SELECT n FROM t",
+                    "results": [{"n": 1}],
+                    "execution_result": {"streamed": True},
+                }
+            )
+        ],
+    )
+
+    (event,) = stream()
+
+    assert event["result"]["output"] == []
+    assert event["result"]["streamed"] is True
+
+
+def test_summary_runs_only_when_there_are_rows():
+    from app.agent import graph
+
+    assert graph.route_after_execution({"results": [{"n": 1}]}) == "summarize"
+    assert graph.route_after_execution({"results": []}) == "END"
@@ -0,0 +1,84 @@
+import asyncio
+import json
+
+import pytest
+
+from app.agent import graph
+
+
+class FakeTool:
+    def __init__(self, responses):
+        self.responses = iter(responses)
+        self.calls = []
+
+    async def arun(self, args):
+        self.calls.append(args)
+        return json.dumps(next(self.responses))
+
+
+class FakeRegistry:
+    def __init__(self, tools):
+        self.tools = tools
+
+    async def get(self, name):
+        return self.tools.get(name)
+
+
+def batch(start, count, done, stream_id="s1"):
+    return {
+        "success": True,
+        "stream_id": None if done else stream_id,
+        "columns": ["id"],
+        "data": [{"id": i} for i in range(start, start + count)],
+        "done": done,
+        "truncated": False,
+    }
+
+
+@pytest.fixture
+def events(monkeypatch):
+    dispatched = []
+
+    async def dispatch(name, data, config=None):
+        dispatched.append(data)
+
+    monkeypatch.setattr(graph, "adispatch_custom_event", dispatch)
+    monkeypatch.setattr(graph.settings, "QUERY_STATE_SAMPLE_ROWS", 5)
+    return dispatched
+
+
+def test_streams_every_row_but_keeps_a_sample(monkeypatch, events):
+    fetch = FakeTool([batch(4, 4, False), batch(8, 2, True)])
+    monkeypatch.setattr(
+        graph.app_state, "tool_registry", FakeRegistry({"Fetch Query Batch": fetch})
+    )
+    open_stream = FakeTool([batch(0, 4, False)])
+
+    result = asyncio.run(graph.stream_query(open_stream, "SELECT id FROM t", {}))
+
+    assert [row["id"] for event in events for row in event["rows"]] == list(range(10))
+    assert [row["id"] for row in result["data"]] == list(range(5))
+    assert result["row_count"] == 10
+    assert result["sampled"] is True
+    assert result["truncated"] is False
+    assert fetch.calls == [{"stream_id": "s1"}, {"stream_id": "s1"}]
+
+
+def test_small_result_is_kept_whole(monkeypatch, events):
+    monkeypatch.setattr(graph.app_state, "tool_registry", FakeRegistry({}))
+    open_stream = FakeTool([batch(0, 3, True)])
+
+    result = asyncio.run(graph.stream_query(open_stream, "SELECT id FROM t", {}))
+
+    assert result["row_count"] == 3
+    assert result["sampled"] is False
+    assert len(events) == 1 and events[0]["done"] is True
+
+
+def test_failed_open_is_returned_as_is(monkeypatch, events):
+    error = {"success": False, "error": "relation does not exist"}
+
+    result = asyncio.run(graph.stream_query(FakeTool([error]), "SELECT 1 FROM missing", {}))
+
+    assert result == error
+    assert events == []
@@ -0,0 +1,53 @@
+import asyncio
+
+from app.agent.graph import describe_results
+from app.core.result_format import QueryResult, to_columnar
+
+
+def ranking(count):
+    return [{"customer": f"Customer {i}", "revenue": 1000 - i} for i in range(count)]
+
+
+def test_small_results_are_shown_whole():
+    description = asyncio.run(describe_results(QueryResult(ranking(3)), sample_rows=5))
+
+    assert description.startswith("All rows:")
+    assert "profile" not in description
+    assert '"customer": "Customer 2"' in description
+
+
+def test_large_results_get_profile_and_first_rows():
+    description = asyncio.run(describe_results(QueryResult(ranking(50)), sample_rows=5))
+
+    profile, rows = description.split("First 5 rows, in query order:")
+    assert profile.startswith("Column profile computed over all rows:")
+    assert "revenue" in profile
+    # The ranking keeps each name next to its value.
+    assert '"customer": "Customer 0",\n    "revenue": 1000' in rows
+    assert "Customer 5" not in rows
+
+
+def test_columnar_results():
+    columns = ["customer", "revenue"]
+    result = QueryResult(
+        {
+            "format": "columnar",
+            "columns": columns,
+            "values": to_columnar(columns, [(r["customer"], r["revenue"]) for r in ranking(8)]),
+        }
+    )
+
+    description = asyncio.run(describe_results(result, sample_rows=2))
+
+    assert '"customer": "Customer 1"' in description
+    assert "Customer 2" not in description.split("in query order:")[1]
+
+
+def test_profile_of_a_sample_says_which_rows_it_covers():
+    description = asyncio.run(
+        describe_results(QueryResult(ranking(50)), sample_rows=5, complete=False)
+    )
+    assert description.startswith("Column profile computed over the first 50 rows only:")
+
+    page = asyncio.run(describe_results(QueryResult(ranking(3)), sample_rows=5, complete=False))
+    assert page.startswith("First 3 rows:")
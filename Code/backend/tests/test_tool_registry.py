@@ -0,0 +1,56 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.utils.util import ToolRegistry
+
+
+class FakeClient:
+    def __init__(self, names):
+        self.names = names
+        self.calls = 0
+
+    async def get_tools(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return [SimpleNamespace(name=name) for name in self.names]
+
+
+def test_tools_are_listed_once_for_concurrent_lookups():
+    client = FakeClient(["Execute Query", "List Tables"])
+    registry = ToolRegistry(client)
+
+    async def run():
+        return await asyncio.gather(*(registry.get("Execute Query") for _ in range(5)))
+
+    tools = asyncio.run(run())
+
+    assert {tool.name for tool in tools} == {"Execute Query"}
+    assert client.calls == 1
+    assert asyncio.run(registry.get("Missing")) is None
+    assert registry.stats()["saved_list_calls"] == 1
+
+
+def test_refresh_picks_up_new_tools():
+    client = FakeClient(["Execute Query"])
+    registry = ToolRegistry(client)
+    asyncio.run(registry.get("Execute Query"))
+
+    client.names = ["Execute Query", "Validate SQL"]
+    asyncio.run(registry.refresh())
+
+    assert asyncio.run(registry.get("Validate SQL")).name == "Validate SQL"
+    assert client.calls == 2
+
+
+def test_failed_warm_up_loads_on_first_use():
+    client = FakeClient(["Execute Query"])
+
+    async def unavailable():
+        raise ConnectionError("MCP server down")
+
+    registry = ToolRegistry(SimpleNamespace(get_tools=unavailable))
+    asyncio.run(registry.warm())
+    assert registry.loaded_at is None
+
+    registry.client = client
+    assert asyncio.run(registry.get("Execute Query")).name == "Execute Query"
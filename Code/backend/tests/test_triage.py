@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from app.services.triage import FOLLOW_UP, MODIFICATION, PreTriageClassifier
+
+classifier = PreTriageClassifier(use_embeddings=False)
+
+
+def classify(message: str) -> dict:
+    return asyncio.run(classifier.classify(message))
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "Drop-off rate by region last month",
+        "delete rate of accounts per month",
+        "Insert rate trend",
+        "Purge history: which jobs ran last night",
+        "how many rows did we insert into the orders table last week?",
+        "create index usage stats",
+        "update on set top boxes sold",
+        "Truncate decimals in the revenue report",
+        "which tables were altered last week?",
+    ],
+)
+def test_read_only_questions_fall_through_to_the_llm(message):
+    result = classify(message)
+    assert result["decision"] is None
+    assert result["method"] is None
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "DELETE FROM orders WHERE id = 5",
+        "delete from customers",
+        "please drop table users",
+        "DROP TABLE IF EXISTS audit_log;",
+        "INSERT INTO products (name) VALUES ('widget')",
+        "update users set email = 'a@b.c' where id = 1",
+        "truncate table sales",
+        "ALTER TABLE orders ADD COLUMN note text",
+        "create table invoices (id serial primary key)",
+        "CREATE UNIQUE INDEX idx_email ON users (email)",
+        "grant select on orders to analyst",
+    ],
+)
+def test_write_statements_take_the_fast_path(message):
+    result = classify(message)
+    assert result["decision"] == MODIFICATION
+    assert result["method"] == "rules"
+
+
+@pytest.mark.parametrize("message", ["hi", "Hello there!", "thanks so much", "good morning :)"])
+def test_greetings_take_the_fast_path(message):
+    assert classify(message)["decision"] == FOLLOW_UP
+
+
+def test_questions_are_left_to_the_llm():
+    assert classify("how many customers do we have?")["decision"] is None
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import sys
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import ProgrammingError
+
+from app.agent import graph
+from app.utils.mcp_client import MCP_SERVER_PACKAGE, load_mcp_server
+
+SQL = "SELECT n FROM t"
+
+
+class FakeTools:
+    def __init__(self, validate_and_execute):
+        self.validate_and_execute = validate_and_execute
+        self.calls = []
+
+    async def get(self, name):
+        async def arun(arguments):
+            self.calls.append(name)
+            if name == "Validate and Execute":
+                return json.dumps(self.validate_and_execute)
+            raise AssertionError(f"{name} should not be called")
+
+        return SimpleNamespace(arun=arun)
+
+
+@pytest.fixture
+def combined(monkeypatch):
+    monkeypatch.setattr(graph.settings, "COMBINED_VALIDATE_EXECUTE", True)
+    monkeypatch.setattr(graph.settings, "QUERY_STREAMING", False)
+    monkeypatch.setattr(graph.settings, "QUERY_PAGINATION", False)
+    monkeypatch.setattr(graph.settings, "LOCAL_SQL_VALIDATION", False)
+    monkeypatch.setattr(graph, "sql_cache", None)
+
+    def use(result):
+        tools = FakeTools(result)
+        monkeypatch.setattr(graph.app_state, "tool_registry", tools)
+        return tools
+
+    return use
+
+
+def test_rows_from_the_validation_are_reused(combined):
+    tools = combined(
+        {"valid": True, "success": True, "data": [{"n": 1}], "columns": ["n"], "row_count": 1}
+    )
+
+    async def run():
+        state = await graph.sql_validation_node({"generated_sql": SQL}, {})
+        return state, await graph.execute_sql_node(state, {})
+
+    validated, executed = asyncio.run(run())
+
+    assert validated["valid_sql"] == {"valid": True, "query": SQL, "message": "SQL query is valid"}
+    assert validated["execution_result"]["validated_sql"] == SQL
+    assert executed["results"] == [{"n": 1}]
+    assert tools.calls == ["Validate and Execute"]
+
+
+def test_invalid_sql_is_reported_without_rows(combined):
+    combined(
+        {"valid": False, "error": 'column "x" does not exist', "error_type": "ProgrammingError"}
+    )
+
+    state = asyncio.run(graph.sql_validation_node({"generated_sql": SQL}, {}))
+
+    assert state["valid_sql"]["valid"] is False
+    assert state["valid_sql"]["error"] == 'column "x" does not exist'
+    assert state["execution_result"] is None
+
+
+def test_local_validation_runs_before_the_round_trip(combined, monkeypatch):
+    tools = combined({"valid": True, "success": True, "data": []})
+
+    async def validate_locally(sql):
+        return {"valid": False, "error": 'relation "t" does not exist', "query": sql}
+
+    monkeypatch.setattr(graph, "validate_locally", validate_locally)
+
+    state = asyncio.run(graph.sql_validation_node({"generated_sql": SQL}, {}))
+
+    assert state["valid_sql"]["valid"] is False
+    assert tools.calls == []
+
+
+class FailingEngine:
+    def __init__(self, sqlstate):
+        self.sqlstate = sqlstate
+
+    def connect(self):
+        raise ProgrammingError("SELECT", {}, SimpleNamespace(sqlstate=self.sqlstate))
+
+
+@pytest.mark.parametrize("sqlstate, valid", [("42703", False), ("57014", True)])
+def test_only_parse_and_plan_errors_make_the_sql_invalid(monkeypatch, sqlstate, valid):
+    load_mcp_server()
+    tools = sys.modules[f"{MCP_SERVER_PACKAGE}.tools"]
+    monkeypatch.setattr(tools.MCPResources, "get_engine", lambda: FailingEngine(sqlstate))
+
+    result = tools.MCPTools.validate_and_execute(SQL)
+
+    assert result["valid"] is valid
+    assert result["success"] is False